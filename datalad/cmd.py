@@ -19,6 +19,9 @@ import os
 import atexit
 import functools
 import tempfile
+import threading
+import queue
+from contextlib import contextmanager
 from locale import getpreferredencoding
 import asyncio
 from collections import (
@@ -319,6 +322,12 @@ class WitlessProtocol(asyncio.SubprocessProtocol):
         return results
 
     def process_exited(self):
+        # nothing to do here, the pipes might still hold output that was
+        # not yet received. Finishing is done in connection_lost(), which
+        # is only called once the process exited AND all pipes are closed
+        pass
+
+    def connection_lost(self, exc):
         # actually fulfill the future promise and let the execution finish
         self.done.set_result(self._prepare_result())
 
@@ -363,15 +372,80 @@ class KillOutput(WitlessProtocol):
                 len(data), self.pid, self.FD_NAMES[fd])
 
 
+# registry of event loops kept alive by persistent WitlessRunners, one per
+# thread. Loops are not thread-safe, hence they cannot be shared across threads
+_persistent_loops = threading.local()
+_persistent_loops_all = []
+_persistent_loops_lock = threading.Lock()
+
+
+def _new_event_loop():
+    """Create an event loop capable of managing subprocesses"""
+    if sys.platform == "win32":
+        # use special event loop that supports subprocesses on windows
+        return asyncio.ProactorEventLoop()
+    else:
+        return asyncio.SelectorEventLoop()
+
+
+def get_persistent_event_loop():
+    """Return the long-lived event loop of the current thread
+
+    The loop is created on first access and reused for all subsequent
+    calls from the same thread (and process). It is closed at exit of the
+    interpreter.
+
+    Returns
+    -------
+    asyncio.AbstractEventLoop
+    """
+    loop = getattr(_persistent_loops, 'loop', None)
+    # a forked child must not reuse the selector of its parent
+    if loop is None or loop.is_closed() \
+            or _persistent_loops.pid != os.getpid():
+        loop = _new_event_loop()
+        # attaches the child watcher to this loop (in the main thread)
+        asyncio.set_event_loop(loop)
+        _persistent_loops.loop = loop
+        _persistent_loops.pid = os.getpid()
+        with _persistent_loops_lock:
+            _persistent_loops_all.append(loop)
+        lgr.debug('Started persistent event loop %s', loop)
+    return loop
+
+
+@atexit.register
+def _close_persistent_event_loops():
+    with _persistent_loops_lock:
+        while _persistent_loops_all:
+            loop = _persistent_loops_all.pop()
+            if not loop.is_closed() and not loop.is_running():
+                loop.close()
+
+
+def _get_persistent_default():
+    try:
+        from . import cfg
+        return cfg.obtain('datalad.runtime.persistent-runner')
+    except ImportError:
+        # too early in the import process, no config yet
+        return False
+
+
 class WitlessRunner(object):
     """Minimal Runner with support for online command output processing
 
     It aims to be as simple as possible, providing only essential
     functionality.
+
+    By default, a fresh event loop is started (and closed again) for each
+    call to `run()`. In persistent mode, all runners of a thread share a
+    single, long-lived event loop (and child watcher), which avoids this
+    fixed cost for each executed command.
     """
-    __slots__ = ['cwd', 'env']
+    __slots__ = ['cwd', 'env', 'persistent']
 
-    def __init__(self, cwd=None, env=None):
+    def __init__(self, cwd=None, env=None, persistent=None):
         """
         Parameters
         ----------
@@ -383,6 +457,11 @@ class WitlessRunner(object):
           was given, 'PWD' in the environment is set to its value.
           This must be a complete environment definition, no values
           from the current environment will be inherited.
+        persistent : bool, optional
+          If True, reuse the long-lived event loop of the current thread
+          instead of starting a new one for each command. If not given,
+          the configuration 'datalad.runtime.persistent-runner' is
+          consulted.
         """
         self.env = env.copy() if env else None
         # stringify to support Path instances on PY35
@@ -391,6 +470,32 @@ class WitlessRunner(object):
             # if CWD was provided, we must not make it conflict with
             # a potential PWD setting
             self.env['PWD'] = self.cwd
+        self.persistent = _get_persistent_default() \
+            if persistent is None else persistent
+
+    def _get_event_loop(self):
+        if self.persistent:
+            return get_persistent_event_loop()
+        # start a new event loop, which we will close again after use.
+        # if this is not done events like this will occur
+        #   BlockingIOError: [Errno 11] Resource temporarily unavailable
+        #   Exception ignored when trying to write to the signal wakeup fd:
+        # It is unclear to me why it happens when reusing an event looped
+        # that it stopped from time to time, but starting fresh and doing
+        # a full termination seems to address the issue
+        event_loop = _new_event_loop()
+        asyncio.set_event_loop(event_loop)
+        return event_loop
+
+    def _run_in_loop(self, coro):
+        event_loop = self._get_event_loop()
+        try:
+            return event_loop.run_until_complete(coro)
+        finally:
+            if not self.persistent:
+                # terminate the event loop, cannot be undone, hence we start
+                # a fresh one each time (see BlockingIOError notes above)
+                event_loop.close()
 
     def run(self, cmd, protocol=None, stdin=None, **kwargs):
         """Execute a command and communicate with it.
@@ -428,37 +533,31 @@ class WitlessRunner(object):
         FileNotFoundError
           When a given executable does not exist.
         """
+        return self._run_in_loop(
+            self.run_async(cmd, protocol=protocol, stdin=stdin, **kwargs))
+
+    async def run_async(self, cmd, protocol=None, stdin=None, **kwargs):
+        """Coroutine variant of `run()`
+
+        Must be awaited within a running event loop that supports
+        subprocesses, e.g. to execute several commands concurrently
+        via `asyncio.gather()`. See `run_multiple()` for a convenience
+        wrapper.
+
+        Parameters and return value are identical to `run()`.
+        """
         if protocol is None:
             # by default let all subprocess stream pass through
             protocol = NoCapture
-        # start a new event loop, which we will close again further down
-        # if this is not done events like this will occur
-        #   BlockingIOError: [Errno 11] Resource temporarily unavailable
-        #   Exception ignored when trying to write to the signal wakeup fd:
-        # It is unclear to me why it happens when reusing an event looped
-        # that it stopped from time to time, but starting fresh and doing
-        # a full termination seems to address the issue
-        if sys.platform == "win32":
-            # use special event loop that supports subprocesses on windows
-            event_loop = asyncio.ProactorEventLoop()
-        else:
-            event_loop = asyncio.SelectorEventLoop()
-        asyncio.set_event_loop(event_loop)
-        # include the subprocess manager in the asyncio event loop
-        results = event_loop.run_until_complete(
-            run_async_cmd(
-                event_loop,
-                cmd,
-                protocol,
-                stdin,
-                protocol_kwargs=kwargs,
-                cwd=self.cwd,
-                env=self.env,
-            )
+        results = await run_async_cmd(
+            asyncio.get_event_loop(),
+            cmd,
+            protocol,
+            stdin,
+            protocol_kwargs=kwargs,
+            cwd=self.cwd,
+            env=self.env,
         )
-        # terminate the event loop, cannot be undone, hence we start a fresh
-        # one each time (see BlockingIOError notes above)
-        event_loop.close()
 
         # log before any exception is raised
         lgr.log(8, "Finished running %r with status %s", cmd, results['code'])
@@ -480,6 +579,53 @@ class WitlessRunner(object):
         results.pop('code', None)
         return results
 
+    def run_multiple(self, cmds, protocol=None, jobs=None, **kwargs):
+        """Execute several commands concurrently
+
+        Parameters
+        ----------
+        cmds : iterable of list
+          Commands to execute, see `run()`.
+        protocol : WitlessProtocol, optional
+          Protocol class used for each command, see `run()`.
+        jobs : int, optional
+          Maximum number of processes running at the same time. If not
+          given, all commands are started at once.
+        kwargs :
+          Passed to the Protocol class constructor.
+
+        Returns
+        -------
+        list
+          Result dicts (see `run()`) in the order of `cmds`.
+
+        Raises
+        ------
+        CommandError
+          For the first (in order of `cmds`) failed command, after all
+          commands have finished.
+        """
+        async def _run_all():
+            sem = asyncio.Semaphore(jobs) if jobs else None
+
+            async def _run1(cmd):
+                if sem is None:
+                    return await self.run_async(
+                        cmd, protocol=protocol, **kwargs)
+                async with sem:
+                    return await self.run_async(
+                        cmd, protocol=protocol, **kwargs)
+
+            return await asyncio.gather(
+                *[_run1(cmd) for cmd in cmds],
+                return_exceptions=True)
+
+        results = self._run_in_loop(_run_all())
+        for r in results:
+            if isinstance(r, BaseException):
+                raise r
+        return results
+
 
 class Runner(object):
     """Provides a wrapper for calling functions and commands.
@@ -1166,6 +1312,72 @@ class BatchedCommand(SafeDelCloseMixin):
         self._process = None
         self._stderr_out = None
         self._stderr_out_fname = None
+        # serializes the use of the process by different threads
+        self._lock = threading.RLock()
+        self._nusers = 0
+        self._pid = os.getpid()
+        #: time the process was last used
+        self.last_used = time.time()
+
+    def _check_forked(self):
+        """Drop what was inherited from the parent process after a fork
+
+        The process and the stderr file belong to the parent, only our copies
+        of the pipes are closed, so the parent can still shut the process
+        down.
+        """
+        if self._pid == os.getpid():
+            return
+        lgr.debug("Dropping batched command %s inherited from process %s",
+                  self, self._pid)
+        self._lock = threading.RLock()
+        self._nusers = 0
+        self._pid = os.getpid()
+        if self._process:
+            for f in (self._process.stdin, self._process.stdout):
+                try:
+                    f.close()
+                except Exception:
+                    pass
+            self._process = None
+        if self._stderr_out:
+            try:
+                os.close(self._stderr_out)
+            except OSError:
+                pass
+        self._stderr_out = None
+        self._stderr_out_fname = None
+
+    @contextmanager
+    def _in_use(self):
+        self._check_forked()
+        with self._lock:
+            self._nusers += 1
+            try:
+                yield
+            finally:
+                self._nusers -= 1
+                self.last_used = time.time()
+
+    def close_if_idle(self):
+        """Close the process, unless some thread is using it right now
+
+        Returns
+        -------
+        bool
+          Whether the process was closed.
+        """
+        self._check_forked()
+        if not self._lock.acquire(blocking=False):
+            return False
+        try:
+            if self._nusers:
+                # in use by the calling thread itself
+                return False
+            self.close()
+            return True
+        finally:
+            self._lock.release()
 
     def _initialize(self):
         lgr.debug("Initiating a new process for %s" % repr(self))
@@ -1224,7 +1436,8 @@ class BatchedCommand(SafeDelCloseMixin):
         if not input_multiple:
             cmds = [cmds]
 
-        output = [o for o in self.yield_(cmds)]
+        output = [o for o in (
+            self.pipeline_(cmds) if len(cmds) > 1 else self.yield_(cmds))]
         return output if input_multiple else output[0]
 
     def yield_(self, cmds):
@@ -1236,11 +1449,107 @@ class BatchedCommand(SafeDelCloseMixin):
                 entry = ' '.join(entry)
             yield self.proc1(entry)
 
+    def pipeline_(self, cmds, max_inflight=1000):
+        """Same as yield_, but sends requests without awaiting responses
+
+        Requests are written to the process by a separate thread, while
+        responses are read (in order of the requests) and yielded by the
+        caller's thread. Hence the throughput is not limited by the latency
+        of individual round trips.
+
+        Parameters
+        ----------
+        cmds : iterable
+          Requests (str or tuple), can be a generator.
+        max_inflight : int, optional
+          Maximum number of requests that were sent without their response
+          having been read yet.
+        """
+        # other threads have to wait until all responses were read
+        with self._in_use():
+            yield from self._pipeline(cmds, max_inflight)
+
+    def _pipeline(self, cmds, max_inflight):
+        if not self._process:
+            self._initialize()
+        self._check_process(restart=True)
+        process = self._process
+        # requests sent, awaiting a response, in order
+        inflight = queue.Queue()
+        slots = threading.BoundedSemaphore(max_inflight)
+        stop = threading.Event()
+        writer_errors = []
+        # marks the end of the sent requests in `inflight`
+        end = object()
+
+        def _write():
+            try:
+                for entry in cmds:
+                    if not isinstance(entry, str):
+                        entry = ' '.join(entry)
+                    # block while too many requests are in flight
+                    while not slots.acquire(timeout=0.1):
+                        if stop.is_set():
+                            return
+                    if stop.is_set():
+                        return
+                    inflight.put(entry)
+                    lgr.log(5, "Sending %r to batched command %s", entry, self)
+                    process.stdin.write(entry + '\n')
+                    process.stdin.flush()
+            except Exception as e:
+                writer_errors.append(e)
+            finally:
+                inflight.put(end)
+
+        writer = threading.Thread(
+            target=_write,
+            name='BatchedCommand writer',
+            daemon=True)
+        writer.start()
+        try:
+            while True:
+                entry = inflight.get()
+                if entry is end:
+                    break
+                stdout = assure_unicode(self.output_proc(process.stdout)) \
+                    if not process.stdout.closed else None
+                slots.release()
+                lgr.log(5, "Received output: %r", stdout)
+                yield stdout
+        except GeneratorExit:
+            # consumer is done, but the process still has to respond to
+            # all requests already sent to keep it usable
+            stop.set()
+            while True:
+                entry = inflight.get()
+                if entry is end:
+                    break
+                self.output_proc(process.stdout)
+                slots.release()
+            raise
+        except BaseException:
+            # the process is no longer in a predictable state
+            stop.set()
+            self.close()
+            raise
+        finally:
+            writer.join()
+        if writer_errors:
+            raise writer_errors[0]
+        still_alive, stderr = self._check_process(restart=False)
+        if stderr:
+            lgr.warning("Received output in stderr: %r", stderr)
+
     def proc1(self, arg):
         """Same as __call__, but only takes a single command argument
 
         and returns a single result.
         """
+        with self._in_use():
+            return self._proc1(arg)
+
+    def _proc1(self, arg):
         # TODO: add checks -- may be process died off and needs to be reinitiated
         if not self._process:
             self._initialize()
@@ -1278,6 +1587,7 @@ class BatchedCommand(SafeDelCloseMixin):
           stderr output if return_stderr and stderr file was there.
           None otherwise
         """
+        self._check_forked()
         ret = None
         if self._stderr_out:
             # close possibly still open fd
@@ -1300,3 +1610,150 @@ class BatchedCommand(SafeDelCloseMixin):
             unlink(self._stderr_out_fname)
             self._stderr_out_fname = None
         return ret
+
+
+class BatchedCommandPool(object):
+    """Bounded registry of long-lived batched processes
+
+    Processes are identified by a key, and are shared by everyone requesting
+    the same key (e.g. the same query on the same repository, by different
+    repository instances or commands). If the pool is full, the least
+    recently used process is closed. Processes not used for longer than
+    the idle timeout are closed on the next access of the pool. A process
+    is never closed while a thread is using it, the pool may temporarily
+    exceed its size instead.
+
+    A closed `BatchedCommand` remains usable, it restarts its process when
+    called again. A forked child starts with an empty pool.
+    """
+
+    def __init__(self, max_size=32, idle_timeout=300):
+        """
+        Parameters
+        ----------
+        max_size : int
+          Maximum number of processes kept in the pool.
+        idle_timeout : int or float
+          Number of seconds after which an unused process is closed.
+        """
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        # key -> [BatchedCommand, time of last request]
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        self._pid = os.getpid()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def _check_forked(self):
+        # the processes belong to the parent, do not let the child use them
+        if self._pid == os.getpid():
+            return
+        self._lock = threading.RLock()
+        self._pid = os.getpid()
+        entries = self._entries
+        self._entries = OrderedDict()
+        for bcmd, _ in entries.values():
+            bcmd.close()
+
+    def get(self, key, factory):
+        """Return the pooled process for a key, create it if needed
+
+        Parameters
+        ----------
+        key : hashable
+          Identifier of the process.
+        factory : callable
+          Called without arguments to create a `BatchedCommand`, if there is
+          none in the pool for the key yet.
+
+        Returns
+        -------
+        BatchedCommand
+        """
+        self._check_forked()
+        now = time.time()
+        with self._lock:
+            self._expire(now)
+            entry = self._entries.pop(key, None)
+            bcmd = factory() if entry is None else entry[0]
+            self._entries[key] = [bcmd, now]
+            excess = len(self._entries) - self.max_size
+            if excess > 0:
+                for old_key, old in self._by_last_use():
+                    if old is bcmd:
+                        continue
+                    if old.close_if_idle():
+                        lgr.debug(
+                            "Closed least recently used batched command %s",
+                            old)
+                        del self._entries[old_key]
+                        excess -= 1
+                        if not excess:
+                            break
+        return bcmd
+
+    def _by_last_use(self):
+        """Return (key, BatchedCommand) pairs, least recently used first"""
+        return [
+            (key, bcmd) for key, (bcmd, _) in sorted(
+                self._entries.items(),
+                key=lambda i: max(i[1][1], i[1][0].last_used))]
+
+    def _expire(self, now):
+        for key, bcmd in self._by_last_use():
+            if now - max(self._entries[key][1], bcmd.last_used) \
+                    <= self.idle_timeout:
+                # all further entries were used more recently
+                break
+            if bcmd.close_if_idle():
+                lgr.debug("Closed idle batched command %s", bcmd)
+                del self._entries[key]
+
+    def close(self, match=None):
+        """Close and remove pooled processes
+
+        Parameters
+        ----------
+        match : callable, optional
+          If given, only processes whose key satisfies this predicate are
+          closed. Processes in use are only removed from the pool, they
+          are closed once they are no longer referenced.
+        """
+        self._check_forked()
+        with self._lock:
+            for key in list(self._entries):
+                if match is None or match(key):
+                    self._entries.pop(key)[0].close_if_idle()
+
+
+_batched_command_pool = None
+
+
+def get_batched_command_pool():
+    """Return the session-wide pool of batched processes
+
+    Returns
+    -------
+    BatchedCommandPool or None
+      None, if pooling is disabled via `datalad.runtime.batch-pool-size`.
+    """
+    global _batched_command_pool
+    if _batched_command_pool is None:
+        try:
+            from . import cfg
+        except ImportError:
+            # too early in the import process, no config yet
+            return None
+        max_size = cfg.obtain('datalad.runtime.batch-pool-size')
+        if max_size < 1:
+            return None
+        _batched_command_pool = BatchedCommandPool(
+            max_size=max_size,
+            idle_timeout=cfg.obtain('datalad.runtime.batch-pool-idle-timeout'))
+        atexit.register(_batched_command_pool.close)
+    return _batched_command_pool
@@ -21,10 +21,10 @@ from distutils.version import LooseVersion
 
 import re
 import os
+import threading
 from os.path import (
     join as opj,
     exists,
-    getmtime,
     abspath,
     isabs,
 )
@@ -113,6 +113,131 @@ def _parse_gitconfig_dump(dump, store, fileset, replace, cwd=None):
     return store, fileset
 
 
+def _get_mtimes(paths):
+    """Return the modification times of all existing files among `paths`"""
+    mtimes = {}
+    for p in paths:
+        try:
+            mtimes[p] = os.stat(p).st_mtime
+        except OSError:
+            continue
+    return mtimes
+
+
+# `git config` dumps of configuration sources, shared by all ConfigManager
+# instances in a process
+_gitconfig_dumps = {}
+_gitconfig_dumps_lock = threading.Lock()
+_GITCONFIG_DUMPS_MAX = 10000
+
+
+def _get_files_stamp(files):
+    """Return a stamp of the state of the given files
+
+    Returns None, if a file was modified too recently to reliably detect
+    further modifications by its modification time.
+    """
+    current_time = time()
+    stamp = []
+    for f in sorted(files):
+        try:
+            st = os.stat(f)
+        except OSError:
+            stamp.append((f, None))
+            continue
+        # protect against low-res mtimes (FAT32 has 2s, EXT3 has 1s!)
+        if (current_time - st.st_mtime) <= 2.0:
+            return None
+        stamp.append((f, st.st_ino, st.st_size, st.st_mtime_ns))
+    return tuple(stamp)
+
+
+def _get_cached_gitconfig_dump(key, read, watch=(), cwd=None):
+    """Return a `git config` dump, reusing a previous one if possible
+
+    A dump is reused as long as none of the configuration files it was read
+    from (as reported by `--show-origin`), and none of the files in `watch`
+    has changed.
+
+    Parameters
+    ----------
+    key : tuple
+      Identifier of the dump.
+    read : callable
+      Called without arguments to read the dump, if needed.
+    watch : iterable, optional
+      Additional files to monitor, e.g. to detect their creation.
+    cwd : str, optional
+      Directory relative file names reported in the dump are relative to.
+
+    Returns
+    -------
+    str
+    """
+    with _gitconfig_dumps_lock:
+        cached = _gitconfig_dumps.get(key)
+    if cached is not None:
+        stamp, files, dump = cached
+        if stamp is not None and stamp == _get_files_stamp(files):
+            return dump
+    dump = read()
+    files = set(watch)
+    records = dump.split('\0')
+    # origin records are followed by a key/value record
+    for origin in records[::2]:
+        if origin.startswith('file:'):
+            fname = origin[5:]
+            if not isabs(fname):
+                fname = opj(cwd, fname) if cwd else abspath(fname)
+            files.add(fname)
+    with _gitconfig_dumps_lock:
+        if len(_gitconfig_dumps) >= _GITCONFIG_DUMPS_MAX:
+            _gitconfig_dumps.clear()
+        _gitconfig_dumps[key] = (_get_files_stamp(files), files, dump)
+    return dump
+
+
+def _get_shared_gitconfig_dump(run_args):
+    """Return the `git config` dump of all non-repository sources
+
+    Parameters
+    ----------
+    run_args : list
+      `git config` arguments to list the configuration, must include
+      `--show-origin`.
+
+    Returns
+    -------
+    str, str
+      Dump of the system and global configuration, and dump of the
+      configuration given on the command line (e.g. via `git -c`).
+      In Git's order of precedence, repository configuration sits in
+      between the two.
+    """
+    home = os.path.expanduser('~')
+    dump = _get_cached_gitconfig_dump(
+        # the environment determines which files are read, and can carry
+        # configuration itself
+        ('shared', tuple(run_args), tuple(sorted(
+            (k, v) for k, v in os.environ.items()
+            if k.startswith('GIT_CONFIG') or
+            k in ('HOME', 'XDG_CONFIG_HOME')))),
+        lambda: GitRunner(log_outputs=False).run(
+            ['git', '--git-dir=', 'config'] + run_args,
+            log_stderr=True)[0],
+        # watch for the creation of user configuration files
+        watch=(opj(home, '.gitconfig'),
+               opj(os.environ.get('XDG_CONFIG_HOME', opj(home, '.config')),
+                   'git', 'config')))
+    base = []
+    cmdline = []
+    records = dump.split('\0')
+    for origin, kv in zip(records[::2], records[1::2]):
+        (cmdline if origin.startswith('command line:') else base).extend(
+            (origin, kv, ''))
+    return '\0'.join(base), '\0'.join(cmdline)
+
+
 def _parse_env(store):
     dct = {}
     for k in os.environ:
@@ -270,7 +395,7 @@ class ConfigManager(object):
             # we aren't forcing and we have read files before
             # check if any file we read from has changed
             current_time = time()
-            curmtimes = {c: getmtime(c) for c in self._cfgfiles if exists(c)}
+            curmtimes = _get_mtimes(self._cfgfiles)
             if all(curmtimes[c] == self._cfgmtimes.get(c) and
                    # protect against low-res mtimes (FAT32 has 2s, EXT3 has 1s!)
                    # if mtime age is less than worst resolution assume modified
@@ -296,10 +421,8 @@ class ConfigManager(object):
 
         if self._dataset_cfgfname:
             if exists(self._dataset_cfgfname):
-                stdout, stderr = self._run(
-                    run_args + ['--file', self._dataset_cfgfname],
-                    log_stderr=True
-                )
+                stdout = self._get_file_dump(
+                    run_args, self._dataset_cfgfname)
                 # overwrite existing value, do not amend to get multi-line
                 # values
                 self._store, self._cfgfiles = _parse_gitconfig_dump(
@@ -313,7 +436,7 @@ class ConfigManager(object):
 
         if self._src_mode == 'dataset-local':
             run_args.append('--local')
-        stdout, stderr = self._run(run_args, log_stderr=True)
+        stdout = self._get_gitconfig_dump(run_args)
         self._store, self._cfgfiles = _parse_gitconfig_dump(
             stdout, self._store, self._cfgfiles, replace=True,
             cwd=self._runner.cwd)
@@ -322,7 +445,7 @@ class ConfigManager(object):
         if self._dataset_cfgfname:
             self._cfgfiles.add(self._dataset_cfgfname)
             self._cfgfiles.add(self._repo_cfgfname)
-        self._cfgmtimes = {c: getmtime(c) for c in self._cfgfiles if exists(c)}
+        self._cfgmtimes = _get_mtimes(self._cfgfiles)
 
         # superimpose overrides
         self._store.update(self.overrides)
@@ -589,6 +712,45 @@ class ConfigManager(object):
     #
     # Modify configuration (proxy respective git-config call)
     #
+    def _get_gitconfig_dump(self, run_args):
+        """Return the `git config` dump of all Git configuration sources
+
+        Whenever possible, only the repository configuration is read, and
+        the configuration from all other sources is taken from a process-wide
+        cache.
+        """
+        if self._src_mode == 'any' and self._gitconfig_has_showorgin:
+            if self._dataset_path is None:
+                base, cmdline = _get_shared_gitconfig_dump(run_args)
+                return base + cmdline
+            if exists(opj(self._dataset_path, '.git')):
+                local = _get_cached_gitconfig_dump(
+                    ('local', self._dataset_path, tuple(run_args)),
+                    lambda: self._run(
+                        run_args + ['--local', '--includes'],
+                        log_stderr=True)[0],
+                    watch=(self._repo_cfgfname,),
+                    cwd=self._dataset_path)
+                # per-worktree configuration is not covered by --local
+                if '\0extensions.worktreeconfig\n' not in '\0' + local:
+                    base, cmdline = _get_shared_gitconfig_dump(run_args)
+                    # conditional includes (e.g. on the branch) in the shared
+                    # configuration can only be evaluated within the
+                    # repository
+                    if '\0includeif.' not in '\0' + base + cmdline:
+                        return base + local + cmdline
+        stdout, stderr = self._run(run_args, log_stderr=True)
+        return stdout
+
+    def _get_file_dump(self, run_args, fname):
+        """Return the `git config` dump of a single configuration file"""
+        read = lambda: self._run(
+            run_args + ['--file', fname], log_stderr=True)[0]
+        if not self._gitconfig_has_showorgin:
+            return read()
+        return _get_cached_gitconfig_dump(
+            ('file', fname, tuple(run_args)), read, watch=(fname,))
+
     @_where_reload
     def _run(self, args, where=None, reload=False, **kwargs):
         """Centralized helper to run "git config" calls
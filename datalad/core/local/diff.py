@@ -17,7 +17,7 @@ from collections import OrderedDict
 from datalad.utils import (
     assure_list,
     assure_unicode,
-    get_dataset_root,
+    DatasetRootResolver,
 )
 from datalad.interface.base import (
     Interface,
@@ -209,6 +209,7 @@ def diff_dataset(
     # in the worktree (anymore)
     if path:
         ps = []
+        get_root = DatasetRootResolver()
         # sort any path argument into the respective subdatasets
         for p in sorted(assure_list(path)):
             # it is important to capture the exact form of the
@@ -224,7 +225,7 @@ def diff_dataset(
                 resolved_path, \
                 orig_path.endswith(op.sep) or resolved_path == ds.pathobj
             str_path = str(p[0])
-            root = get_dataset_root(str_path)
+            root = get_root(str_path)
             if root is None:
                 # no root, not possibly underneath the refds
                 yield dict(
@@ -235,7 +236,8 @@ def diff_dataset(
                     message='path not underneath this dataset',
                     logger=lgr)
                 continue
-            if path_under_rev_dataset(ds, str_path) is None:
+            if path_under_rev_dataset(
+                    ds, str_path, get_root=get_root) is None:
                 # nothing we support handling any further
                 # there is only a single refds
                 yield dict(
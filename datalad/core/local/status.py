@@ -14,25 +14,28 @@ __docformat__ = 'restructuredtext'
 import logging
 import os
 import os.path as op
+import sys
 from collections import OrderedDict
 
 from datalad.utils import (
     assure_list,
     assure_unicode,
     bytes2human,
-    get_dataset_root,
+    DatasetRootResolver,
 )
 from datalad.interface.base import (
     Interface,
     build_doc,
 )
 from datalad.interface.common_opts import (
+    jobs_opt,
     recursion_limit,
     recursion_flag,
 )
 from datalad.interface.utils import eval_results
 import datalad.support.ansi_colors as ac
 from datalad.support.param import Parameter
+from datalad.support.parallel import LookaheadPool
 from datalad.support.constraints import (
     EnsureChoice,
     EnsureNone,
@@ -104,13 +107,19 @@ STATE_COLOR_MAP = {
 }
 
 
-def _yield_status(ds, paths, annexinfo, untracked, recursion_limit, queried,
-                  eval_submodule_state, eval_filetype, cache):
+def _get_status(ds, paths, annexinfo, untracked, eval_submodule_state,
+                eval_filetype, cache):
+    """Return an iterable of (path, props) status records of a dataset
+
+    Unless annex information is requested, records are produced while Git
+    reports the content of the worktree.
+    """
     # take the dataset that went in first
     repo = ds.repo
     repo_path = repo.pathobj
+    query_annex = annexinfo and hasattr(repo, 'get_content_annexinfo')
     lgr.debug('query %s.diffstatus() for paths: %s', repo, paths)
-    status = repo.diffstatus(
+    status = (repo.diffstatus if query_annex else repo.iter_diffstatus)(
         fr='HEAD' if repo.get_hexsha() else None,
         to=None,
         # recode paths with repo reference for low-level API
@@ -119,15 +128,92 @@ def _yield_status(ds, paths, annexinfo, untracked, recursion_limit, queried,
         eval_submodule_state=eval_submodule_state,
         eval_file_type=eval_filetype,
         _cache=cache)
-    if annexinfo and hasattr(repo, 'get_content_annexinfo'):
-        lgr.debug('query %s.get_content_annexinfo() for paths: %s', repo, paths)
-        # this will amend `status`
-        repo.get_content_annexinfo(
-            paths=paths if paths else None,
-            init=status,
-            eval_availability=annexinfo in ('availability', 'all'),
-            ref=None)
-    for path, props in status.items():
+    if not query_annex:
+        return status
+    lgr.debug('query %s.get_content_annexinfo() for paths: %s', repo, paths)
+    # this will amend `status`
+    repo.get_content_annexinfo(
+        paths=paths if paths else None,
+        init=status,
+        eval_availability=annexinfo in ('availability', 'all'),
+        ref=None)
+    return status.items()
+
+
+def _get_status_tree(pool, ds, paths, annexinfo, untracked, recursion_limit,
+                     eval_submodule_state, eval_filetype, cache):
+    """Evaluate the status of a dataset, and schedule that of its subdatasets
+
+    Runs in a worker of `pool` (a `LookaheadPool`), or in the thread of the
+    consumer. The status evaluation of installed subdatasets (within
+    `recursion_limit`) is submitted to the pool before returning, as long as
+    it accepts more work, hence a hierarchy is processed concurrently, but
+    only ahead of the consumer by a bounded amount.
+
+    Returns
+    -------
+    list, dict
+      The (path, props) status records of `ds`, and a mapping of installed
+      subdataset paths to futures of their respective `_get_status_tree()`
+      return values, or None, if the pool declined their evaluation.
+    """
+    status = list(_get_status(ds, paths, annexinfo, untracked,
+                              eval_submodule_state, eval_filetype, cache))
+    subds_status = {}
+    if not recursion_limit:
+        return status, subds_status
+    repo_path = ds.repo.pathobj
+    for path, props in status:
+        if props.get('type', None) != 'dataset':
+            continue
+        cpath = ds.pathobj / path.relative_to(repo_path)
+        if cpath == ds.pathobj:
+            continue
+        subds = Dataset(str(cpath))
+        if subds.is_installed():
+            subds_status[cpath] = pool.submit(
+                _get_status_tree,
+                pool,
+                subds,
+                None,
+                annexinfo,
+                untracked,
+                recursion_limit - 1,
+                eval_submodule_state,
+                eval_filetype,
+                cache)
+    return status, subds_status
+
+
+def _yield_status(ds, paths, annexinfo, untracked, recursion_limit, queried,
+                  eval_submodule_state, eval_filetype, cache, pool=None,
+                  status_tree=None):
+    """Yield status records for a dataset and (recursively) its subdatasets
+
+    If a `pool` (`LookaheadPool`) is given, the status of subdatasets is
+    evaluated by its workers, but results are yielded in the same order as
+    with serial processing. `status_tree` is the (already evaluated) return
+    value of `_get_status_tree()` for `ds`, if available.
+    """
+    if pool is not None and status_tree is None:
+        status_tree = _get_status_tree(
+            pool,
+            ds,
+            paths,
+            annexinfo,
+            untracked,
+            recursion_limit,
+            eval_submodule_state,
+            eval_filetype,
+            cache)
+    if status_tree is None:
+        status = _get_status(ds, paths, annexinfo, untracked,
+                             eval_submodule_state, eval_filetype, cache)
+        subds_status = None
+    else:
+        status, subds_status = status_tree
+    repo_path = ds.repo.pathobj
+    for path, props in status:
         cpath = ds.pathobj / path.relative_to(repo_path)
         yield dict(
             props,
@@ -144,19 +230,47 @@ def _yield_status(ds, paths, annexinfo, untracked, recursion_limit, queried,
                 # See https://github.com/datalad/datalad/pull/4526 for the usecase
                 lgr.debug("Got status for itself, which should not happen, skipping %s", path)
                 continue
-            subds = Dataset(str(cpath))
-            if subds.is_installed():
-                for r in _yield_status(
-                        subds,
-                        None,
-                        annexinfo,
-                        untracked,
-                        recursion_limit - 1,
-                        queried,
-                        eval_submodule_state,
-                        eval_filetype,
-                        cache):
-                    yield r
+            if subds_status is not None:
+                if cpath not in subds_status:
+                    # not installed
+                    continue
+                future = subds_status[cpath]
+                # blocks until the subdataset was evaluated by the pool,
+                # if the pool declined it, it is evaluated right here
+                substatus_tree = None if future is None \
+                    else pool.result(future)
+            else:
+                substatus_tree = None
+                if not Dataset(str(cpath)).is_installed():
+                    continue
+            for r in _yield_status(
+                    Dataset(str(cpath)),
+                    None,
+                    annexinfo,
+                    untracked,
+                    recursion_limit - 1,
+                    queried,
+                    eval_submodule_state,
+                    eval_filetype,
+                    cache,
+                    pool=pool,
+                    status_tree=substatus_tree):
+                yield r
+
+
+def _get_status_pool(jobs, ds):
+    """Return a LookaheadPool for concurrent subdataset evaluation, or None"""
+    if jobs == 'auto':
+        jobs = ds.config.obtain('datalad.runtime.max-annex-jobs')
+    if not jobs or jobs < 2:
+        return None
+    if sys.version_info < (3, 8):
+        # running subprocesses via asyncio from threads other than the main
+        # thread requires the default child watcher of Python 3.8+
+        lgr.debug('Concurrent status evaluation requires Python 3.8+, '
+                  'proceeding serially')
+        return None
+    return LookaheadPool(jobs)
 
 
 @build_doc
@@ -294,6 +408,15 @@ class Status(Interface):
             from other symlinks. Type inspection is relatively expensive
             and can lead to slow operation in datasets with a large number
             of files."""),
+        jobs=Parameter(
+            args=("-J", "--jobs"),
+            metavar="NJOBS",
+            constraints=jobs_opt.constraints,
+            doc="""how many subdatasets to evaluate concurrently in a
+            recursive query. Results are reported in the same order as
+            with serial evaluation. "auto" corresponds to the number
+            defined by the 'datalad.runtime.max-annex-jobs' configuration
+            item."""),
     )
 
     @staticmethod
@@ -307,7 +430,8 @@ class Status(Interface):
             recursive=False,
             recursion_limit=None,
             eval_subdataset_state='full',
-            report_filetype='eval'):
+            report_filetype='eval',
+            jobs=None):
         # To the next white knight that comes in to re-implement `status` as a
         # special case of `diff`. There is one fundamental difference between
         # the two commands: `status` can always use the worktree as evident on
@@ -325,6 +449,7 @@ class Status(Interface):
 
         paths_by_ds = OrderedDict()
         if path:
+            get_root = DatasetRootResolver()
             # sort any path argument into the respective subdatasets
             for p in sorted(map(assure_unicode, assure_list(path))):
                 # it is important to capture the exact form of the
@@ -332,7 +457,7 @@ class Status(Interface):
                 # for further decision logic below
                 orig_path = str(p)
                 p = resolve_path(p, dataset)
-                root = get_dataset_root(str(p))
+                root = get_root(str(p))
                 if root is None:
                     # no root, not possibly underneath the refds
                     yield dict(
@@ -351,7 +476,7 @@ class Status(Interface):
                         # distinguish rsync-link syntax to identify
                         # the dataset as whole (e.g. 'ds') vs its
                         # content (e.g. 'ds/')
-                        super_root = get_dataset_root(op.dirname(root))
+                        super_root = get_root(op.dirname(root))
                         if super_root:
                             # the dataset identified by the path argument
                             # is contained in a superdataset, and no
@@ -369,60 +494,70 @@ class Status(Interface):
 
         queried = set()
         content_info_cache = {}
-        while paths_by_ds:
-            qdspath, qpaths = paths_by_ds.popitem(last=False)
-            if qpaths and qdspath in qpaths:
-                # this is supposed to be a full query, save some
-                # cycles sifting through the actual path arguments
-                qpaths = []
-            # try to recode the dataset path wrt to the reference
-            # dataset
-            # the path that it might have been located by could
-            # have been a resolved path or another funky thing
-            qds_inrefds = path_under_rev_dataset(ds, qdspath)
-            if qds_inrefds is None:
-                # nothing we support handling any further
-                # there is only a single refds
-                yield dict(
-                    path=str(qdspath),
-                    refds=ds.path,
-                    action='status',
-                    status='error',
-                    message=(
-                        "dataset containing given paths is not underneath "
-                        "the reference dataset %s: %s",
-                        ds, qpaths),
-                    logger=lgr,
-                )
-                continue
-            elif qds_inrefds != qdspath:
-                # the path this dataset was located by is not how it would
-                # be referenced underneath the refds (possibly resolved
-                # realpath) -> recode all paths to be underneath the refds
-                qpaths = [qds_inrefds / p.relative_to(qdspath) for p in qpaths]
-                qdspath = qds_inrefds
-            if qdspath in queried:
-                # do not report on a single dataset twice
-                continue
-            qds = Dataset(str(qdspath))
-            for r in _yield_status(
-                    qds,
-                    qpaths,
-                    annex,
-                    untracked,
-                    recursion_limit
-                    if recursion_limit is not None else -1
-                    if recursive else 0,
-                    queried,
-                    eval_subdataset_state,
-                    report_filetype == 'eval',
-                    content_info_cache):
-                yield dict(
-                    r,
-                    refds=ds.path,
-                    action='status',
-                    status='ok',
-                )
+        pool = _get_status_pool(jobs, ds) \
+            if recursive or recursion_limit else None
+        completed = False
+        try:
+            while paths_by_ds:
+                qdspath, qpaths = paths_by_ds.popitem(last=False)
+                if qpaths and qdspath in qpaths:
+                    # this is supposed to be a full query, save some
+                    # cycles sifting through the actual path arguments
+                    qpaths = []
+                # try to recode the dataset path wrt to the reference
+                # dataset
+                # the path that it might have been located by could
+                # have been a resolved path or another funky thing
+                qds_inrefds = path_under_rev_dataset(ds, qdspath)
+                if qds_inrefds is None:
+                    # nothing we support handling any further
+                    # there is only a single refds
+                    yield dict(
+                        path=str(qdspath),
+                        refds=ds.path,
+                        action='status',
+                        status='error',
+                        message=(
+                            "dataset containing given paths is not underneath "
+                            "the reference dataset %s: %s",
+                            ds, qpaths),
+                        logger=lgr,
+                    )
+                    continue
+                elif qds_inrefds != qdspath:
+                    # the path this dataset was located by is not how it would
+                    # be referenced underneath the refds (possibly resolved
+                    # realpath) -> recode all paths to be underneath the refds
+                    qpaths = [qds_inrefds / p.relative_to(qdspath) for p in qpaths]
+                    qdspath = qds_inrefds
+                if qdspath in queried:
+                    # do not report on a single dataset twice
+                    continue
+                qds = Dataset(str(qdspath))
+                for r in _yield_status(
+                        qds,
+                        qpaths,
+                        annex,
+                        untracked,
+                        recursion_limit
+                        if recursion_limit is not None else -1
+                        if recursive else 0,
+                        queried,
+                        eval_subdataset_state,
+                        report_filetype == 'eval',
+                        content_info_cache,
+                        pool=pool):
+                    yield dict(
+                        r,
+                        refds=ds.path,
+                        action='status',
+                        status='ok',
+                    )
+            completed = True
+        finally:
+            if pool is not None:
+                # do not evaluate subdatasets nobody will ask for anymore
+                pool.shutdown(cancel=not completed)
 
     @staticmethod
     def custom_result_renderer(res, **kwargs):  # pragma: more cover
@@ -9,6 +9,8 @@
 """Test status command"""
 
 import os.path as op
+from unittest.mock import patch
+
 import datalad.utils as ut
 
 from datalad.utils import (
@@ -25,6 +27,7 @@ from datalad.tests.utils import (
     get_deeply_nested_structure,
     has_symlink_capability,
     OBSCURE_FILENAME,
+    ok_,
     with_tempfile,
 )
 from datalad.support.exceptions import (
@@ -33,6 +36,8 @@ from datalad.support.exceptions import (
 )
 from datalad.distribution.dataset import Dataset
 from datalad.support.annexrepo import AnnexRepo
+from datalad.support.gitrepo import GitRepo
+from datalad.core.local import status as status_mod
 from datalad.api import (
     status,
 )
@@ -242,3 +247,45 @@ def test_subds_status(path):
         type="dataset",
         path=op.join(subds.path, "someotherds"),
         refds=subds.path)
+
+
+@with_tempfile(mkdir=True)
+def test_status_jobs(path):
+    ds = get_deeply_nested_structure(path)
+    serial = ds.status(recursive=True, annex='basic', result_renderer=None)
+    concurrent = ds.status(recursive=True, annex='basic', jobs=3,
+                           result_renderer=None)
+    # identical results, in identical order
+    eq_(serial, concurrent)
+    # recursion limit is honored
+    eq_(ds.status(recursion_limit=1, result_renderer=None),
+        ds.status(recursion_limit=1, jobs=3, result_renderer=None))
+
+
+@with_tempfile
+def test_status_jobs_close(path):
+    top = GitRepo(path, create=True)
+    for i in range(10):
+        sub = GitRepo(op.join(path, 'sub%d' % i), create=True)
+        sub.commit(msg="c", options=["--allow-empty"])
+        top.add_submodule(path='sub%d' % i)
+    top.commit(msg="subs")
+    ds = Dataset(path)
+    eq_(ds.status(recursive=True, result_renderer=None),
+        ds.status(recursive=True, jobs=2, result_renderer=None))
+
+    evaluated = []
+    orig_get_status = status_mod._get_status
+
+    def _get_status(ds, *args):
+        evaluated.append(ds.path)
+        return orig_get_status(ds, *args)
+
+    with patch.object(status_mod, '_get_status', _get_status):
+        res = ds.status(recursive=True, jobs=2, result_renderer=None,
+                        return_type='generator')
+        next(res)
+        res.close()
+    # the dataset itself, and no more subdatasets than the pool took on
+    # ahead of the consumer
+    ok_(len(evaluated) <= 1 + 2 * 2, msg=evaluated)
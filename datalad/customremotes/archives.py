@@ -90,6 +90,7 @@ class ArchiveAnnexCustomRemote(AnnexCustomRemote):
 
     def stop(self, *args):
         """Stop communication with annex"""
+        lgr.debug("Archives cache statistics: %s", self._cache.get_stats())
         self._cache.clean()
         super(ArchiveAnnexCustomRemote, self).stop(*args)
 
@@ -385,14 +386,16 @@ class ArchiveAnnexCustomRemote(AnnexCustomRemote):
                 assert exists(akey_path), "Key file %s is not present" % akey_path
 
                 # Extract that bloody file from the bloody archive
-                # TODO: implement/use caching, for now a simple one
-                #  actually patool doesn't support extraction of a single file
-                #  https://github.com/wummel/patool/issues/20
-                # so
                 pwd = getpwd()
                 lgr.debug(u"Getting file {afile} from {akey_path} while PWD={pwd}".format(**locals()))
-                apath = self.cache[akey_path].get_extracted_file(afile)
-                link_file_load(apath, path)
+                archive = self.cache[akey_path]
+                # directly, if the archive format allows for it
+                if not archive.extract_member(afile, path):
+                    # patool doesn't support extraction of a single file
+                    # https://github.com/wummel/patool/issues/20
+                    # so extract everything into the cache
+                    apath = archive.get_extracted_file(afile)
+                    link_file_load(apath, path)
                 self.send('TRANSFER-SUCCESS', cmd, key)
                 return
             except Exception as exc:
@@ -11,6 +11,7 @@
 __docformat__ = 'restructuredtext'
 
 import logging
+from contextlib import closing
 lgr = logging.getLogger('datalad.customremotes.datalad')
 
 from ..utils import disable_logger
@@ -94,26 +95,28 @@ class DataladAnnexCustomRemote(AnnexCustomRemote):
         """
         lgr.debug("VERIFYING key %s" % key)
         resp = None
-        for url in self.get_URLS(key):
-            # somewhat duplicate of CHECKURL
-            try:
-                with disable_logger():
-                    status = self._providers.get_status(url)
-                if status:  # TODO:  anything specific to check???
+        urls = self.get_URLS(key)
+        # somewhat duplicate of CHECKURL, but URLs are probed concurrently.
+        # Closing the statuses upon success cancels requests for the
+        # remaining URLs
+        with disable_logger(), \
+                closing(self._providers.iter_status(urls)) as statuses:
+            for url, status, exc in statuses:
+                if isinstance(exc, TargetFileAbsent):
+                    self.debug("Target url %s file seems to be missing: %s" % (url, exc_str(exc)))
+                    if not resp:
+                        # if it is already marked as UNKNOWN -- let it stay that way
+                        # but if not -- we might as well say that we can no longer access it
+                        resp = "CHECKPRESENT-FAILURE"
+                elif exc is not None:
+                    resp = "CHECKPRESENT-UNKNOWN"
+                    self.debug("Failed to check status of url %s: %s" % (url, exc_str(exc)))
+                elif status:  # TODO:  anything specific to check???
                     resp = "CHECKPRESENT-SUCCESS"
                     break
                 # TODO:  for CHECKPRESENT-FAILURE we somehow need to figure out that
                 # we can connect to that server but that specific url is N/A,
                 # probably check the connection etc
-            except TargetFileAbsent as exc:
-                self.debug("Target url %s file seems to be missing: %s" % (url, exc_str(exc)))
-                if not resp:
-                    # if it is already marked as UNKNOWN -- let it stay that way
-                    # but if not -- we might as well say that we can no longer access it
-                    resp = "CHECKPRESENT-FAILURE"
-            except Exception as exc:
-                resp = "CHECKPRESENT-UNKNOWN"
-                self.debug("Failed to check status of url %s: %s" % (url, exc_str(exc)))
         if resp is None:
             resp = "CHECKPRESENT-UNKNOWN"
         self.send(resp, key)
@@ -406,6 +406,9 @@ class Dataset(object, metaclass=PathBasedFlyweight):
             return res.get('status') == 'ok' and res.get('type') == 'dataset'
 
         def subds_contains_path(ds, path):
+            if not (ds.pathobj / '.gitmodules').exists():
+                # cheap test first, nothing is registered without it
+                return False
             return path in sds.subdatasets(recursive=False,
                                            contains=path,
                                            result_filter=res_filter,
@@ -676,7 +679,7 @@ def resolve_path(path, ds=None):
 rev_resolve_path = resolve_path
 
 
-def path_under_rev_dataset(ds, path):
+def path_under_rev_dataset(ds, path, get_root=get_dataset_root):
     ds_path = ds.pathobj
     try:
         rpath = str(ut.Path(path).relative_to(ds_path))
@@ -687,14 +690,14 @@ def path_under_rev_dataset(ds, path):
         # whatever went wrong, we gotta play save
         pass
 
-    root = get_dataset_root(str(path))
+    root = get_root(str(path))
     while root is not None and not ds_path.samefile(root):
         # path and therefore root could be relative paths,
         # hence in the next round we cannot use dirname()
         # to jump in the the next directory up, but we have
         # to use ./.. and get_dataset_root() will handle
         # the rest just fine
-        root = get_dataset_root(op.join(root, op.pardir))
+        root = get_root(op.join(root, op.pardir))
     if root is None:
         return None
     return ds_path / op.relpath(str(path), root)
@@ -67,6 +67,14 @@ class DownloaderSession(object):
     def download(self, f=None, pbar=None, size=None):
         raise NotImplementedError("must be implemented in subclases")
 
+    def can_resume(self, filepath):
+        """Whether `download()` can continue a partial download in `filepath`
+
+        If so, `download()` is given the file opened for updating, otherwise
+        it is given an empty file.
+        """
+        return False
+
         # TODO: get_status ?
 
 
@@ -430,14 +438,18 @@ class BaseDownloader(object, metaclass=ABCMeta):
         # TODO: pbar = ui.get_progressbar(size=response.headers['size'])
         try:
             temp_filepath = self._get_temp_download_filename(filepath)
-            if exists(temp_filepath):
-                # eventually we might want to continue the download
+            resume = exists(temp_filepath) \
+                and downloader_session.can_resume(temp_filepath)
+            if resume:
+                lgr.info(
+                    "Resuming the previous download of %s from %s",
+                    url, temp_filepath)
+            elif exists(temp_filepath):
                 lgr.warning(
                     "Temporary file %s from the previous download was found. "
                     "It will be overriden" % temp_filepath)
-                # TODO.  also logic below would clean it up atm
 
-            with open(temp_filepath, 'wb') as fp:
+            with open(temp_filepath, 'r+b' if resume else 'wb') as fp:
                 # TODO: url might be a bit too long for the beast.
                 # Consider to improve to make it animated as well, or shorten here
                 pbar = ui.get_progressbar(label=url, fill_text=filepath, total=target_size)
@@ -474,9 +486,14 @@ class BaseDownloader(object, metaclass=ABCMeta):
             raise DownloadError(exc_str(e))  # for now
         finally:
             if exists(temp_filepath):
-                # clean up
-                lgr.debug("Removing a temporary download %s", temp_filepath)
-                unlink(temp_filepath)
+                if downloader_session.can_resume(temp_filepath):
+                    lgr.debug(
+                        "Keeping a partial download %s to be resumed",
+                        temp_filepath)
+                else:
+                    # clean up
+                    lgr.debug("Removing a temporary download %s", temp_filepath)
+                    unlink(temp_filepath)
 
         return filepath
 
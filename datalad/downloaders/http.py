@@ -17,15 +17,25 @@ import requests.auth
 # from urllib3.exceptions import MaxRetryError, NewConnectionError
 
 import io
+import os
+import os.path as op
+import threading
+from concurrent.futures import (
+    FIRST_EXCEPTION,
+    ThreadPoolExecutor,
+    wait,
+)
 from time import sleep
 
 from ..utils import (
     assure_list_from_str,
     assure_dict_from_str,
     ensure_bytes,
+    unlink,
 )
 from ..dochelpers import borrowkwargs
 
+from .. import cfg
 from ..ui import ui
 from ..utils import auto_repr
 from ..dochelpers import exc_str
@@ -33,11 +43,16 @@ from ..support.network import get_url_filename
 from ..support.network import get_response_disposition_filename
 from ..support.network import rfc2822_to_epoch
 from ..support.cookies import cookies_db
+from ..support.json_py import (
+    dump as jsondump,
+    load as jsonload,
+)
 from ..support.status import FileStatus
 from ..support.exceptions import (
     DownloadError,
     AccessDeniedError,
     AccessFailedError,
+    IncompleteDownloadError,
     UnhandledRedirectError,
 )
 
@@ -87,7 +102,7 @@ def process_www_authenticate(v):
 def check_response_status(response, err_prefix="", session=None):
     """Check if response's status_code signals problem with authentication etc
 
-    ATM succeeds only if response code was 200
+    ATM succeeds only if response code was 200, or 206 for a range request
     """
     if not err_prefix:
         err_prefix = "Access to %s has failed: " % response.url
@@ -104,7 +119,7 @@ def check_response_status(response, err_prefix="", session=None):
             err_msg,
             supported_types=process_www_authenticate(
                 response.headers.get('WWW-Authenticate')))
-    elif response.status_code in {200}:
+    elif response.status_code in {200, 206}:
         pass
     elif response.status_code in {301, 302, 307}:
         # TODO: apparently tests do not excercise this one yet
@@ -197,7 +212,7 @@ class HTTPBaseAuthenticator(Authenticator):
 
         if cookies_dict:
             if (url in cookies_db) and update:
-                cookies_db[url].update(cookies_dict)
+                cookies_db[url] = dict(cookies_db[url], **cookies_dict)
             else:
                 cookies_db[url] = cookies_dict
             # assign cookies for this session
@@ -359,15 +374,119 @@ class HTTPBearerTokenAuthenticator(HTTPRequestsAuthenticator):
 
 @auto_repr
 class HTTPDownloaderSession(DownloaderSession):
+    # how often (in seconds) to record the progress of a segmented download
+    _SEGMENTS_STATE_INTERVAL = 5
+
     def __init__(self, size=None, filename=None,  url=None, headers=None,
-                 response=None, chunk_size=1024 ** 2):
+                 response=None, chunk_size=1024 ** 2, session=None):
         super(HTTPDownloaderSession, self).__init__(
             size=size, filename=filename, url=url, headers=headers,
         )
         self.chunk_size = chunk_size
         self.response = response
+        self.session = session
+
+    @staticmethod
+    def _get_segments_state_filename(filepath):
+        """Given a filepath, return the one to record segment progress in"""
+        return filepath + ".segments"
+
+    def _supports_segments(self):
+        """Whether content can be downloaded in segments via range requests"""
+        headers = self.headers or {}
+        return bool(
+            self.session is not None
+            and self.size
+            and hasattr(os, 'pwrite')
+            and headers.get('Accept-Ranges', '').lower() == 'bytes'
+            and headers.get('Content-Encoding', 'identity').lower()
+            in ('identity', ''))
+
+    def _get_validator(self):
+        """Return a strong validator of the content to download, if any
+
+        Weak ETags are not usable in If-Range headers, and also do not
+        guarantee identical bytes for resuming a download.
+        """
+        headers = self.headers or {}
+        etag = headers.get('ETag')
+        if etag and not etag.startswith('W/'):
+            return etag
+        return headers.get('Last-Modified')
+
+    def _load_segments_state(self, filepath):
+        """Return segments of a partial download in filepath, if resumable
+
+        Returns
+        -------
+        list or None
+          [start, end, done] records for all segments, where `done` is the
+          number of bytes from `start` that were already downloaded.
+        """
+        state_filepath = self._get_segments_state_filename(filepath)
+        if not op.lexists(state_filepath) or not self._supports_segments():
+            return None
+        try:
+            state = jsonload(state_filepath, fixup=False)
+        except Exception as e:
+            lgr.debug("Failed to load download state from %s: %s",
+                      state_filepath, exc_str(e))
+            return None
+        validator = self._get_validator()
+        if not validator \
+                or state.get('url') != self.url \
+                or state.get('size') != self.size \
+                or state.get('validator') != validator \
+                or op.getsize(filepath) != self.size:
+            lgr.debug("Not resuming download from %s: content of %s changed "
+                      "or cannot be verified", filepath, self.url)
+            return None
+        return state['segments']
+
+    def _save_segments_state(self, filepath, segments):
+        jsondump(
+            dict(url=self.url, size=self.size,
+                 validator=self._get_validator(),
+                 segments=[list(s) for s in segments]),
+            self._get_segments_state_filename(filepath))
+
+    def _get_segments(self, f, size):
+        """Return segments to download into `f`, or None for a plain download
+        """
+        if f is None or size is not None or not hasattr(f, 'fileno') \
+                or not isinstance(getattr(f, 'name', None), str) \
+                or not self._supports_segments():
+            return None
+        if os.fstat(f.fileno()).st_size == self.size:
+            # we were given a partial download to resume
+            segments = self._load_segments_state(f.name)
+            if segments:
+                return segments
+        nsegments = min(
+            cfg.obtain('datalad.runtime.download-segments'),
+            # no segment shall be smaller than the configured size
+            self.size // max(
+                1,
+                cfg.obtain('datalad.runtime.download-segment-size')
+                * 1024 ** 2))
+        if nsegments < 2:
+            return None
+        bounds = [self.size * i // nsegments for i in range(nsegments + 1)]
+        return [[start, end, 0] for start, end in zip(bounds[:-1], bounds[1:])]
+
+    def can_resume(self, filepath):
+        return self._load_segments_state(filepath) is not None
 
     def download(self, f=None, pbar=None, size=None):
+        segments = self._get_segments(f, size)
+        if segments:
+            return self._download_segments(f, pbar, segments)
+        if f is not None and isinstance(getattr(f, 'name', None), str):
+            # a plain download invalidates any previous segment progress
+            state_filepath = self._get_segments_state_filename(f.name)
+            if op.lexists(state_filepath):
+                unlink(state_filepath)
+
         response = self.response
         # content_gzipped = 'gzip' in response.headers.get('content-encoding', '').split(',')
         # if content_gzipped:
@@ -432,6 +551,112 @@ class HTTPDownloaderSession(DownloaderSession):
             out = f.getvalue()
             return out
 
+    def _download_segments(self, f, pbar, segments):
+        """Download content into f via concurrent range requests
+
+        Each segment is fetched via its own connection, and written at its
+        offset into the file, which is preallocated to the full size. The
+        progress of all segments is recorded alongside the file, so that an
+        interrupted download can be resumed.
+        """
+        # we will not consume the response to the initial request
+        self.response.close()
+        f.truncate(self.size)
+        fd = f.fileno()
+        lgr.debug("Downloading %s in %d segments", self.url, len(segments))
+
+        lock = threading.Lock()
+        abort = threading.Event()
+        progress = [sum(s[2] for s in segments)]
+
+        def _update_progress(nbytes):
+            with lock:
+                progress[0] += nbytes
+                try:
+                    if pbar:
+                        pbar.update(progress[0])
+                except Exception as e:
+                    lgr.warning("Failed to update progressbar: %s" % exc_str(e))
+
+        todo = [s for s in segments if s[0] + s[2] < s[1]]
+        pool = ThreadPoolExecutor(max_workers=len(todo) or 1)
+        try:
+            futures = [
+                pool.submit(
+                    self._download_segment, fd, s, _update_progress, abort)
+                for s in todo]
+            not_done = futures
+            while not_done:
+                done, not_done = wait(
+                    not_done,
+                    timeout=self._SEGMENTS_STATE_INTERVAL,
+                    return_when=FIRST_EXCEPTION)
+                for fut in done:
+                    # raises the exception of a failed segment, if any
+                    fut.result()
+                if not_done:
+                    self._save_segments_state(f.name, segments)
+        except BaseException:
+            abort.set()
+            pool.shutdown(wait=True)
+            # record what we have so far to be resumed later
+            self._save_segments_state(f.name, segments)
+            raise
+        finally:
+            pool.shutdown(wait=True)
+        state_filepath = self._get_segments_state_filename(f.name)
+        if op.lexists(state_filepath):
+            unlink(state_filepath)
+
+    def _download_segment(self, fd, segment, update_progress, abort):
+        """Download a single segment of a segmented download
+
+        `segment` is a [start, end, done] record, whose `done` count is kept
+        up to date with the bytes written into the file descriptor `fd`.
+        """
+        start, end = segment[:2]
+        offset = start + segment[2]
+        headers = {
+            'Accept-Encoding': '',
+            'Range': 'bytes=%d-%d' % (offset, end - 1),
+        }
+        validator = self._get_validator()
+        if validator:
+            # make the server refuse the range if the content changed
+            headers['If-Range'] = validator
+        response = self.session.get(self.url, stream=True, headers=headers)
+        try:
+            check_response_status(response, session=self.session)
+            if response.status_code != 206 \
+                    or not response.headers.get('Content-Range', '').startswith(
+                        'bytes %d-' % offset):
+                raise DownloadError(
+                    "Download of the range %d-%d of %s was not honored by "
+                    "the server (status code %d). The content might have "
+                    "changed." % (offset, end - 1, self.url,
+                                  response.status_code))
+            for chunk in response.raw.stream(
+                    min(self.chunk_size, end - offset), decode_content=False):
+                if abort.is_set():
+                    return
+                if not chunk:
+                    continue
+                chunk = chunk[:end - offset]
+                written = 0
+                while written < len(chunk):
+                    written += os.pwrite(fd, chunk[written:], offset + written)
+                offset += written
+                segment[2] = offset - start
+                update_progress(written)
+                if offset >= end:
+                    break
+        finally:
+            response.close()
+        if offset < end:
+            raise IncompleteDownloadError(
+                "Download of the range %d-%d of %s ended at %d"
+                % (start, end - 1, self.url, offset))
+
 
 @auto_repr
 class HTTPDownloader(BaseDownloader):
@@ -535,7 +760,8 @@ class HTTPDownloader(BaseDownloader):
             url=response.url,
             filename=url_filename,
             headers=headers,
-            response=response
+            response=response,
+            session=self._session,
         )
 
     @classmethod
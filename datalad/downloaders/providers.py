@@ -14,9 +14,16 @@ from logging import getLogger
 
 import os
 import re
+import threading
 from os.path import dirname, abspath, join as pathjoin
 from urllib.parse import urlparse
-from collections import OrderedDict
+from collections import (
+    OrderedDict,
+    deque,
+)
+from concurrent.futures import ThreadPoolExecutor
+
+from .. import cfg
 
 from .base import NoneAuthenticator, NotImplementedAuthenticator
 
@@ -141,6 +148,11 @@ class Provider(object):
         return self._downloader
 
 
+def _pop_result(pending):
+    res = pending.popleft()
+    return res if isinstance(res, tuple) else res.result()
+
+
 class Providers(object):
     """
 
@@ -483,6 +495,85 @@ type = {credential_type}
     def get_status(self, url, *args, **kwargs):
         return self.get_provider(url).get_downloader(url).get_status(url, *args, **kwargs)
 
+    def iter_status(self, urls, jobs=None):
+        """Obtain the status of many URLs concurrently
+
+        Statuses are requested by a pool of threads, with no more than
+        `datalad.runtime.max-url-status-jobs-per-host` concurrent requests
+        to any single host. The status of the first URL handled by any
+        downloader is requested on its own, before any other URL of that
+        downloader, so that its session is established (and authenticated,
+        possibly interactively) only once, and then shared by all threads.
+
+        Parameters
+        ----------
+        urls : iterable of str
+        jobs : int or None
+          Maximum number of concurrent requests. If None,
+          `datalad.runtime.max-url-status-jobs` is used.
+
+        Yields
+        ------
+        tuple
+          (url, status, exception) in the order of `urls`. `status` is as
+          returned by `get_status()`, or None if it failed with `exception`.
+          Requests that have not started yet are cancelled when the
+          generator is closed before all statuses were reported.
+        """
+        if jobs is None:
+            jobs = cfg.obtain('datalad.runtime.max-url-status-jobs')
+        per_host = max(
+            1, cfg.obtain('datalad.runtime.max-url-status-jobs-per-host'))
+        host_slots = {}
+
+        def _get_status(downloader, url):
+            slot = host_slots.setdefault(
+                urlparse(url).netloc, threading.BoundedSemaphore(per_host))
+            try:
+                with slot:
+                    return url, downloader.get_status(url), None
+            except Exception as e:
+                return url, None, e
+
+        if jobs < 2:
+            for url in urls:
+                try:
+                    downloader = self.get_provider(url).get_downloader(url)
+                except Exception as e:
+                    yield url, None, e
+                    continue
+                yield _get_status(downloader, url)
+            return
+
+        used_downloaders = set()
+        # results or futures in the order of `urls`
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            try:
+                for url in urls:
+                    try:
+                        downloader = self.get_provider(url).get_downloader(url)
+                    except Exception as e:
+                        pending.append((url, None, e))
+                    else:
+                        if id(downloader) in used_downloaders:
+                            pending.append(
+                                pool.submit(_get_status, downloader, url))
+                        else:
+                            used_downloaders.add(id(downloader))
+                            pending.append(_get_status(downloader, url))
+                    # do not queue up an unbounded number of requests
+                    while len(pending) > 2 * jobs:
+                        yield _pop_result(pending)
+                while pending:
+                    yield _pop_result(pending)
+            finally:
+                # the consumer might have stopped early (e.g. on the first
+                # available URL), do not wait for requests nobody asks for
+                for res in pending:
+                    if not isinstance(res, tuple):
+                        res.cancel()
+
     def needs_authentication(self, url):
         provider = self.get_provider(url, only_nondefault=True)
         if provider is None:
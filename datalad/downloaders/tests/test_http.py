@@ -61,6 +61,7 @@ from ...tests.utils import (
     assert_raises,
     known_failure_githubci_win,
     ok_file_has_content,
+    patch_config,
     serve_path_via_http, with_tree,
     skip_if,
     skip_if_no_network,
@@ -497,6 +498,67 @@ def test_HTMLFormAuthenticator_httpretty(d):
     # the provided URL at the end 404s, or another failure (e.g. interrupted download)
 
 
+@skip_if(not httpretty, "no httpretty")
+@without_http_proxy
+@httpretty.activate
+@with_tempfile(mkdir=True)
+def test_download_segments(d):
+    content = bytes(range(256)) * (3 * 4096 + 1)
+    requested_ranges = []
+    fail_range = []
+
+    def request_get_callback(request, uri, headers):
+        headers['Accept-Ranges'] = 'bytes'
+        headers['ETag'] = '"v1"'
+        range_ = request.headers.get('Range')
+        requested_ranges.append(range_)
+        if not range_:
+            return (200, headers, content)
+        if range_ in fail_range:
+            return (503, headers, "try later")
+        assert_equal(request.headers.get('If-Range'), '"v1"')
+        start, end = map(int, range_[len('bytes='):].split('-'))
+        headers['Content-Range'] = 'bytes %d-%d/%d' % (
+            start, end, len(content))
+        return (206, headers, content[start:end + 1])
+
+    httpretty.register_uri(httpretty.GET, url, body=request_get_callback)
+
+    fpath = opj(d, 'segmented')
+    with patch_config({'datalad.runtime.download-segments': '4',
+                       'datalad.runtime.download-segment-size': '1'}):
+        HTTPDownloader().download(url, path=fpath)
+        with open(fpath, 'rb') as f:
+            assert_equal(f.read(), content)
+        # 3 segments of at least 1 MiB after the initial request
+        assert_equal(
+            sorted(requested_ranges[1:]),
+            ['bytes=0-1048660', 'bytes=1048661-2097321',
+             'bytes=2097322-3145983'])
+        assert_equal(os.listdir(d), ['segmented'])
+
+        # a failing segment leaves a partial download behind ...
+        del requested_ranges[:]
+        fail_range.append('bytes=1048661-2097321')
+        fpath = opj(d, 'resumed')
+        with swallow_logs():
+            assert_raises(DownloadError, HTTPDownloader().download, url,
+                          path=fpath)
+        assert_equal(
+            sorted(os.listdir(d)),
+            ['resumed.datalad-download-temp',
+             'resumed.datalad-download-temp.segments',
+             'segmented'])
+        # ... from which only incomplete segments are downloaded later on
+        del requested_ranges[:]
+        del fail_range[:]
+        HTTPDownloader().download(url, path=fpath)
+        with open(fpath, 'rb') as f:
+            assert_equal(f.read(), content)
+        assert_in('bytes=1048661-2097321', requested_ranges)
+        assert_equal(sorted(os.listdir(d)), ['resumed', 'segmented'])
+
+
 @with_memory_keyring
 @with_testsui(responses=['no', 'yes', 'testlogin', 'testpassword'])
 def test_auth_but_no_cred(keyring):
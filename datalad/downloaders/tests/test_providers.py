@@ -11,6 +11,8 @@
 import os.path as op
 
 import logging
+import threading
+import time
 
 from unittest.mock import patch
 
@@ -20,17 +22,21 @@ from ..providers import HTTPDownloader
 from ...utils import chpwd
 from ...utils import create_tree
 from ...tests.utils import assert_in
+from ...tests.utils import assert_is_instance
 from ...tests.utils import assert_false
 from ...tests.utils import assert_greater
 from ...tests.utils import assert_equal
 from ...tests.utils import assert_raises
 from ...tests.utils import ok_exists
+from ...tests.utils import patch_config
 from ...tests.utils import swallow_logs
 from ...tests.utils import with_tempfile
 from ...tests.utils import with_tree
 from ...tests.utils import with_testsui
 
+from ...support.exceptions import TargetFileAbsent
 from ...support.external_versions import external_versions
+from ...support.status import FileStatus
 
 
 def test_Providers_OnStockConfiguration():
@@ -255,3 +261,69 @@ def test_providers_badre(path):
     with swallow_logs(logging.WARNING) as msg:
         the_chosen_one = providers.get_provider('https://foo.org/data')
         assert_in("Invalid regex", msg.out)
+
+
+def test_providers_iter_status():
+    providers = Providers()
+    lock = threading.Lock()
+    running = {}
+    max_running = {}
+    first_alone = []
+
+    def get_status(self, url, **kwargs):
+        host = url.split('/')[2]
+        with lock:
+            if not max_running:
+                # the very first request has no company
+                first_alone.append(not any(running.values()))
+            running[host] = running.get(host, 0) + 1
+            max_running[host] = max(max_running.get(host, 0), running[host])
+        time.sleep(0.01)
+        with lock:
+            running[host] -= 1
+        if url.endswith('missing'):
+            raise TargetFileAbsent(url)
+        return FileStatus(size=len(url))
+
+    urls = ['http://host%d.example.com/%s' % (i % 2, i) for i in range(20)]
+    urls[7] += 'missing'
+    with patch.object(HTTPDownloader, 'get_status', get_status), \
+            patch_config({
+                'datalad.runtime.max-url-status-jobs-per-host': '2'}):
+        for jobs in (1, 6):
+            max_running.clear()
+            del first_alone[:]
+            res = list(providers.iter_status(urls, jobs=jobs))
+            # results are reported in order
+            assert_equal([r[0] for r in res], urls)
+            for url, status, exc in res:
+                if url.endswith('missing'):
+                    assert_equal(status, None)
+                    assert_is_instance(exc, TargetFileAbsent)
+                else:
+                    assert_equal(status, FileStatus(size=len(url)))
+                    assert_equal(exc, None)
+            assert_equal(first_alone, [True])
+            assert_equal(max(max_running.values()), 1 if jobs == 1 else 2)
+
+
+def test_providers_iter_status_close():
+    providers = Providers()
+    lock = threading.Lock()
+    requested = []
+
+    def get_status(self, url, **kwargs):
+        with lock:
+            requested.append(url)
+        time.sleep(0.05)
+        return FileStatus(size=len(url))
+
+    urls = ['http://host%d.example.com/' % i for i in range(40)]
+    jobs = 4
+    with patch.object(HTTPDownloader, 'get_status', get_status):
+        statuses = providers.iter_status(urls, jobs=jobs)
+        assert_equal(next(statuses)[0], urls[0])
+        statuses.close()
+    # requests queued for the following URLs were cancelled, only the
+    # first one and those already running were completed
+    assert_greater(jobs + 2, len(requested))
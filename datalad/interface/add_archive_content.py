@@ -18,6 +18,8 @@ import re
 import os
 import tempfile
 
+from concurrent.futures import ThreadPoolExecutor
+
 from os.path import join as opj, curdir, exists, lexists, relpath, basename
 from os.path import commonprefix
 from os.path import sep as opsep
@@ -29,6 +31,7 @@ from os.path import normpath
 from .base import Interface
 from datalad.interface.base import build_doc
 from .common_opts import allow_dirty
+from .common_opts import jobs_opt
 from ..consts import ARCHIVES_SPECIAL_REMOTE
 from ..support.param import Parameter
 from ..support.constraints import EnsureStr, EnsureNone
@@ -46,6 +49,7 @@ from ..utils import get_dataset_root
 from ..utils import split_cmdline
 
 from datalad.customremotes.base import init_datalad_remote
+from datalad.local.copy_file import _copyfile
 
 from ..log import logging
 lgr = logging.getLogger('datalad.interfaces.add_archive_content')
@@ -175,6 +179,18 @@ class AddArchiveContent(Interface):
              be used to "index" files within annex without actually creating corresponding
              files under git.  Note that `annex dropunused` would later remove that load"""),
 
+        jobs=Parameter(
+            args=("-J", "--jobs"),
+            metavar="NJOBS",
+            constraints=jobs_opt.constraints,
+            doc="""if given, add extracted files in a pipelined mode: files are
+            placed into the dataset by a pool of this many workers, and
+            are annexed and registered with their URLs in batches, instead
+            of adding each file from its URL individually. Annex options
+            that only apply to adding files from URLs (e.g. --fast or
+            --relaxed) are not supported in this mode, and disable it.
+            "auto" corresponds to the number defined by the
+            'datalad.runtime.max-annex-jobs' configuration item."""),
         # TODO: interaction with archives cache whenever we make it persistent across runs
         archive=Parameter(
             doc="archive file or a key (if %s specified)" % _KEY_OPT,
@@ -199,7 +215,7 @@ class AddArchiveContent(Interface):
                  use_current_dir=False,
                  delete=False, key=False, exclude=None, rename=None, existing='fail',
                  annex_options=None, copy=False, commit=True, allow_dirty=False,
-                 stats=None, drop_after=False, delete_after=False):
+                 stats=None, drop_after=False, delete_after=False, jobs=None):
         """
         Returns
         -------
@@ -311,6 +327,7 @@ class AddArchiveContent(Interface):
 
         precommitted = False
         delete_after_rpath = None
+        pool = None
         try:
             old_always_commit = annex.always_commit
             # When faking dates, batch mode is disabled, so we want to always
@@ -336,6 +353,20 @@ class AddArchiveContent(Interface):
             outside_stats = stats
             stats = ActivityStats()
 
+            pool = _get_pool(jobs, annex, annex_options)
+            # (source path, target path, url) of files to be added in the
+            # pipelined mode
+            pending = []
+            pending_targets = set()
+
+            def flush_pending():
+                _add_extracted_files(
+                    annex, pending, pool,
+                    annex_options=annex_options, drop_after=drop_after,
+                    stats=stats)
+                del pending[:]
+                pending_targets.clear()
+
             for extracted_file in earchive.get_extracted_files():
                 stats.files += 1
                 extracted_path = opj(earchive.path, extracted_file)
@@ -388,6 +419,10 @@ class AddArchiveContent(Interface):
 
                 target_file_path = opj(annex.path, target_file_path)
 
+                if target_file_path in pending_targets:
+                    # place preceding files first, to detect the collision
+                    flush_pending()
+
                 if lexists(target_file_path):
                     handle_existing = True
                     if md5sum(target_file_path) == md5sum(extracted_path):
@@ -452,24 +487,30 @@ class AddArchiveContent(Interface):
                     # addurl implementation relying on annex'es addurl below would actually copy
                     pass
 
-                lgr.debug("Adding %s to annex pointing to %s and with options %r",
-                          target_file_path, url, annex_options)
-
-                out_json = annex.add_url_to_file(
-                    target_file_path,
-                    url, options=annex_options,
-                    batch=True)
-
-                if 'key' in out_json and out_json['key'] is not None:  # annex.is_under_annex(target_file, batch=True):
-                    # due to http://git-annex.branchable.com/bugs/annex_drop_is_not___34__in_effect__34___for_load_which_was___34__addurl_--batch__34__ed_but_not_yet_committed/?updated
-                    # we need to maintain a list of those to be dropped files
-                    if drop_after:
-                        annex.drop_key(out_json['key'], batch=True)
-                        stats.dropped += 1
-                    stats.add_annex += 1
+                if pool:
+                    pending.append((extracted_path, target_file_path, url))
+                    pending_targets.add(target_file_path)
+                    if len(pending) >= _PIPELINE_CHUNK_SIZE:
+                        flush_pending()
                 else:
-                    lgr.debug("File {} was added to git, not adding url".format(target_file_path))
-                    stats.add_git += 1
+                    lgr.debug("Adding %s to annex pointing to %s and with options %r",
+                              target_file_path, url, annex_options)
+
+                    out_json = annex.add_url_to_file(
+                        target_file_path,
+                        url, options=annex_options,
+                        batch=True)
+
+                    if 'key' in out_json and out_json['key'] is not None:  # annex.is_under_annex(target_file, batch=True):
+                        # due to http://git-annex.branchable.com/bugs/annex_drop_is_not___34__in_effect__34___for_load_which_was___34__addurl_--batch__34__ed_but_not_yet_committed/?updated
+                        # we need to maintain a list of those to be dropped files
+                        if drop_after:
+                            annex.drop_key(out_json['key'], batch=True)
+                            stats.dropped += 1
+                        stats.add_annex += 1
+                    else:
+                        lgr.debug("File {} was added to git, not adding url".format(target_file_path))
+                        stats.add_git += 1
 
                 if delete_after:
                     # delayed removal so it doesn't interfer with batched processes since any pure
@@ -491,6 +532,9 @@ class AddArchiveContent(Interface):
 
                 del target_file  # Done with target_file -- just to have clear end of the loop
 
+            if pending:
+                flush_pending()
+
             if delete and archive and origin != 'key':
                 lgr.debug("Removing the original archive {}".format(archive))
                 # force=True since some times might still be staged and fail
@@ -538,8 +582,93 @@ class AddArchiveContent(Interface):
                         delete_after_path)
                     rmtree(delete_after_path)
 
+            if pool:
+                pool.shutdown(wait=True)
             annex.always_commit = old_always_commit
             # remove what is left and/or everything upon failure
             earchive.clean(force=True)
 
         return annex
+
+
+# number of files placed, annexed, and registered in one go in the
+# pipelined mode
+_PIPELINE_CHUNK_SIZE = 1000
+
+
+# options of `git annex addurl` that `git annex add` does not know
+_ADDURL_ONLY_OPTIONS = {
+    '--fast', '--relaxed', '--raw', '--no-raw', '--raw-except', '--file',
+    '--preserve-filename', '--pathdepth', '--prefix', '--suffix',
+}
+
+
+def _get_pool(jobs, annex, annex_options=None):
+    """Return a thread pool for the pipelined mode, or None"""
+    if jobs is None:
+        return None
+    if annex.fake_dates_enabled:
+        lgr.debug("Not using pipelined mode because fake dates are enabled")
+        return None
+    addurl_options = [
+        o for o in annex_options or []
+        if o.split('=', 1)[0] in _ADDURL_ONLY_OPTIONS]
+    if addurl_options:
+        lgr.warning(
+            "Not using pipelined mode, because annex options %s only "
+            "apply to adding files from URLs", addurl_options)
+        return None
+    if jobs == 'auto':
+        jobs = annex.config.obtain('datalad.runtime.max-annex-jobs')
+    return ThreadPoolExecutor(max_workers=max(jobs or 1, 1))
+
+
+def _place_file(src, dst):
+    """Place a copy of an extracted file into the dataset"""
+    dst_dir = dirname(dst)
+    if not exists(dst_dir):
+        os.makedirs(dst_dir, exist_ok=True)
+    # extracted symlinks were checked to point to existing files, and
+    # annex shall receive their content, as it would via addurl.
+    # No hardlink: annex would take over the inode of the file in the
+    # archives cache, and edits to a file in the worktree would modify it.
+    # A reflink does not share anything that could be modified.
+    _copyfile(os.path.realpath(src), dst)
+
+
+def _add_extracted_files(annex, pending, pool, annex_options, drop_after,
+                         stats):
+    """Add extracted files to annex and register their URLs in batches
+
+    Parameters
+    ----------
+    annex : AnnexRepo
+    pending : list of tuple
+      (extracted path, target path, url) records.
+    pool : ThreadPoolExecutor
+      Used to place files into the dataset concurrently.
+    """
+    lgr.debug("Adding %d extracted files to %s", len(pending), annex)
+    # consume the iterator to surface errors
+    for _ in pool.map(lambda r: _place_file(r[0], r[1]), pending):
+        pass
+    files = [relpath(r[1], annex.path) for r in pending]
+    out_jsons = annex.add(files, options=annex_options, batch=True)
+    keys_urls = []
+    for (_, target_file_path, url), out_json in zip(pending, out_jsons):
+        if not out_json.get('success', False):
+            raise RuntimeError(
+                "Error, annex reported failure for add of %s: %s"
+                % (target_file_path, out_json))
+        if out_json.get('key') is not None:
+            keys_urls.append((out_json['key'], url))
+        else:
+            lgr.debug("File %s was added to git, not adding url",
+                      target_file_path)
+            stats.add_git += 1
+    stats.add_annex += len(keys_urls)
+    # the URLs must be registered before any content is dropped
+    annex.register_urls(keys_urls)
+    if drop_after and keys_urls:
+        annex.drop_key([k for k, _ in keys_urls], batch=True)
+        stats.dropped += len(keys_urls)
@@ -42,7 +42,7 @@ from datalad.distribution.dataset import Dataset
 from datalad.distribution.dataset import EnsureDataset
 from datalad.distribution.dataset import datasetmethod
 
-from datalad.utils import get_dataset_root
+from datalad.utils import DatasetRootResolver
 from datalad.utils import with_pathsep as _with_sep
 from datalad.utils import path_startswith
 from datalad.utils import path_is_subpath
@@ -608,6 +608,8 @@ class AnnotatePaths(Interface):
         #  caching off if/when needed, or provide some other way to invalidate
         #  it
         subdss_cache = {}
+        # same assumption for the dataset hierarchy on the file system
+        get_root = DatasetRootResolver()
 
         # do not loop over unique(), this could be a list of dicts
         # we avoid duplicates manually below via `reported_paths`
@@ -647,7 +649,7 @@ class AnnotatePaths(Interface):
                 if not containing_dir:
                     containing_dir = curdir
 
-            dspath = parent = get_dataset_root(containing_dir)
+            dspath = parent = get_root(containing_dir)
             if dspath:
                 if path_props.get('type', None) == 'dataset':
                     # for a dataset the root is not the parent, for anything else
@@ -660,7 +662,7 @@ class AnnotatePaths(Interface):
                         # either forced, or only if we have a reference dataset, and
                         # only if we stay within this refds when searching for the
                         # parent
-                        parent = get_dataset_root(normpath(opj(containing_dir, pardir)))
+                        parent = get_root(normpath(opj(containing_dir, pardir)))
                         # NOTE the `and refds_path` is critical, as it will determine
                         # whether a top-level dataset that was discovered gets the
                         # parent property or not, it won't get it without a common
@@ -293,6 +293,13 @@ definitions = {
         'type': EnsureInt(),
         'default': 5,
     },
+    'datalad.metadata.aggregate-incremental-content': {
+        'ui': ('yesno', {
+               'title': 'Incremental content metadata aggregation',
+               'text': 'If enabled, metadata aggregation only extracts content metadata for files that were added or modified since the previous aggregation, and merges it with the previously aggregated content metadata, instead of extracting it from all files of a dataset again. Changes that are not reflected in the committed file tree (e.g. git-annex metadata or URLs, or file content that became locally available) are not picked up for unmodified files'}),
+        'type': EnsureBool(),
+        'default': False,
+    },
     'datalad.metadata.maxfieldsize': {
         'ui': ('question', {
                'title': 'Maximum metadata field size',
@@ -312,6 +319,13 @@ definitions = {
         'type': EnsureBool(),
         'default': True,
     },
+    'datalad.metadata.store-aggregate-content-format': {
+        'ui': ('question', {
+               'title': 'Aggregated content metadata storage format',
+               'text': "Format of aggregated content metadata objects. 'xz' stores a compressed JSON stream, 'sqlite' stores an SQLite database that permits querying metadata on individual files without loading the entire object"}),
+        'type': EnsureChoice('xz', 'sqlite'),
+        'default': 'xz',
+    },
     'datalad.search.default-mode': {
         'ui': ('question', {
                'title': 'Default search mode',
@@ -332,6 +346,55 @@ definitions = {
                'text': 'Git-annex large files expression (see https://git-annex.branchable.com/tips/largefiles; given expression will be wrapped in parentheses)'}),
         'default': 'anything',
     },
+    'datalad.runtime.archive-member-extraction': {
+        'ui': ('question', {
+               'title': 'Extraction of individual files from archives',
+               'text': 'How to obtain a single file from an archive (e.g. via the datalad-archives special remote). With "auto", files are read directly from ZIP archives and uncompressed tarballs, and other archives are fully extracted into a cache. With "always", compressed tarballs are also decompressed as a stream up to the requested file, which needs no scratch space, but has to decompress the archive again for each file. With "never", archives are always fully extracted'}),
+        'type': EnsureChoice('auto', 'always', 'never'),
+        'default': 'auto',
+    },
+    'datalad.runtime.archives-cache-size': {
+        'ui': ('question', {
+               'title': 'Maximum size of the cache of extracted archives (in MiB)',
+               'text': 'Archives extracted to obtain files from them (e.g. by the datalad-archives special remote) are kept in a cache under .git, and reused across sessions. If this size is exceeded, the least recently used extracted archives are removed. 0 means no limit'}),
+        'type': EnsureInt(),
+        'default': 0,
+    },
+    'datalad.runtime.batch-pool-idle-timeout': {
+        'ui': ('question', {
+               'title': 'Idle timeout of pooled batch processes',
+               'text': 'Number of seconds after which a long-lived batch process (e.g. git cat-file --batch, git annex find --batch) that was not used is terminated'}),
+        'type': EnsureInt(),
+        'default': 300,
+    },
+    'datalad.runtime.batch-pool-size': {
+        'ui': ('question', {
+               'title': 'Maximum number of pooled batch processes',
+               'text': 'Long-lived batch processes for read-only queries are shared across repository instances and commands within a session. Once this number of processes is exceeded, the least recently used one is terminated. Set to 0 to disable pooling'}),
+        'type': EnsureInt(),
+        'default': 32,
+    },
+    'datalad.runtime.content-info-cache': {
+        'ui': ('yesno', {
+               'title': 'Persistent cache for repository content listings',
+               'text': 'If enabled, parsed content listings of Git references and of the Git index (queries that exclude untracked content) are cached under .git/datalad/cache, and are reused by subsequent status, diff, or save calls as long as the reference or the index did not change'}),
+        'type': EnsureBool(),
+        'default': False,
+    },
+    'datalad.runtime.download-segment-size': {
+        'ui': ('question', {
+               'title': 'Minimum size of a segment of a segmented download (in MiB)',
+               'text': 'Files are only split into as many segments for a segmented download (see datalad.runtime.download-segments) as yield segments of at least this size'}),
+        'type': EnsureInt(),
+        'default': 64,
+    },
+    'datalad.runtime.download-segments': {
+        'ui': ('question', {
+               'title': 'Maximum number of concurrent segments of an HTTP download',
+               'text': 'If larger than 1, files from HTTP servers supporting range requests are downloaded in up to this number of segments concurrently, each via its own connection. Interrupted segmented downloads are resumed from the partial download on the next attempt'}),
+        'type': EnsureInt(),
+        'default': 1,
+    },
     'datalad.runtime.max-annex-jobs': {
         'ui': ('question', {
                'title': 'Maximum number of git-annex jobs to request when "jobs" option set to "auto" (default)',
@@ -339,6 +402,27 @@ definitions = {
         'type': EnsureInt(),
         'default': 1,
     },
+    'datalad.runtime.max-url-status-jobs': {
+        'ui': ('question', {
+               'title': 'Maximum number of concurrent URL status requests',
+               'text': 'Number of threads used to check the status (e.g. existence and size) of many URLs at once, e.g. when the datalad special remote verifies the presence of a key with multiple URLs'}),
+        'type': EnsureInt(),
+        'default': 8,
+    },
+    'datalad.runtime.max-url-status-jobs-per-host': {
+        'ui': ('question', {
+               'title': 'Maximum number of concurrent URL status requests per host',
+               'text': 'Limits the number of concurrent URL status requests (see datalad.runtime.max-url-status-jobs) to any single host'}),
+        'type': EnsureInt(),
+        'default': 4,
+    },
+    'datalad.runtime.persistent-runner': {
+        'ui': ('yesno', {
+               'title': 'Reuse a persistent event loop for running commands',
+               'text': 'If enabled, subprocesses are executed via a long-lived event loop (one per thread), instead of starting and closing a new one for every command. This reduces the overhead of running many short commands (e.g. git calls in recursive operations)'}),
+        'type': EnsureBool(),
+        'default': False,
+    },
     'datalad.runtime.raiseonerror': {
         'ui': ('question', {
                'title': 'Error behavior',
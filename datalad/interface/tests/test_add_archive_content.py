@@ -22,6 +22,8 @@ from os.path import (
     pardir,
 )
 from glob import glob
+import logging
+from unittest.mock import MagicMock
 
 from datalad.tests.utils import (
     assert_cwd_unchanged,
@@ -62,6 +64,10 @@ from datalad.api import (
     add_archive_content,
     clean,
 )
+from datalad.interface.add_archive_content import (
+    _get_pool,
+    _place_file,
+)
 from datalad.consts import (
     ARCHIVES_SPECIAL_REMOTE,
     DATALAD_SPECIAL_REMOTES_UUIDS,
@@ -491,6 +497,33 @@ class TestAddArchiveOptions():
         # there should be no .datalad temporary files hanging around
         self.assert_no_trash_left_behind()
 
+    @known_failure_windows
+    def test_add_jobs(self):
+        key1 = 'SHA256E-s5--16d3ad1974655987dd7801d70659990b89bfe7e931a0a358964e64e901761cc0.dat'
+        add_archive_content('1.tar', annex=self.annex, strip_leading_dirs=True,
+                            jobs=2)
+        ok_file_under_git(self.annex.path, 'file.txt', annexed=True)
+        ok_file_under_git(self.annex.path, '1.dat', annexed=True)
+        assert_repo_status(self.annex.path)
+        ok_archives_caches(self.annex.path, 0)
+        w = self.annex.whereis(key1, key=True, output='full')
+        # in archive, and locally
+        assert_equal(len(w), 2)
+        assert_in(DATALAD_SPECIAL_REMOTES_UUIDS[ARCHIVES_SPECIAL_REMOTE], w)
+
+        # same with dropping the content, which remains available from
+        # the archive
+        self.annex.drop(['file.txt', '1.dat'])
+        add_archive_content('1.tar', annex=self.annex,
+                            add_archive_leading_dir=True, drop_after=True,
+                            jobs=2)
+        ok_file_under_git(self.annex.path, opj('1', '1.dat'), annexed=True)
+        w = self.annex.whereis(key1, key=True, output='full')
+        assert_equal(len(w), 1)
+        self.annex.get(opj('1', '1.dat'))
+        with open(opj(self.annex.path, '1', '1.dat')) as f:
+            eq_(f.read(), 'load2')
+
     @known_failure_windows
     def test_add_delete_after_and_drop_subdir(self):
         os.mkdir(opj(self.annex.path, 'subdir'))
@@ -561,3 +594,27 @@ class TestAddArchiveOptions():
             , existing='overwrite'
         )
         ok_file_under_git(self.annex.path, '1.dat', annexed=True)
+
+
+@with_tree(tree={'extracted': {'file.txt': 'load'}})
+def test_place_file(path):
+    src = opj(path, 'extracted', 'file.txt')
+    dst = opj(path, 'ds', 'sub', 'file.txt')
+    _place_file(src, dst)
+    with open(dst) as f:
+        eq_(f.read(), 'load')
+    # a copy, modifying it must not modify the file in the archives cache
+    assert_false(os.path.samefile(src, dst))
+
+
+def test_get_pool_addurl_options():
+    annex = MagicMock(fake_dates_enabled=False)
+    pool = _get_pool(2, annex, ['-c', 'annex.largefiles=nothing'])
+    ok_(pool is not None)
+    pool.shutdown()
+    # options only known to addurl cannot be passed to add
+    for opts in (['--relaxed'], ['--pathdepth=2'], ['-c', 'a=b', '--fast']):
+        with swallow_logs(new_level=logging.WARNING) as cml:
+            ok_(_get_pool(2, annex, opts) is None)
+            assert_in(opts[-1], cml.out)
+
@@ -15,10 +15,12 @@ import logging
 from os.path import (
     exists,
     join as opj,
+    sep,
 )
 from datalad.tests.utils import (
     assert_dict_equal,
     assert_equal,
+    assert_false,
     assert_in,
     assert_not_equal,
     assert_not_in,
@@ -49,6 +51,7 @@ from ..utils import (
     discover_dataset_trace_to_targets,
     eval_results,
     handle_dirty_dataset,
+    path_is_under,
 )
 from datalad.interface.base import build_doc
 
@@ -381,6 +384,21 @@ def test_discover_ds_trace(path, otherdir):
         assert_dict_equal(spec, goal)
 
 
+def test_path_is_under():
+    base = opj(sep, 'some', 'base')
+    assert_true(path_is_under([base], base))
+    assert_true(path_is_under([base], opj(base, 'sub')))
+    # regardless of the depth
+    assert_true(path_is_under([base], opj(base, 'sub', 'deeper', 'deepest')))
+    assert_true(path_is_under(['/other', base], opj(base, 'sub')))
+    assert_true(path_is_under({'k1': ['/other'], 'k2': [base]},
+                              opj(base, 'sub')))
+    assert_false(path_is_under([base], opj(sep, 'some')))
+    assert_false(path_is_under([base], base + 'ment'))
+    assert_false(path_is_under([opj(base, 'sub')], base))
+    assert_false(path_is_under([], base))
+
+
 @contextmanager
 def _swallow_outputs(isatty=True):
     with swallow_outputs() as cmo:
@@ -17,15 +17,12 @@ import logging
 import wrapt
 import sys
 import re
-from os import curdir
-from os import pardir
 from os import listdir
 import os.path as op
 from os.path import join as opj
 from os.path import isdir
 from os.path import relpath
 from os.path import sep
-from os.path import split as psplit
 from itertools import chain
 
 import json
@@ -33,7 +30,6 @@ import json
 # avoid import from API to not get into circular imports
 from datalad.utils import with_pathsep as _with_sep  # TODO: RF whenever merge conflict is not upon us
 from datalad.utils import (
-    path_startswith,
     path_is_subpath,
     assure_unicode,
     getargspec,
@@ -41,6 +37,7 @@ from datalad.utils import (
 )
 from datalad.support.gitrepo import GitRepo
 from datalad.support.exceptions import IncompleteResultsError
+from datalad.support.path import PathPrefixIndex
 from datalad import cfg as dlcfg
 from datalad.dochelpers import (
     exc_str,
@@ -165,21 +162,14 @@ def path_is_under(values, path=None):
         path = getpwd()
     if isinstance(values, dict):
         values = chain(*values.values())
+    path = op.abspath(path)
     path_drive, _ = op.splitdrive(path)
-    for p in values:
-        p_drive, _ = op.splitdrive(p)
-        # need to protect against unsupported use of relpath() with
-        # abspaths on windows from different drives (gh-3724)
-        if path_drive != p_drive:
-        # different drives, enough evidence for "not under"
-            continue
-        rpath = relpath(p, start=path)
-        if rpath == curdir \
-                or rpath == pardir \
-                or set(psplit(rpath)) == {pardir}:
-            # first match is enough
-            return True
-    return False
+    # paths on different drives are enough evidence for "not under"
+    # (gh-3724)
+    index = PathPrefixIndex(
+        p for p in map(op.abspath, values)
+        if op.splitdrive(p)[0] == path_drive)
+    return index.get_parent(path) is not None
 
 
 def discover_dataset_trace_to_targets(basepath, targetpaths, current_trace,
@@ -227,6 +217,7 @@ def discover_dataset_trace_to_targets(basepath, targetpaths, current_trace,
     # this edge is not done, we need to try to reach any downstream
     # dataset
     undiscovered_ds = set(t for t in targetpaths) # if t != basepath)
+    targets_index = PathPrefixIndex(targetpaths)
     # whether anything in this directory matched a targetpath
     filematch = False
     if isdir(basepath):
@@ -241,8 +232,7 @@ def discover_dataset_trace_to_targets(basepath, targetpaths, current_trace,
             # in `targetpaths` -- so traverse only those in spec which have
             # leading dir basepath
             # filter targets matching this downward path
-            downward_targets = set(
-                t for t in targetpaths if path_startswith(t, p))
+            downward_targets = set(targets_index.get_children(p))
             if not downward_targets:
                 continue
             # remove the matching ones from the "todo" list
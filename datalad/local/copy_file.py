@@ -12,10 +12,22 @@ __docformat__ = 'restructuredtext'
 
 
 import logging
+import os
 import os.path as op
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from shutil import copyfile
 import sys
+import tempfile
+import threading
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    # not available on Windows
+    fcntl = None
+
+from datalad import cfg
 from datalad.dochelpers import exc_str
 from datalad.interface.base import Interface
 from datalad.interface.utils import eval_results
@@ -24,7 +36,10 @@ from datalad.support.constraints import (
     EnsureStr,
     EnsureNone,
 )
-from datalad.interface.common_opts import save_message_opt
+from datalad.interface.common_opts import (
+    jobs_opt,
+    save_message_opt,
+)
 from datalad.support.param import Parameter
 from datalad.distribution.dataset import (
     Dataset,
@@ -116,6 +131,14 @@ class CopyFile(Interface):
             character).[PY:  Alternatively, a list of 2-tuples with
             source/destination pairs can be given. PY]"""),
         message=save_message_opt,
+        jobs=Parameter(
+            args=("-J", "--jobs"),
+            metavar="NJOBS",
+            constraints=jobs_opt.constraints,
+            doc="""how many files to copy concurrently. Modifications of any
+            single destination dataset are still performed one at a time.
+            "auto" corresponds to the number defined by the
+            'datalad.runtime.max-annex-jobs' configuration item."""),
     )
 
     _examples_ = [
@@ -170,7 +193,8 @@ class CopyFile(Interface):
             recursive=False,
             target_dir=None,
             specs_from=None,
-            message=None):
+            message=None,
+            jobs=None):
         # Concept
         #
         # Loosely model after the POSIX cp command
@@ -184,6 +208,8 @@ class CopyFile(Interface):
         # Instead of sifting and sorting through input args, process them one
         # by one sequentially. Utilize lookup caching to make things faster,
         # instead of making the procedure itself more complicated.
+        # Information on source files is queried in bulk for a batch of
+        # specifications at a time.
 
         if path and specs_from:
             raise ValueError(
@@ -245,6 +271,21 @@ class CopyFile(Interface):
         repo_cache = {}
         # which paths to pass on to save
         to_save = []
+        # result records and (source, destination) pairs of files to copy,
+        # to be processed as a batch
+        specs = []
+
+        def process_specs():
+            for res in _copy_files(specs, repo_cache, pool):
+                yield dict(
+                    res,
+                    **res_kwargs
+                )
+                if res.get('status', None) == 'ok':
+                    to_save.append(res['destination'])
+            del specs[:]
+
+        pool = _get_pool(jobs, ds)
         try:
             for src_path, dest_path in _yield_specs(specs_from):
                 src_path = Path(src_path)
@@ -266,12 +307,11 @@ class CopyFile(Interface):
                     msg_impossible = 'need destination path or target directory'
 
                 if msg_impossible:
-                    yield dict(
+                    specs.append(dict(
                         path=str(src_path),
                         status='impossible',
                         message=msg_impossible,
-                        **res_kwargs
-                    )
+                    ))
                     continue
 
                 for src_file, dest_file in _yield_src_dest_filepaths(
@@ -279,26 +319,24 @@ class CopyFile(Interface):
                     if ds and ds.pathobj not in dest_file.parents:
                         # take time to compose proper error
                         dpath = str(target_dir if target_dir else dest_path)
-                        yield dict(
+                        specs.append(dict(
                             path=dpath,
                             status='error',
                             message=(
                                 'reference dataset does not contain '
                                 'destination path: %s',
                                 dpath),
-                            **res_kwargs
-                        )
+                        ))
                         # only recursion could yield further results, which would
                         # all have the same issue, so call it over right here
                         break
-                    for res in _copy_file(src_file, dest_file, cache=repo_cache):
-                        yield dict(
-                            res,
-                            **res_kwargs
-                        )
-                        if res.get('status', None) == 'ok':
-                            to_save.append(res['destination'])
+                    specs.append((src_file, dest_file))
+                    if len(specs) >= _BATCH_SIZE:
+                        yield from process_specs()
+            yield from process_specs()
         finally:
+            if pool:
+                pool.shutdown(wait=True)
             # cleanup time
             # TODO this could also be the place to stop lingering batch processes
             _cleanup_cache(repo_cache)
@@ -315,12 +353,29 @@ class CopyFile(Interface):
         )
 
 
+# number of copy specifications to query information for in bulk
+_BATCH_SIZE = 1000
+
+
+def _get_pool(jobs, ds):
+    """Return a thread pool for concurrent copying, or None"""
+    if jobs == 'auto':
+        jobs = (ds.config if ds else cfg).obtain(
+            'datalad.runtime.max-annex-jobs')
+    if not jobs or jobs < 2:
+        return None
+    if sys.version_info < (3, 8):
+        # no subprocesses via asyncio from threads other than the main one
+        lgr.debug('Concurrent copying requires Python 3.8+, '
+                  'proceeding serially')
+        return None
+    return ThreadPoolExecutor(max_workers=jobs)
+
+
 def _cleanup_cache(repo_cache):
-    done = set()
-    for _, repo_rec in repo_cache.items():
-        repo = repo_rec['repo']
-        if not repo or repo.pathobj in done:
-            continue
+    # temporary directories are on record in the state shared by all
+    # records of a repository, hence there is one at most per repository
+    for repo_rec in repo_cache.values():
         tmp = repo_rec.get('tmp', None)
         if tmp:
             try:
@@ -329,7 +384,6 @@ def _cleanup_cache(repo_cache):
                 lgr.warning(
                     'Failed to clean up temporary directory: %s',
                     exc_str(e))
-        done.add(repo.pathobj)
 
 
 def _yield_specs(specs):
@@ -417,10 +471,104 @@ def _get_repo_record(fpath, cache):
             repo=None if repo_root is None else Dataset(repo_root).repo,
             # this is different from repo.pathobj which resolves symlinks
             repo_root=Path(repo_root) if repo_root else None)
+        if repo_root:
+            # state shared by the records of all directories of a repository
+            repo_rec['shared'] = cache.setdefault(
+                ('shared', repo_root), dict(lock=threading.Lock()))
         cache[fdir] = repo_rec
     return repo_rec
 
 
+def _copy_files(specs, cache, pool=None):
+    """Copy a batch of files
+
+    Information on annexed source files is queried with a single call per
+    source repository, before the files are copied one by one, or
+    concurrently.
+
+    Parameters
+    ----------
+    specs : list
+      Items are either result records, which are passed through, or
+      (source, destination) tuples of files to copy.
+    cache : dict
+      Repository lookup cache.
+    pool : ThreadPoolExecutor, optional
+      If given, files are copied concurrently.
+
+    Yields
+    ------
+    dict
+      Result records, in the order of `specs`.
+    """
+    batch = []
+    dests = set()
+    dest_roots = set()
+    for spec in specs:
+        if isinstance(spec, tuple):
+            src_repo = _get_repo_record(spec[0], cache)['repo']
+            dest_repo = _get_repo_record(spec[1], cache)['repo']
+            if spec[1] in dests or (
+                    src_repo is not None and src_repo.pathobj in dest_roots):
+                # a preceding file might be the source of this one, or
+                # share its destination, process it first
+                yield from _copy_batch(batch, cache, pool)
+                batch = []
+                dests = set()
+                dest_roots = set()
+            dests.add(spec[1])
+            if dest_repo is not None:
+                dest_roots.add(dest_repo.pathobj)
+        batch.append(spec)
+    yield from _copy_batch(batch, cache, pool)
+
+
+def _copy_batch(specs, cache, pool):
+    _query_annexinfo([s for s in specs if isinstance(s, tuple)], cache)
+
+    def copy(spec):
+        if isinstance(spec, dict):
+            return [spec]
+        return list(_copy_file(spec[0], spec[1], cache=cache))
+
+    for res in (pool.map if pool else map)(copy, specs):
+        yield from res
+
+
+def _query_annexinfo(specs, cache):
+    """Query information on annexed source files in bulk
+
+    The information is placed in the shared state of the source repository
+    records, where `_copy_file()` will find it.
+    """
+    rpaths_by_repo = OrderedDict()
+    for src, dest in specs:
+        src_repo_rec = _get_repo_record(src, cache)
+        if isinstance(src_repo_rec['repo'], AnnexRepo) \
+                and op.lexists(str(src)):
+            rpaths_by_repo.setdefault(
+                src_repo_rec['repo_root'],
+                (src_repo_rec, []))[1].append(
+                    str(src.relative_to(src_repo_rec['repo_root'])))
+    for src_repo_rec, rpaths in rpaths_by_repo.values():
+        src_repo = src_repo_rec['repo']
+        finfos = src_repo.get_content_annexinfo(
+            paths=rpaths,
+            eval_availability=True,
+            eval_file_type=True,
+        )
+        finfos = {
+            str(p.relative_to(src_repo.pathobj)): props
+            for p, props in finfos.items()
+        }
+        annexed = [p for p in rpaths if 'key' in finfos.get(p, {})]
+        src_repo_rec['shared'].update(
+            finfo={p: finfos.get(p, {}) for p in rpaths},
+            whereis=src_repo.whereis(annexed, output='full')
+            if annexed else {},
+        )
+
+
 def _copy_file(src, dest, cache):
     lgr.debug("Attempt to copy: %s -> %s", src, dest)
     str_src = str(src)
@@ -475,16 +623,19 @@ def _copy_file(src, dest, cache):
     # look for URLs on record
     rpath = str(src.relative_to(src_repo_rec['repo_root']))
 
-    # pull what we know about this file from the source repo
-    finfo = src_repo.get_content_annexinfo(
-        paths=[rpath],
-        # a simple `exists()` will not be enough (pointer files, etc...)
-        eval_availability=True,
-        # if it truely is a symlink, not just an annex pointer, we would not
-        # want to resolve it
-        eval_file_type=True,
-    )
-    finfo = finfo.popitem()[1] if finfo else {}
+    # pull what we know about this file from the source repo, if it was
+    # not queried in bulk already
+    finfo = src_repo_rec['shared'].get('finfo', {}).get(rpath, None)
+    if finfo is None:
+        finfo = src_repo.get_content_annexinfo(
+            paths=[rpath],
+            # a simple `exists()` will not be enough (pointer files, etc...)
+            eval_availability=True,
+            # if it truely is a symlink, not just an annex pointer, we would not
+            # want to resolve it
+            eval_file_type=True,
+        )
+        finfo = finfo.popitem()[1] if finfo else {}
     if 'key' not in finfo or not isinstance(dest_repo, AnnexRepo):
         lgr.info(
             'Copying non-annexed file or copy into non-annex dataset: %s -> %s',
@@ -524,7 +675,9 @@ def _copy_file(src, dest, cache):
 
     # are there any URLs defined? Get them by special remote
     # query by key to hopefully avoid additional file system interaction
-    whereis = src_repo.whereis(finfo['key'], key=True, output='full')
+    whereis = src_repo_rec['shared'].get('whereis', {}).get(rpath, None)
+    if whereis is None:
+        whereis = src_repo.whereis(finfo['key'], key=True, output='full')
     urls_by_sr = {
         k: v['urls']
         for k, v in whereis.items()
@@ -534,50 +687,53 @@ def _copy_file(src, dest, cache):
     if urls_by_sr:
         # some URLs are on record in the for this file
         # obtain information on special remotes
-        src_srinfo = src_repo_rec.get('srinfo', None)
+        src_shared = src_repo_rec['shared']
+        src_srinfo = src_shared.get('srinfo', None)
         if src_srinfo is None:
             src_srinfo = _extract_special_remote_info(src_repo)
             # put in cache
-            src_repo_rec['srinfo'] = src_srinfo
-        # TODO generalize to more than one unique dest_repo
-        dest_srinfo = _extract_special_remote_info(dest_repo)
-
-        for src_rid, urls in urls_by_sr.items():
-            if not (src_rid == '00000000-0000-0000-0000-000000000001' or
-                    src_srinfo.get(src_rid, {}).get('externaltype', None) == 'datalad'):
-                # TODO generalize to any special remote
-                lgr.warning(
-                    'Ignore URL for presently unsupported special remote'
-                )
-                continue
-            if src_rid != '00000000-0000-0000-0000-000000000001' and \
-                    src_srinfo[src_rid] not in dest_srinfo.values():
-                # this is a special remote that the destination repo doesnt know
-                sri = src_srinfo[src_rid]
-                lgr.debug('Init additionally required special remote: %s', sri)
-                dest_repo.init_remote(
-                    # TODO what about a naming conflict across all dataset sources?
-                    sri['name'],
-                    ['{}={}'.format(k, v) for k, v in sri.items() if k != 'name'],
-                )
-                # must update special remote info for later matching
+            src_shared['srinfo'] = src_srinfo
+        dest_shared = dest_repo_rec['shared']
+        with dest_shared['lock']:
+            # TODO generalize to more than one unique dest_repo
+            dest_srinfo = dest_shared.get('srinfo', None)
+            if dest_srinfo is None:
                 dest_srinfo = _extract_special_remote_info(dest_repo)
-            for url in urls:
-                lgr.debug('Register URL for key %s: %s', dest_key, url)
-                # TODO OPT: add .register_url(key, batched=False) to AnnexRepo
-                #  to speed up this step by batching.
+                dest_shared['srinfo'] = dest_srinfo
+
+            for src_rid, urls in urls_by_sr.items():
+                if not (src_rid == '00000000-0000-0000-0000-000000000001' or
+                        src_srinfo.get(src_rid, {}).get('externaltype', None) == 'datalad'):
+                    # TODO generalize to any special remote
+                    lgr.warning(
+                        'Ignore URL for presently unsupported special remote'
+                    )
+                    continue
+                if src_rid != '00000000-0000-0000-0000-000000000001' and \
+                        src_srinfo[src_rid] not in dest_srinfo.values():
+                    # this is a special remote that the destination repo doesnt know
+                    sri = src_srinfo[src_rid]
+                    lgr.debug('Init additionally required special remote: %s', sri)
+                    dest_repo.init_remote(
+                        # TODO what about a naming conflict across all dataset sources?
+                        sri['name'],
+                        ['{}={}'.format(k, v) for k, v in sri.items() if k != 'name'],
+                    )
+                    # must update special remote info for later matching
+                    dest_srinfo = _extract_special_remote_info(dest_repo)
+                    dest_shared['srinfo'] = dest_srinfo
+                lgr.debug('Register URLs for key %s: %s', dest_key, urls)
+                dest_repo.register_urls([(dest_key, url) for url in urls])
+                dest_rid = src_rid \
+                    if src_rid == '00000000-0000-0000-0000-000000000001' \
+                    else [
+                        k for k, v in dest_srinfo.items()
+                        if v['name'] == src_srinfo[src_rid]['name']
+                    ].pop()
+                lgr.debug('Mark key %s as present for special remote: %s',
+                          dest_key, dest_rid)
                 dest_repo._run_annex_command(
-                    'registerurl', annex_options=[dest_key, url])
-            dest_rid = src_rid \
-                if src_rid == '00000000-0000-0000-0000-000000000001' \
-                else [
-                    k for k, v in dest_srinfo.items()
-                    if v['name'] == src_srinfo[src_rid]['name']
-                ].pop()
-            lgr.debug('Mark key %s as present for special remote: %s',
-                      dest_key, dest_rid)
-            dest_repo._run_annex_command(
-                'setpresentkey', annex_options=[dest_key, dest_rid, '1'])
+                    'setpresentkey', annex_options=[dest_key, dest_rid, '1'])
 
     # TODO prevent copying .datalad of from other datasets?
     yield dict(
@@ -593,7 +749,53 @@ def _replace_file(str_src, dest, str_dest, follow_symlinks):
         dest.unlink()
     else:
         dest.parent.mkdir(exist_ok=True, parents=True)
-    copyfile(str_src, str_dest, follow_symlinks=follow_symlinks)
+    _copyfile(str_src, str_dest, follow_symlinks=follow_symlinks)
+
+
+# ioctl request to make a file share the data blocks of another file
+# (copy-on-write), as supported by e.g. Btrfs and XFS on Linux
+_FICLONE = 0x40049409
+
+
+def _copyfile(str_src, str_dest, follow_symlinks=True):
+    """Like `shutil.copyfile()`, but avoids copying data where possible
+
+    Content is cloned (reflink) if the file system supports it, or else
+    copied in-kernel with `copy_file_range()`. Any other case is left to
+    `shutil.copyfile()`.
+    """
+    if (not follow_symlinks and op.islink(str_src)) \
+            or not (fcntl or hasattr(os, 'copy_file_range')):
+        copyfile(str_src, str_dest, follow_symlinks=follow_symlinks)
+        return
+    with open(str_src, 'rb') as fsrc, open(str_dest, 'wb') as fdst:
+        src_fd = fsrc.fileno()
+        dst_fd = fdst.fileno()
+        try:
+            if fcntl:
+                try:
+                    fcntl.ioctl(dst_fd, _FICLONE, src_fd)
+                    return
+                except OSError:
+                    if not hasattr(os, 'copy_file_range'):
+                        raise
+            size = os.fstat(src_fd).st_size
+            copied = 0
+            while copied < size:
+                n = os.copy_file_range(src_fd, dst_fd, size - copied)
+                if not n:
+                    break
+                copied += n
+            if copied == size:
+                return
+            # some kernels and file systems report a short copy
+            lgr.log(5, 'Copied only %i of %i bytes of %s without reading it',
+                    copied, size, str_src)
+        except OSError as e:
+            lgr.log(5, 'Cannot copy %s without reading it: %s',
+                    str_src, exc_str(e))
+    # not supported for these files, copyfile() truncates the destination
+    copyfile(str_src, str_dest)
 
 
 def _extract_special_remote_info(repo):
@@ -619,44 +821,53 @@ def _place_filekey(finfo, str_src, dest, str_dest, dest_repo_rec):
             str_src)
         dest_key = src_key
 
-    if op.lexists(str_dest):
-        # if the target already exists, we remove it first, because we want to
-        # modify this path (potentially pointing to a new key), rather than
-        # failing next on 'fromkey', due to a key mismatch.
-        # this is more compatible with the nature of 'cp'
-        dest.unlink()
-    res = dest_repo._run_annex_command_json(
-        'fromkey',
-        # we use force, because in all likelihood there is no content for this key
-        # yet
-        opts=[dest_key, str_dest, '--force'],
-        # doesn't work in adjusted-unlock mode
-        expect_fail=True,
-    )
-    if any(not r['success'] for r in res):
-        return dict(
-            path=str_dest,
-            status='error',
-            message='; '.join(
-                m for r in res for m in r.get('error-messages', [])),
-        )
+    tmploc = None
     if 'objloc' in finfo:
         # we have the chance to place the actual content into the target annex
         # put in a tmp location, git-annex will move from there
-        tmploc = dest_repo_rec.get('tmp', None)
-        if not tmploc:
-            tmploc = dest_repo.pathobj / '.git' / 'tmp' / 'datalad-copy'
-            tmploc.mkdir(exist_ok=True, parents=True)
+        dest_shared = dest_repo_rec['shared']
+        tmpdir = dest_shared.get('tmp', None)
+        if not tmpdir:
+            tmpdir = dest_repo.pathobj / '.git' / 'tmp' / 'datalad-copy'
+            tmpdir.mkdir(exist_ok=True, parents=True)
             # put in cache for later clean/lookup
-            dest_repo_rec['tmp'] = tmploc
-
-        tmploc = tmploc / dest_key
-        _replace_file(finfo['objloc'], tmploc, str(tmploc), follow_symlinks=False)
-
-        dest_repo._run_annex_command(
-            'reinject',
-            annex_options=[str(tmploc), str_dest],
+            dest_shared['tmp'] = tmpdir
+
+        # unique name, the same key could be copied concurrently
+        fd, tmpfname = tempfile.mkstemp(prefix=dest_key, dir=str(tmpdir))
+        os.close(fd)
+        tmploc = Path(tmpfname)
+        _replace_file(finfo['objloc'], tmploc, tmpfname, follow_symlinks=False)
+
+    with dest_repo_rec['shared']['lock']:
+        if op.lexists(str_dest):
+            # if the target already exists, we remove it first, because we want to
+            # modify this path (potentially pointing to a new key), rather than
+            # failing next on 'fromkey', due to a key mismatch.
+            # this is more compatible with the nature of 'cp'
+            dest.unlink()
+        res = dest_repo._run_annex_command_json(
+            'fromkey',
+            # we use force, because in all likelihood there is no content for this key
+            # yet
+            opts=[dest_key, str_dest, '--force'],
+            # doesn't work in adjusted-unlock mode
+            expect_fail=True,
         )
+        if any(not r['success'] for r in res):
+            if tmploc:
+                tmploc.unlink()
+            return dict(
+                path=str_dest,
+                status='error',
+                message='; '.join(
+                    m for r in res for m in r.get('error-messages', [])),
+            )
+        if tmploc:
+            dest_repo._run_annex_command(
+                'reinject',
+                annex_options=[str(tmploc), str_dest],
+            )
 
     return dest_key
 
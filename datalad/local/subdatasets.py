@@ -14,6 +14,7 @@ __docformat__ = 'restructuredtext'
 import logging
 import re
 import os
+import sys
 
 from datalad.interface.base import Interface
 from datalad.interface.utils import eval_results
@@ -25,8 +26,10 @@ from datalad.support.constraints import (
     EnsureNone,
 )
 from datalad.support.param import Parameter
+from datalad.support.parallel import LookaheadPool
 from datalad.support.exceptions import CommandError
 from datalad.interface.common_opts import (
+    jobs_opt,
     recursion_flag,
     recursion_limit,
 )
@@ -35,11 +38,9 @@ from datalad.distribution.dataset import (
     require_dataset,
 )
 from datalad.support.gitrepo import GitRepo
+from datalad.support.path import PathPrefixIndex
 from datalad.dochelpers import exc_str
-from datalad.utils import (
-    assure_list,
-    partition,
-)
+from datalad.utils import assure_list
 
 from datalad.distribution.dataset import (
     EnsureDataset,
@@ -54,19 +55,21 @@ valid_key = re.compile(r'^[A-Za-z][-A-Za-z0-9]*$')
 
 
 def _parse_git_submodules(ds_pathobj, repo, paths):
-    """All known ones with some properties"""
+    """All known ones with some properties
+
+    `paths` is None, or a PathPrefixIndex of path constraints.
+    """
     if not (ds_pathobj / ".gitmodules").exists():
         # easy way out. if there is no .gitmodules file
         # we cannot have (functional) subdatasets
         return
 
     if paths:
-        paths_outside, paths_at_or_in = partition(
-            paths,
-            lambda p: ds_pathobj == p or ds_pathobj in p.parents)
-        paths = [p.relative_to(ds_pathobj) for p in paths_at_or_in]
+        paths_index = paths
+        paths = [p.relative_to(ds_pathobj)
+                 for p in paths_index.get_children(ds_pathobj)]
         if not paths:
-            if any(p for p in paths_outside if p in ds_pathobj.parents):
+            if paths_index.get_parent(ds_pathobj) is not None:
                 # The dataset is directly under some specified path, so include
                 # it.
                 paths = None
@@ -203,7 +206,16 @@ class Subdatasets(Interface):
             doc="""Name of one or more subdataset properties to be removed
             from the parent dataset's .gitmodules file.[CMD:  This
             option can be given multiple times. CMD]""",
-            constraints=EnsureStr() | EnsureNone()))
+            constraints=EnsureStr() | EnsureNone()),
+        jobs=Parameter(
+            args=("-J", "--jobs"),
+            metavar="NJOBS",
+            constraints=jobs_opt.constraints,
+            doc="""how many datasets to query concurrently in a recursive
+            query. Results are reported in the same order as with serial
+            processing. This has no effect when properties are modified.
+            "auto" corresponds to the number defined by the
+            'datalad.runtime.max-annex-jobs' configuration item."""))
 
     @staticmethod
     @datasetmethod(name='subdatasets')
@@ -217,7 +229,8 @@ class Subdatasets(Interface):
             contains=None,
             bottomup=False,
             set_property=None,
-            delete_property=None):
+            delete_property=None,
+            jobs=None):
         # no constraints given -> query subdatasets under curdir
         if not path and dataset is None:
             path = os.curdir
@@ -229,6 +242,8 @@ class Subdatasets(Interface):
         lgr.debug('Query subdatasets of %s', dataset)
         if paths is not None:
             lgr.debug('Query subdatasets underneath paths: %s', paths)
+            # all path matching below is done via the index
+            paths = PathPrefixIndex(paths)
         refds_path = ds.path
 
         # return as quickly as possible
@@ -244,20 +259,31 @@ class Subdatasets(Interface):
         if contains:
             contains = [resolve_path(c, dataset) for c in assure_list(contains)]
         contains_hits = set()
-        for r in _get_submodules(
-                ds, paths, fulfilled, recursive, recursion_limit,
-                contains, bottomup, set_property, delete_property,
-                refds_path):
-            # a boat-load of ancient code consumes this and is ignorant of
-            # Path objects
-            r['path'] = str(r['path'])
-            # without the refds_path cannot be rendered/converted relative
-            # in the eval_results decorator
-            r['refds'] = refds_path
-            if 'contains' in r:
-                contains_hits.update(r['contains'])
-                r['contains'] = [str(c) for c in r['contains']]
-            yield r
+        # modifications of .gitmodules have to happen in order
+        pool = _get_submodules_pool(jobs, ds) \
+            if recursive and not (set_property or delete_property) else None
+        completed = False
+        try:
+            for r in _get_submodules(
+                    ds, paths, fulfilled, recursive, recursion_limit,
+                    PathPrefixIndex(contains) if contains else None,
+                    bottomup, set_property, delete_property,
+                    refds_path, pool=pool):
+                # a boat-load of ancient code consumes this and is ignorant of
+                # Path objects
+                r['path'] = str(r['path'])
+                # without the refds_path cannot be rendered/converted relative
+                # in the eval_results decorator
+                r['refds'] = refds_path
+                if 'contains' in r:
+                    contains_hits.update(r['contains'])
+                    r['contains'] = [str(c) for c in r['contains']]
+                yield r
+            completed = True
+        finally:
+            if pool is not None:
+                # do not query datasets nobody will ask for anymore
+                pool.shutdown(cancel=not completed)
         if contains:
             for c in set(contains).difference(contains_hits):
                 yield get_status_dict(
@@ -275,31 +301,118 @@ class Subdatasets(Interface):
 
 
 
+def _get_contains_hits(sm, contains):
+    return contains.get_children(sm['path'])
+
+
+def _recurse_into(recursive, recursion_limit):
+    return recursive and (
+        recursion_limit in (None, 'existing') or
+        (isinstance(recursion_limit, int) and recursion_limit > 1))
+
+
+def _decrement_limit(recursion_limit):
+    return (recursion_limit - 1) \
+        if isinstance(recursion_limit, int) else recursion_limit
+
+
+def _get_submodules_tree(pool, ds, paths, recursive, recursion_limit,
+                         contains):
+    """Query the subdatasets of a dataset, and schedule that of its children
+
+    Runs in a worker of `pool` (a `LookaheadPool`), or in the thread of the
+    consumer. Queries of installed subdatasets that would be recursed into
+    are submitted to the pool before returning, as long as it accepts more
+    work, hence a hierarchy is processed concurrently, but only ahead of the
+    consumer by a bounded amount.
+
+    Returns
+    -------
+    list, dict
+      The submodule records of `ds`, and a mapping of subdataset paths to
+      futures of their respective `_get_submodules_tree()` return values,
+      or None, if the pool declined their query.
+    """
+    sms = list(_parse_git_submodules(ds.pathobj, ds.repo, paths))
+    subtrees = {}
+    if not _recurse_into(recursive, recursion_limit):
+        return sms, subtrees
+    for sm in sms:
+        if sm.get('state') == 'absent' or \
+                (contains and not _get_contains_hits(sm, contains)):
+            continue
+        subtrees[sm['path']] = pool.submit(
+            _get_submodules_tree,
+            pool,
+            Dataset(sm['path']),
+            paths,
+            recursive,
+            _decrement_limit(recursion_limit),
+            contains)
+    return sms, subtrees
+
+
+def _get_submodules_pool(jobs, ds):
+    """Return a LookaheadPool for concurrent dataset queries, or None"""
+    if jobs == 'auto':
+        jobs = ds.config.obtain('datalad.runtime.max-annex-jobs')
+    if not jobs or jobs < 2:
+        return None
+    if sys.version_info < (3, 8):
+        # no subprocesses via asyncio from threads other than the main one
+        lgr.debug('Concurrent subdataset queries require Python 3.8+, '
+                  'proceeding serially')
+        return None
+    return LookaheadPool(jobs)
+
+
 # internal helper that needs all switches, simply to avoid going through
 # the main command interface with all its decorators again
 def _get_submodules(ds, paths, fulfilled, recursive, recursion_limit,
                     contains, bottomup, set_property, delete_property,
-                    refds_path):
+                    refds_path, pool=None, submodules_tree=None):
+    """Yield subdataset records
+
+    If a `pool` (`LookaheadPool`) is given, subdatasets are queried by its
+    workers, but results are yielded in the same order as with serial
+    processing. `submodules_tree` is the (already evaluated)
+    return value of `_get_submodules_tree()` for `ds`, if available.
+    `paths` and `contains` are None or `PathPrefixIndex` instances.
+    """
     dspath = ds.path
+    if submodules_tree is None:
+        if not GitRepo.is_valid_repo(dspath):
+            return
+        if pool is not None:
+            submodules_tree = _get_submodules_tree(
+                pool,
+                ds,
+                paths,
+                recursive,
+                recursion_limit,
+                contains)
     repo = ds.repo
-    if not GitRepo.is_valid_repo(dspath):
-        return
+    if submodules_tree is None:
+        sms = _parse_git_submodules(ds.pathobj, repo, paths)
+        subtrees = None
+    else:
+        sms, subtrees = submodules_tree
     # put in giant for-loop to be able to yield results before completion
-    for sm in _parse_git_submodules(ds.pathobj, repo, paths):
+    for sm in sms:
         contains_hits = []
         if contains:
-            contains_hits = [
-                c for c in contains if sm['path'] == c or sm['path'] in c.parents
-            ]
+            contains_hits = _get_contains_hits(sm, contains)
             if not contains_hits:
                 # we are not looking for this subds, because it doesn't
                 # match the target path
                 continue
+        # whether the subdataset is installed, as determined by
+        # _parse_git_submodules()
+        installed = sm.get('state') != 'absent'
         # do we just need this to recurse into subdatasets, or is this a
         # real results?
         to_report = paths is None \
-            or any(p == sm['path'] or p in sm['path'].parents
-                   for p in paths)
+            or paths.get_parent(sm['path']) is not None
         if to_report and (set_property or delete_property):
             # first deletions
             for dprop in assure_list(delete_property):
@@ -380,30 +493,28 @@ def _get_submodules(ds, paths, fulfilled, recursive, recursion_limit,
             if contains_hits:
                 subdsres['contains'] = contains_hits
             if (not bottomup and \
-                (fulfilled is None or
-                 GitRepo.is_valid_repo(sm['path']) == fulfilled)):
+                (fulfilled is None or installed == fulfilled)):
                 yield subdsres
 
         # expand list with child submodules. keep all paths relative to parent
         # and convert jointly at the end
-        if recursive and \
-                (recursion_limit in (None, 'existing') or
-                 (isinstance(recursion_limit, int) and
-                  recursion_limit > 1)):
+        if installed and _recurse_into(recursive, recursion_limit):
+            # if the pool declined the query, it is performed right here
+            future = subtrees[sm['path']] if subtrees is not None else None
             for r in _get_submodules(
                     Dataset(sm['path']),
                     paths,
                     fulfilled, recursive,
-                    (recursion_limit - 1)
-                    if isinstance(recursion_limit, int)
-                    else recursion_limit,
+                    _decrement_limit(recursion_limit),
                     contains,
                     bottomup,
                     set_property,
                     delete_property,
-                    refds_path):
+                    refds_path,
+                    pool=pool,
+                    submodules_tree=None if future is None
+                    else pool.result(future)):
                 yield r
         if to_report and (bottomup and \
-                (fulfilled is None or
-                 GitRepo.is_valid_repo(sm['path']) == fulfilled)):
+                (fulfilled is None or installed == fulfilled)):
             yield subdsres
@@ -8,14 +8,17 @@
 """Test copy_file command"""
 
 
+import os
 from os.path import (
     join as opj,
 )
+from unittest.mock import patch
 
 from datalad.distribution.dataset import Dataset
 from datalad.api import (
     copy_file,
 )
+from datalad.local.copy_file import _copyfile
 from datalad.utils import (
     Path,
 )
@@ -27,6 +30,7 @@ from datalad.tests.utils import (
     chpwd,
     eq_,
     nok_,
+    ok_,
     ok_file_has_content,
     serve_path_via_http,
     with_tempfile,
@@ -216,6 +220,76 @@ def test_copy_file_recursion(srcdir, destdir):
     ok_file_has_content(dest_ds.pathobj / 'subdir' / 'file2', 'abc')
 
 
+@with_tree(tree={
+    'subdir': {
+        'file{}'.format(i): 'content{}'.format(i) for i in range(10)
+    },
+})
+@with_tempfile(mkdir=True)
+def test_copy_file_jobs(srcdir, destdir):
+    src_ds = Dataset(srcdir).create(force=True, annex=False)
+    src_ds.save()
+    dest_ds = Dataset(destdir).create(annex=False)
+    res = dest_ds.copy_file(
+        [src_ds.pathobj / 'subdir', dest_ds.pathobj], recursive=True, jobs=2,
+        result_filter=lambda r: r['action'] == 'copy_file')
+    # results are reported in order
+    eq_([Path(r['path']).name for r in res],
+        [p.name for p in (src_ds.pathobj / 'subdir').iterdir()])
+    for i in range(10):
+        ok_file_has_content(
+            dest_ds.pathobj / 'subdir' / 'file{}'.format(i),
+            'content{}'.format(i))
+    assert_repo_status(dest_ds.path)
+
+
+@with_tree(tree={
+    'subdir': dict(
+        {'file{}'.format(i): 'content{}'.format(i) for i in range(6)},
+        # files with identical content, i.e. the same key
+        **{'same{}'.format(i): 'same' for i in range(4)}),
+})
+@with_tempfile(mkdir=True)
+def test_copy_file_jobs_annex(srcdir, destdir):
+    src_ds = Dataset(srcdir).create(force=True)
+    src_ds.save()
+    dest_ds = Dataset(destdir).create()
+    res = dest_ds.copy_file(
+        [src_ds.pathobj / 'subdir', dest_ds.pathobj], recursive=True, jobs=3,
+        result_filter=lambda r: r['action'] == 'copy_file')
+    assert_status('ok', res)
+    eq_(len(res), 10)
+    assert_repo_status(dest_ds.path)
+    names = sorted(p.name for p in (src_ds.pathobj / 'subdir').iterdir())
+    destpaths = [str(dest_ds.pathobj / 'subdir' / n) for n in names]
+    for name, path in zip(names, destpaths):
+        ok_file_has_content(
+            path,
+            'same' if name.startswith('same') else
+            'content{}'.format(name[4:]))
+    # all content is annexed and available in the destination
+    ok_(all(dest_ds.repo.file_has_content(destpaths)))
+    eq_(dest_ds.repo.get_file_key(destpaths),
+        src_ds.repo.get_file_key(
+            [str(src_ds.pathobj / 'subdir' / n) for n in names]))
+    # the temporary directory is gone
+    nok_((dest_ds.pathobj / '.git' / 'tmp' / 'datalad-copy').exists())
+    ok_(all(r['success'] for r in dest_ds.repo.fsck()))
+
+
+@with_tree(tree={'file': 'some content'})
+def test_copyfile_short_copy(path):
+    src = opj(path, 'file')
+    dest = opj(path, 'copy')
+    # a file system that cannot clone, and reports a short copy
+    with patch('datalad.local.copy_file.fcntl', None), \
+            patch.object(os, 'copy_file_range', create=True,
+                         side_effect=[3, 0]):
+        _copyfile(src, dest)
+    # no truncated copy
+    ok_file_has_content(dest, 'some content')
+
+
 @with_tree(tree={
     'lvl1': {
         'file1': '123',
@@ -9,6 +9,7 @@
 
 
 import os
+from unittest.mock import patch
 from os.path import (
     join as opj,
     relpath,
@@ -16,6 +17,7 @@ from os.path import (
 )
 
 from datalad.distribution.dataset import Dataset
+from datalad.local import subdatasets as subdatasets_mod
 from datalad.api import (
     clone,
     create,
@@ -35,6 +37,7 @@ from datalad.tests.utils import (
     assert_result_count,
     assert_status,
     eq_,
+    ok_,
     with_tempfile,
 )
 
@@ -325,3 +328,71 @@ def test_parent_on_unborn_branch(path):
     ds.repo.add_submodule(path="sub")
     eq_(ds.subdatasets(result_xfm='relpaths'),
         ["sub"])
+
+
+@with_tempfile
+def test_subdatasets_jobs(path):
+    from datalad.support.gitrepo import GitRepo
+
+    def _mkrepo(p):
+        repo = GitRepo(p, create=True)
+        repo.commit(msg="c", options=["--allow-empty"])
+        return repo
+
+    top = _mkrepo(path)
+    for parent, subs in ((opj(path, 'a'), ['b', 'c']),
+                         (path, ['a', 'd'])):
+        repo = _mkrepo(parent) if parent != path else top
+        for s in subs:
+            _mkrepo(opj(parent, s))
+            repo.add_submodule(path=s)
+        repo.commit(msg="subs")
+    ds = Dataset(path)
+    for kwargs in (dict(),
+                   dict(bottomup=True),
+                   dict(recursion_limit=1),
+                   dict(contains=opj(path, 'a', 'c'))):
+        serial = ds.subdatasets(recursive=True, result_xfm='relpaths',
+                                **kwargs)
+        eq_(serial,
+            ds.subdatasets(recursive=True, result_xfm='relpaths', jobs=3,
+                           **kwargs))
+    eq_(ds.subdatasets(recursive=True, result_xfm='relpaths', jobs=3),
+        ['a', _p('a/b'), _p('a/c'), 'd'])
+
+    # parsed .gitmodules are reused until the file changes
+    eq_(top._parse_gitmodules(), top._parse_gitmodules())
+    top.call_git(['config', '--file', '.gitmodules',
+                  'submodule.d.some', 'thing'])
+    eq_(top._parse_gitmodules()[top.pathobj / 'd']['gitmodule_some'],
+        'thing')
+
+
+@with_tempfile
+def test_subdatasets_jobs_close(path):
+    from datalad.support.gitrepo import GitRepo
+
+    top = GitRepo(path, create=True)
+    for i in range(10):
+        sub = GitRepo(opj(path, 'sub%d' % i), create=True)
+        sub.commit(msg="c", options=["--allow-empty"])
+        top.add_submodule(path='sub%d' % i)
+    top.commit(msg="subs")
+    ds = Dataset(path)
+
+    queried = []
+    orig_parse = subdatasets_mod._parse_git_submodules
+
+    def _parse_git_submodules(dspath, *args):
+        queried.append(dspath)
+        return orig_parse(dspath, *args)
+
+    with patch.object(subdatasets_mod, '_parse_git_submodules',
+                      _parse_git_submodules):
+        res = ds.subdatasets(recursive=True, jobs=2, result_renderer=None,
+                             return_type='generator')
+        next(res)
+        res.close()
+    # the dataset itself, and no more subdatasets than the pool took on
+    # ahead of the consumer
+    ok_(len(queried) <= 1 + 2 * 2, msg=queried)
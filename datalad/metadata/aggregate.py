@@ -12,7 +12,11 @@
 __docformat__ = 'restructuredtext'
 
 import logging
+import multiprocessing
 import os
+import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 
 from os import makedirs
 from os import listdir
@@ -36,6 +40,7 @@ from datalad.interface.utils import (
 from datalad.core.local.save import Save
 from datalad.interface.base import build_doc
 from datalad.interface.common_opts import (
+    jobs_opt,
     recursion_limit,
     recursion_flag,
     nosave_opt,
@@ -49,9 +54,10 @@ from datalad.metadata.metadata import (
 from datalad.metadata.metadata import (
     exclude_from_metadata,
     get_metadata_type,
-    _get_metadata,
+    _start_metadata_extraction,
     _get_metadatarelevant_paths,
     _get_containingds_from_agginfo,
+    _load_content_metadata,
     location_keys,
 )
 from datalad.distribution.dataset import (
@@ -66,6 +72,7 @@ from datalad.support.constraints import (
     EnsureBool,
 )
 from datalad.support.constraints import EnsureChoice
+from datalad.support.exceptions import CommandError
 from datalad.support.gitrepo import GitRepo
 from datalad.support.annexrepo import AnnexRepo
 from datalad.support import json_py
@@ -147,15 +154,20 @@ def _the_same_across_datasets(relpath, *dss):
       True if identical, False if not, None if cannot be decided
       (e.g. different git-annex backend used)
     """
-    from datalad.utils import md5sum, unique
+    from datalad.utils import unique
     from datalad.support.exceptions import FileInGitError
     from datalad.support.digests import Digester
 
+    def _md5sums(paths):
+        # the copies in all datasets are read and hashed concurrently
+        return (d['md5'] for _, d in
+                Digester(['md5']).digest_files(paths, progress=False))
+
     paths = [op.join(ds.path, relpath) for ds in dss]
     # The simplest check first -- exist in both and content is the same.
     # Even if content is just a symlink file on windows, the same content
     # condition would be correct
-    if all(map(op.exists, paths)) and all_same(map(md5sum, paths)):
+    if all(map(op.exists, paths)) and all_same(_md5sums(paths)):
         return True
 
     # We first need to find problematic ones which are annexed and
@@ -185,7 +197,7 @@ def _the_same_across_datasets(relpath, *dss):
         presents.append(present)
 
     if all(presents):
-        return all_same(map(md5sum, paths))
+        return all_same(_md5sums(paths))
 
     backends = unique(backends)
     assert backends, "Since not all present - some must be under annex, and thus must have a backend!"
@@ -236,7 +248,8 @@ def _the_same_across_datasets(relpath, *dss):
     return False
 
 
-def _dump_extracted_metadata(agginto_ds, aggfrom_ds, db, to_save, force_extraction, agg_base_path):
+def _dump_extracted_metadata(agginto_ds, aggfrom_ds, db, to_save, force_extraction, agg_base_path,
+                             pool=None):
     """Dump metadata from a dataset into object in the metadata store of another
 
     Info on the metadata objects is placed into a DB dict under the
@@ -247,6 +260,15 @@ def _dump_extracted_metadata(agginto_ds, aggfrom_ds, db, to_save, force_extracti
     agginto_ds : Dataset
     aggfrom_ds : Dataset
     db : dict
+    pool : concurrent.futures.ProcessPoolExecutor, optional
+      If given, metadata extractors are run in this pool.
+
+    Returns
+    -------
+    bool or callable
+      Whether the metadata extraction failed. If extractors were submitted
+      to a `pool`, a callable is returned instead, that completes the
+      dump once called, and returns whether the extraction failed.
     """
     subds_relpaths = aggfrom_ds.subdatasets(result_xfm='relpaths', return_type='list')
     # figure out a "state" of the dataset wrt its metadata that we are describing
@@ -318,7 +340,10 @@ def _dump_extracted_metadata(agginto_ds, aggfrom_ds, db, to_save, force_extracti
             metasources['cn'] = {
                 'type': 'content',
                 'targetds': agginto_ds,
-                'dumper': json_py.dump2xzstream}
+                'dumper': json_py.dump2sqlite
+                if agginto_ds.config.obtain(
+                    'datalad.metadata.store-aggregate-content-format') == 'sqlite'
+                else json_py.dump2xzstream}
 
     # check if we have the extracted metadata for this state already
     # either in the source or in the destination dataset
@@ -381,7 +406,9 @@ def _dump_extracted_metadata(agginto_ds, aggfrom_ds, db, to_save, force_extracti
             metasources,
             refcommit,
             subds_relpaths,
-            agg_base_path)
+            agg_base_path,
+            prev_agginfo=None if force_extraction else old_agginfo,
+            pool=pool)
 
     # we did not actually run an extraction, so we need to
     # assemble an aggregation record from the existing pieces
@@ -437,7 +464,8 @@ def _dump_extracted_metadata(agginto_ds, aggfrom_ds, db, to_save, force_extracti
 
 
 def _extract_metadata(agginto_ds, aggfrom_ds, db, to_save, objid, metasources,
-                      refcommit, subds_relpaths, agg_base_path):
+                      refcommit, subds_relpaths, agg_base_path,
+                      prev_agginfo=None, pool=None):
     lgr.debug('Performing metadata extraction from %s', aggfrom_ds)
     # we will replace any conflicting info on this dataset with fresh stuff
     agginfo = db.get(aggfrom_ds.path, {})
@@ -449,16 +477,44 @@ def _extract_metadata(agginto_ds, aggfrom_ds, db, to_save, objid, metasources,
     agginfo['extractors'] = nativetypes
     agginfo['datalad_version'] = datalad.__version__
 
+    content_paths = prev_contentmeta = None
+    if prev_agginfo and 'cn' in metasources and aggfrom_ds.config.obtain(
+            'datalad.metadata.aggregate-incremental-content',
+            default=False,
+            valtype=EnsureBool()):
+        prev = _get_incremental_content_info(
+            aggfrom_ds, prev_agginfo, nativetypes, refcommit, relevant_paths)
+        if prev is not None:
+            content_paths, prev_contentmeta = prev
+            lgr.debug(
+                'Updating content metadata of %s for %i changed file(s)',
+                aggfrom_ds, len(content_paths))
+
     # perform the actual extraction
-    dsmeta, contentmeta, errored = _get_metadata(
+    extraction = _start_metadata_extraction(
         aggfrom_ds,
         nativetypes,
         # None indicates to honor a datasets per-extractor configuration and to be
         # on by default
         global_meta=None,
         content_meta=None,
-        paths=relevant_paths)
+        paths=relevant_paths,
+        content_paths=content_paths,
+        contentmeta=prev_contentmeta,
+        pool=pool)
+
+    def _dump():
+        return _dump_metadata(
+            agginto_ds, aggfrom_ds, db, to_save, objid, metasources,
+            refcommit, agg_base_path, agginfo, *extraction())
 
+    # with a pool, extractors keep running while other datasets are processed
+    return _dump if pool is not None else _dump()
+
+
+def _dump_metadata(agginto_ds, aggfrom_ds, db, to_save, objid, metasources,
+                   refcommit, agg_base_path, agginfo, dsmeta, contentmeta,
+                   errored):
     meta = {
         'ds': dsmeta,
         'cn': (dict(contentmeta[k], path=k) for k in sorted(contentmeta))
@@ -506,6 +562,111 @@ def _extract_metadata(agginto_ds, aggfrom_ds, db, to_save, objid, metasources,
     return errored
 
 
+def _get_incremental_content_info(ds, agginfo, types, refcommit, paths):
+    """Determine which content metadata needs to be extracted anew
+
+    Content metadata from a previous aggregation can be updated, if it was
+    extracted with the same extractors by the same version of DataLad, and
+    is locally available. Files that were added or modified since the
+    previous reference commit need to be extracted again.
+
+    Parameters
+    ----------
+    ds : Dataset
+    agginfo : dict
+      Aggregation record of the previous aggregation from `ds`.
+    types : list
+      Metadata extractors to engage.
+    refcommit : str or None
+      Reference commit of the upcoming aggregation.
+    paths : list
+      Metadata-relevant paths of `ds`.
+
+    Returns
+    -------
+    tuple or None
+      List of the `paths` that need to be extracted, and a dict with the
+      previous content metadata of all other `paths`. None, if the previous
+      content metadata cannot be reused.
+    """
+    prev_refcommit = agginfo.get('refcommit')
+    objpath = agginfo.get('content_info')
+    if not (prev_refcommit and refcommit and objpath):
+        return None
+    if agginfo.get('extractors') != types \
+            or agginfo.get('datalad_version') != datalad.__version__:
+        lgr.debug(
+            'Not updating content metadata of %s, it was extracted with '
+            'different extractors', ds)
+        return None
+    if not op.exists(objpath):
+        lgr.debug(
+            'Not updating content metadata of %s, previous metadata not '
+            'available at %s', ds, objpath)
+        return None
+    try:
+        changed = set(
+            op.normpath(p)
+            for p in ds.repo.call_git_items_(
+                ['diff', '--name-only', '--no-renames', '-z',
+                 prev_refcommit, refcommit],
+                sep='\0')
+            if p)
+    except CommandError as e:
+        lgr.debug(
+            'Not updating content metadata of %s, cannot determine changes '
+            'since %s: %s', ds, prev_refcommit, exc_str(e))
+        return None
+    prev_contentmeta = _load_content_metadata(objpath)
+    paths_unchanged = set(p for p in paths if p not in changed)
+    return (
+        [p for p in paths if p in changed],
+        {p: meta for p, meta in prev_contentmeta.items()
+         if p in paths_unchanged},
+    )
+
+
+def _get_extraction_pool(jobs, ds):
+    """Return a process pool for concurrent metadata extraction
+
+    Returns
+    -------
+    tuple
+      The pool (or None, if extraction is not to run concurrently), and
+      the number of worker processes.
+    """
+    if jobs == 'auto':
+        jobs = ds.config.obtain('datalad.runtime.max-annex-jobs')
+    if not jobs or jobs < 2:
+        return None, 1
+    kwargs = {}
+    if sys.version_info >= (3, 7):
+        # workers must not inherit the state of this process via fork(),
+        # e.g. pipes to pooled batched annex processes, or open
+        # connections to the cookies database
+        methods = multiprocessing.get_all_start_methods()
+        kwargs['mp_context'] = multiprocessing.get_context(
+            'forkserver' if 'forkserver' in methods else 'spawn')
+    return ProcessPoolExecutor(max_workers=jobs, **kwargs), jobs
+
+
+def _shutdown_extraction_pool(pool, cancel=False):
+    """Shut down a pool, optionally cancel extractions not started yet"""
+    if cancel and sys.version_info >= (3, 9):
+        pool.shutdown(wait=True, cancel_futures=True)
+    else:
+        pool.shutdown(wait=True)
+
+
+def _get_extraction_error(path):
+    return get_status_dict(
+        status='error',
+        message='Metadata extraction failed (see previous error message, set datalad.runtime.raiseonerror=yes to fail immediately)',
+        action='aggregate_metadata',
+        path=path,
+        logger=lgr)
+
+
 def _adj2subtrees(base, adj, subs):
     # given a set of parent-child mapping, compute a mapping of each parent
     # to all its (grand)children of any depth level
@@ -582,6 +743,8 @@ def _get_obj_location(hash_str, ref_type, dumper):
 
     if dumper is json_py.dump2xzstream:
         objrelpath += '.xz'
+    elif dumper is json_py.dump2sqlite:
+        objrelpath += '.sqlite'
 
     return objrelpath
 
@@ -826,6 +989,13 @@ class AggregateMetaData(Interface):
       file headers only. 'datalad.metadata.store-aggregate-content' might be
       a more appropriate setting in such cases.
 
+    datalad.metadata.aggregate-incremental-content
+      If set, content metadata are only extracted from files that were added
+      or modified since the previous aggregation, and are merged with the
+      previously aggregated content metadata of all other files. Changes that
+      are not reflected in the committed file tree (e.g. git-annex metadata)
+      are not picked up for unmodified files.
+
     datalad.metadata.aggregate-ignore-fields
       Any metadata key matching any regular expression in this configuration setting
       is removed prior to generating the dataset-level metadata summary (keys
@@ -855,6 +1025,13 @@ class AggregateMetaData(Interface):
       of datasets containing content matching particular metadata properties will
       still be possible, but such datasets would have to be obtained first in order
       to discover which particular files in them match these properties.
+
+    datalad.metadata.store-aggregate-content-format
+      Storage format for aggregated content metadata. With the default 'xz',
+      content metadata are stored as a compressed JSON stream that must be
+      loaded entirely for any query. With 'sqlite', they are stored in an
+      SQLite database indexed by path, from which queries for individual
+      files or directories only read matching records.
     """
     _params_ = dict(
         dataset=Parameter(
@@ -895,6 +1072,16 @@ class AggregateMetaData(Interface):
             whether change detection indicates that metadata has already been
             extracted for a given dataset state."""),
         save=nosave_opt,
+        jobs=Parameter(
+            args=("-J", "--jobs"),
+            metavar="NJOBS",
+            constraints=jobs_opt.constraints,
+            doc="""how many metadata extractors to run concurrently, each in
+            a separate process. Extractors are engaged for all datasets to
+            be aggregated at once, but results are merged in the same order
+            as with serial processing. "auto" corresponds to the number
+            defined by the 'datalad.runtime.max-annex-jobs' configuration
+            item."""),
     )
 
     @staticmethod
@@ -908,7 +1095,8 @@ class AggregateMetaData(Interface):
             update_mode='target',
             incremental=False,
             force_extraction=False,
-            save=True):
+            save=True,
+            jobs=None):
         refds_path = Interface.get_refds_path(dataset)
 
         # it really doesn't work without a dataset
@@ -929,87 +1117,113 @@ class AggregateMetaData(Interface):
 
         to_save = []
         to_aggregate = set()
-        for ap in AnnotatePaths.__call__(
-                dataset=refds_path,
-                path=path,
-                recursive=recursive,
-                recursion_limit=recursion_limit,
-                action='aggregate_metadata',
-                # uninstalled subdatasets could be queried via aggregated metadata
-                # -> no 'error'
-                unavailable_path_status='',
-                nondataset_path_status='error',
-                return_type='generator',
-                on_failure='ignore'):
-            if ap.get('status', None):
-                # this is done
-                yield ap
-                continue
-            ap_type = ap.get('type', None)
-            ap_state = ap.get('state', None)
-            assert('parentds' in ap or ap_type == 'dataset')
-            if ap_type == 'dataset' and ap_state != 'absent':
-                # a present dataset, we can take directly from it
-                aggsrc = ap['path']
-                lgr.info('Aggregate metadata for dataset %s', aggsrc)
-            else:
-                # everything else needs to come from the parent
-                aggsrc = ap['parentds']
+        pool, njobs = _get_extraction_pool(jobs, ds)
+        # datasets with running extractors, and the callables to complete
+        # their metadata dump, in submission order
+        pending_dumps = OrderedDict()
+        completed = False
+        try:
+            for ap in AnnotatePaths.__call__(
+                    dataset=refds_path,
+                    path=path,
+                    recursive=recursive,
+                    recursion_limit=recursion_limit,
+                    action='aggregate_metadata',
+                    # uninstalled subdatasets could be queried via aggregated metadata
+                    # -> no 'error'
+                    unavailable_path_status='',
+                    nondataset_path_status='error',
+                    return_type='generator',
+                    on_failure='ignore'):
+                if ap.get('status', None):
+                    # this is done
+                    yield ap
+                    continue
+                ap_type = ap.get('type', None)
+                ap_state = ap.get('state', None)
+                assert('parentds' in ap or ap_type == 'dataset')
+                if ap_type == 'dataset' and ap_state != 'absent':
+                    # a present dataset, we can take directly from it
+                    aggsrc = ap['path']
+                    lgr.info('Aggregate metadata for dataset %s', aggsrc)
+                else:
+                    # everything else needs to come from the parent
+                    aggsrc = ap['parentds']
+                    if ap_state == 'absent':
+                        lgr.info(
+                            'Attempt to use pre-aggregate metadata for absent %s from dataset at %s',
+                            ap['path'],
+                            aggsrc)
+                    else:
+                        lgr.info(
+                            'Aggregate metadata for %s from dataset at %s',
+                            ap['path'],
+                            aggsrc)
+
+                to_aggregate.add(aggsrc)
+
                 if ap_state == 'absent':
-                    lgr.info(
-                        'Attempt to use pre-aggregate metadata for absent %s from dataset at %s',
-                        ap['path'],
-                        aggsrc)
+                    # key thought: recursive is done by path annotation, hence
+                    # once we hit an absent dataset, we are 100% certain that
+                    # there is nothing to recurse into on the file system
+                    # hence we only have to look into the aggregated metadata
+                    # of the last available dataset in the dataset tree edge
+                    #
+                    # if there is nothing at this path, we need to look into the
+                    # parentds and check if we know anything about this path
+                    # if we do, we need to grab all the info and objects
+                    # if not, we need to error
+                    res = _get_dsinfo_from_aggmetadata(
+                        aggsrc, ap['path'], recursive, agginfo_db)
+                    if not isinstance(res, list):
+                        yield get_status_dict(
+                            status='impossible',
+                            message=res,
+                            action='aggregate_metadata',
+                            path=ap['path'],
+                            logger=lgr)
+                        continue
+                    # cue for aggregation
+                    to_aggregate.update(res)
                 else:
-                    lgr.info(
-                        'Aggregate metadata for %s from dataset at %s',
-                        ap['path'],
-                        aggsrc)
-
-            to_aggregate.add(aggsrc)
-
-            if ap_state == 'absent':
-                # key thought: recursive is done by path annotation, hence
-                # once we hit an absent dataset, we are 100% certain that
-                # there is nothing to recurse into on the file system
-                # hence we only have to look into the aggregated metadata
-                # of the last available dataset in the dataset tree edge
-                #
-                # if there is nothing at this path, we need to look into the
-                # parentds and check if we know anything about this path
-                # if we do, we need to grab all the info and objects
-                # if not, we need to error
-                res = _get_dsinfo_from_aggmetadata(
-                    aggsrc, ap['path'], recursive, agginfo_db)
-                if not isinstance(res, list):
-                    yield get_status_dict(
-                        status='impossible',
-                        message=res,
-                        action='aggregate_metadata',
-                        path=ap['path'],
-                        logger=lgr)
-                    continue
-                # cue for aggregation
-                to_aggregate.update(res)
-            else:
-                # actually aggregate metadata for this dataset, immediately place
-                # generated objects into the aggregated or reference dataset,
-                # and put info into DB to get the distributed to all datasets
-                # that need to be updated
-                errored = _dump_extracted_metadata(
-                    ds,
-                    Dataset(aggsrc),
-                    agginfo_db,
-                    to_save,
-                    force_extraction,
-                    agg_base_path)
-                if errored:
-                    yield get_status_dict(
-                        status='error',
-                        message='Metadata extraction failed (see previous error message, set datalad.runtime.raiseonerror=yes to fail immediately)',
-                        action='aggregate_metadata',
-                        path=aggsrc,
-                        logger=lgr)
+                    # actually aggregate metadata for this dataset, immediately place
+                    # generated objects into the aggregated or reference dataset,
+                    # and put info into DB to get the distributed to all datasets
+                    # that need to be updated
+                    if aggsrc in pending_dumps:
+                        # extraction is already under way
+                        continue
+                    errored = _dump_extracted_metadata(
+                        ds,
+                        Dataset(aggsrc),
+                        agginfo_db,
+                        to_save,
+                        force_extraction,
+                        agg_base_path,
+                        pool=pool)
+                    if callable(errored):
+                        # extractors are running in the pool
+                        pending_dumps[aggsrc] = errored
+                    elif errored:
+                        yield _get_extraction_error(aggsrc)
+                    # do not queue up extractions (and hold their results)
+                    # for more datasets than can be worked on at a time
+                    while len(pending_dumps) > njobs:
+                        pending, dump = pending_dumps.popitem(last=False)
+                        if dump():
+                            yield _get_extraction_error(pending)
+            # complete the dumps in order, while the remaining extractors
+            # keep running
+            while pending_dumps:
+                pending, dump = pending_dumps.popitem(last=False)
+                if dump():
+                    yield _get_extraction_error(pending)
+            completed = True
+        finally:
+            if pool is not None:
+                # on error, or when the consumer stopped early, do not
+                # wait for extractions that have not started yet
+                _shutdown_extraction_pool(pool, cancel=not completed)
 
         # at this point we have dumped all aggregated metadata into object files
         # somewhere, we know what needs saving, but having saved anything, and
@@ -8,6 +8,8 @@
 # ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
 """Metadata extractor for Git-annex metadata"""
 
+from itertools import islice
+
 from datalad.metadata.extractors.base import BaseMetadataExtractor
 
 import logging
@@ -23,6 +25,8 @@ from datalad.metadata.definitions import version as vocabulary_version
 class MetadataExtractor(BaseMetadataExtractor):
 
     NEEDS_CONTENT = False
+    # number of files whose keys are looked up in one pipelined request
+    KEY_CHUNK_SIZE = 1000
 
     def _get_dataset_metadata(self):
         return {}
@@ -48,23 +52,34 @@ class MetadataExtractor(BaseMetadataExtractor):
         valid_paths = None
         if self.paths and sum(len(i) for i in self.paths) > 500000:
             valid_paths = set(self.paths)
-        for file, meta in repo.get_metadata(
-                self.paths if self.paths and valid_paths is None else '.'):
-            if file.startswith('.datalad') or valid_paths and file not in valid_paths:
-                # do not report on our own internal annexed files (e.g. metadata blobs)
-                continue
-            log_progress(
-                lgr.info,
-                'extractorannex',
-                'Extracted annex metadata from %s', file,
-                update=1,
-                increment=True)
-            meta = {k: v[0] if isinstance(v, list) and len(v) == 1 else v
-                    for k, v in meta.items()}
-            key = repo.get_file_key(file, batch=True)
-            if key:
-                meta['key'] = key
-            yield (file, meta)
+        files_meta = (
+            (file, meta)
+            for file, meta in repo.get_metadata(
+                self.paths if self.paths and valid_paths is None else '.')
+            # do not report on our own internal annexed files (e.g. metadata blobs)
+            if not (file.startswith('.datalad') or
+                    valid_paths and file not in valid_paths)
+        )
+        while True:
+            chunk = list(islice(files_meta, self.KEY_CHUNK_SIZE))
+            if not chunk:
+                break
+            # look up the keys of a chunk of files at once, requests are
+            # pipelined into a single batch process instead of awaiting
+            # each response in turn
+            keys = repo.get_file_key([file for file, _ in chunk], batch=True)
+            for (file, meta), key in zip(chunk, keys):
+                log_progress(
+                    lgr.info,
+                    'extractorannex',
+                    'Extracted annex metadata from %s', file,
+                    update=1,
+                    increment=True)
+                meta = {k: v[0] if isinstance(v, list) and len(v) == 1 else v
+                        for k, v in meta.items()}
+                if key:
+                    meta['key'] = key
+                yield (file, meta)
         # we need to make sure that batch processes are terminated
         # otherwise they might cause trouble on windows
         repo.precommit()
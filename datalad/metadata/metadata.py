@@ -43,6 +43,7 @@ from datalad.support.param import Parameter
 import datalad.support.ansi_colors as ac
 from datalad.support.json_py import (
     load as jsonload,
+    load_sqlite,
     load_xzstream,
 )
 from datalad.interface.common_opts import (
@@ -131,6 +132,42 @@ def _load_xz_json_stream(fpath, cache=None):
     return obj
 
 
+def _load_content_metadata(fpath, prefix=None, cache=None):
+    """Load aggregated content metadata from an XZ JSON stream or SQLite file
+
+    Parameters
+    ----------
+    fpath : str
+      Path of the metadata object file. A '.sqlite' extension identifies
+      a file written by `json_py.dump2sqlite()`.
+    prefix : str or None
+      Relative path to limit the loaded records to. Only honored for
+      SQLite files, which can be queried for it selectively. Any other
+      file is loaded entirely (and cached), and must be filtered by the
+      caller.
+    cache : dict or None
+      Cache for entirely loaded metadata objects.
+
+    Returns
+    -------
+    dict
+      Content metadata, keyed by path.
+    """
+    if not fpath.endswith('.sqlite'):
+        return _load_xz_json_stream(fpath, cache=cache)
+    if prefix is None or prefix == op.curdir:
+        if cache is not None and fpath in cache:
+            return cache[fpath]
+        prefix = None
+    if not op.lexists(fpath):
+        return {}
+    obj = {s['path']: {k: v for k, v in s.items() if k != 'path'}
+           for s in load_sqlite(fpath, prefix=prefix)}
+    if prefix is None and cache is not None:
+        cache[fpath] = obj
+    return obj
+
+
 def _get_metadatarelevant_paths(ds, subds_relpaths):
     return (f for f in ds.repo.get_files()
             if not any(path_startswith(f, ex)
@@ -358,8 +395,9 @@ def _query_aggregated_metadata_singlepath(
     rparentpath = op.relpath(rpath, start=containing_ds)
 
     # so we have some files to query, and we also have some content metadata
-    contentmeta = _load_xz_json_stream(
+    contentmeta = _load_content_metadata(
         op.join(agg_base_path, contentinfo_objloc),
+        prefix=rparentpath,
         cache=cache['objcache']) if contentinfo_objloc else {}
 
     for fpath in [f for f in contentmeta.keys()
@@ -431,33 +469,127 @@ def _ok_metadata(meta, mtype, ds, loc):
     return False
 
 
-def _get_metadata(ds, types, global_meta=None, content_meta=None, paths=None):
+def _call_extractor(extractor_cls, ds, paths, content_paths, dataset,
+                    content):
+    """Query a single metadata extractor
+
+    Parameters
+    ----------
+    extractor_cls : class
+    ds : Dataset or str
+      If a path is given, the extractor is assumed to run in a separate
+      process, and content metadata is returned as a list.
+    paths : list
+      Paths to pass to the extractor.
+    content_paths : list or None
+      If not None, content metadata is extracted from these paths instead,
+      by a separate extractor instance.
+    dataset : bool
+      Whether to extract dataset metadata.
+    content : bool
+      Whether to extract content metadata.
+
+    Returns
+    -------
+    tuple
+      Dataset metadata, and an iterable of (location, metadata) tuples, as
+      returned by the extractor.
+    """
+    in_process = not isinstance(ds, Dataset)
+    if in_process:
+        ds = Dataset(ds)
+    if content_paths is None:
+        dsmeta, contentmeta = extractor_cls(ds, paths=paths).get_metadata(
+            dataset=dataset,
+            content=content)
+    else:
+        dsmeta, _ = extractor_cls(ds, paths=paths).get_metadata(
+            dataset=dataset,
+            content=False)
+        _, contentmeta = extractor_cls(ds, paths=content_paths).get_metadata(
+            dataset=False,
+            content=content) if content_paths and content else (None, None)
+    if in_process and contentmeta:
+        contentmeta = list(contentmeta)
+    return dsmeta, contentmeta
+
+
+def _get_metadata(ds, types, global_meta=None, content_meta=None, paths=None,
+                  content_paths=None, contentmeta=None, pool=None):
     """Make a direct query of a dataset to extract its metadata.
 
+    See `_start_metadata_extraction()` for the parameters.
+
+    Returns
+    -------
+    tuple
+      Dataset metadata, content metadata, and whether any extractor failed.
+    """
+    return _start_metadata_extraction(
+        ds, types, global_meta=global_meta, content_meta=content_meta,
+        paths=paths, content_paths=content_paths, contentmeta=contentmeta,
+        pool=pool)()
+
+
+def _start_metadata_extraction(
+        ds, types, global_meta=None, content_meta=None, paths=None,
+        content_paths=None, contentmeta=None, pool=None):
+    """Start a direct query of a dataset to extract its metadata.
+
     Parameters
     ----------
     ds : Dataset
     types : list
+    content_paths : list, optional
+      If given, content metadata is only extracted for these paths, whereas
+      dataset metadata is still extracted from all `paths`.
+    contentmeta : dict, optional
+      Previously extracted content metadata (mapping paths to a dict with
+      metadata per extractor type) to update with the newly extracted
+      content metadata. Unique content properties are reported across
+      all of it.
+    pool : concurrent.futures.ProcessPoolExecutor, optional
+      If given, all extractors are submitted to this pool right away, and
+      run concurrently with any other work until the results are collected.
+
+    Returns
+    -------
+    callable
+      Returns the dataset metadata, the content metadata, and whether any
+      extractor failed, once all extractors have finished.
     """
-    errored = False
     dsmeta = dict()
-    contentmeta = {}
+    contentmeta = {} if contentmeta is None else contentmeta
 
     if global_meta is not None and content_meta is not None and \
             not global_meta and not content_meta:
         # both are false and not just none
-        return dsmeta, contentmeta, errored
+        return lambda: (dsmeta, contentmeta, False)
 
     context = {
         '@vocab': 'http://docs.datalad.org/schema_v{}.json'.format(
             vocabulary_version)}
 
     fullpathlist = paths
-    if paths and isinstance(ds.repo, AnnexRepo):
+    # separate extraction of dataset and content metadata
+    split_extraction = content_paths is not None
+    if split_extraction:
+        # avoid querying annex for the content presence of all files,
+        # when content metadata is only needed for a few
+        paths = [p for p in paths if op.exists(op.join(ds.path, p))]
+    else:
+        content_paths = paths
+    fullcontentpathlist = content_paths
+    if content_paths and isinstance(ds.repo, AnnexRepo):
         # Ugly? Jep: #2055
-        content_info = zip(paths, ds.repo.file_has_content(paths), ds.repo.is_under_annex(paths))
-        paths = [p for p, c, a in content_info if not a or c]
-        nocontent = len(fullpathlist) - len(paths)
+        content_info = zip(
+            content_paths,
+            ds.repo.file_has_content(content_paths),
+            ds.repo.is_under_annex(content_paths))
+        content_paths = [p for p, c, a in content_info if not a or c]
+        if not split_extraction:
+            paths = content_paths
+        nocontent = len(fullcontentpathlist) - len(content_paths)
         if nocontent:
             # TODO better fail, or support incremental and label this file as no present
             lgr.warning(
@@ -490,134 +622,162 @@ def _get_metadata(ds, types, global_meta=None, content_meta=None, paths=None):
              single_or_plural(" is", "s are", len(absent_extractors)),
              ', '.join(absent_extractors)))
 
-    log_progress(
-        lgr.info,
-        'metadataextractors',
-        'Start metadata extraction from %s', ds,
-        total=len(types),
-        label='Metadata extraction',
-        unit=' extractors',
-    )
+    # load all extractors first, to not waste time on extraction when one
+    # of them is broken
+    extractor_args = {}
     for mtype in types:
-        mtype_key = mtype
-        log_progress(
-            lgr.info,
-            'metadataextractors',
-            'Engage %s metadata extractor', mtype_key,
-            update=1,
-            increment=True)
         try:
-            extractor_cls = extractors[mtype_key].load()
-            extractor = extractor_cls(
-                ds,
-                paths=paths if extractor_cls.NEEDS_CONTENT else fullpathlist)
+            extractor_cls = extractors[mtype].load()
         except Exception as e:
-            log_progress(
-                lgr.error,
-                'metadataextractors',
-                'Failed %s metadata extraction from %s', mtype_key, ds,
-            )
             raise ValueError(
                 "Failed to load metadata extractor for '%s', "
                 "broken dataset configuration (%s)?: %s" %
                 (mtype, ds, exc_str(e)))
-        try:
-            dsmeta_t, contentmeta_t = extractor.get_metadata(
-                dataset=global_meta if global_meta is not None else ds.config.obtain(
-                    'datalad.metadata.aggregate-dataset-{}'.format(mtype.replace('_', '-')),
-                    default=True,
-                    valtype=EnsureBool()),
-                content=content_meta if content_meta is not None else ds.config.obtain(
-                    'datalad.metadata.aggregate-content-{}'.format(mtype.replace('_', '-')),
-                    default=True,
-                    valtype=EnsureBool()))
-        except Exception as e:
-            lgr.error('Failed to get dataset metadata ({}): {}'.format(
-                mtype, exc_str(e)))
-            if cfg.get('datalad.runtime.raiseonerror'):
-                log_progress(
-                    lgr.error,
-                    'metadataextractors',
-                    'Failed %s metadata extraction from %s', mtype_key, ds,
-                )
-                raise
-            errored = True
-            # if we dont get global metadata we do not want content metadata
-            continue
+        extractor_args[mtype] = (
+            extractor_cls,
+            paths if extractor_cls.NEEDS_CONTENT else fullpathlist,
+            (content_paths if extractor_cls.NEEDS_CONTENT
+             else fullcontentpathlist) if split_extraction else None,
+            global_meta if global_meta is not None else ds.config.obtain(
+                'datalad.metadata.aggregate-dataset-{}'.format(mtype.replace('_', '-')),
+                default=True,
+                valtype=EnsureBool()),
+            content_meta if content_meta is not None else ds.config.obtain(
+                'datalad.metadata.aggregate-content-{}'.format(mtype.replace('_', '-')),
+                default=True,
+                valtype=EnsureBool()),
+        )
+    if pool is not None:
+        # run all extractors concurrently, results are processed in order
+        extractions = {
+            mtype: pool.submit(_call_extractor, args[0], ds.path, *args[1:])
+            for mtype, args in extractor_args.items()
+        }
 
-        if dsmeta_t:
-            if _ok_metadata(dsmeta_t, mtype, ds, None):
-                dsmeta_t = _filter_metadata_fields(
-                    dsmeta_t,
-                    maxsize=max_fieldsize,
-                    blacklist=blacklist)
-                dsmeta[mtype_key] = dsmeta_t
-            else:
+    def collect():
+        errored = False
+        log_progress(
+            lgr.info,
+            'metadataextractors',
+            'Start metadata extraction from %s', ds,
+            total=len(types),
+            label='Metadata extraction',
+            unit=' extractors',
+        )
+        # exclusions from the unique content properties, for each extractor
+        # type that shall report them
+        unique_excludes = {}
+        for mtype in types:
+            mtype_key = mtype
+            log_progress(
+                lgr.info,
+                'metadataextractors',
+                'Engage %s metadata extractor', mtype_key,
+                update=1,
+                increment=True)
+            extractor_cls = extractor_args[mtype][0]
+            try:
+                if pool is None:
+                    dsmeta_t, contentmeta_t = _call_extractor(
+                        extractor_cls, ds, *extractor_args[mtype][1:])
+                else:
+                    dsmeta_t, contentmeta_t = extractions[mtype].result()
+            except Exception as e:
+                lgr.error('Failed to get dataset metadata ({}): {}'.format(
+                    mtype, exc_str(e)))
+                if cfg.get('datalad.runtime.raiseonerror'):
+                    log_progress(
+                        lgr.error,
+                        'metadataextractors',
+                        'Failed %s metadata extraction from %s', mtype_key, ds,
+                    )
+                    raise
                 errored = True
+                # if we dont get global metadata we do not want content metadata
+                continue
 
-        unique_cm = {}
-        extractor_unique_exclude = getattr(extractor_cls, "_unique_exclude", set())
-        # TODO: ATM neuroimaging extractors all provide their own internal
-        #  log_progress but if they are all generators, we could provide generic
-        #  handling of the progress here.  Note also that log message is actually
-        #  seems to be ignored and not used, only the label ;-)
-        # log_progress(
-        #     lgr.debug,
-        #     'metadataextractors_loc',
-        #     'Metadata extraction per location for %s', mtype,
-        #     # contentmeta_t is a generator... so no cound is known
-        #     # total=len(contentmeta_t or []),
-        #     label='Metadata extraction per location',
-        #     unit=' locations',
-        # )
-        for loc, meta in contentmeta_t or {}:
-            lgr.log(5, "Analyzing metadata for %s", loc)
+            if dsmeta_t:
+                if _ok_metadata(dsmeta_t, mtype, ds, None):
+                    dsmeta_t = _filter_metadata_fields(
+                        dsmeta_t,
+                        maxsize=max_fieldsize,
+                        blacklist=blacklist)
+                    dsmeta[mtype_key] = dsmeta_t
+                else:
+                    errored = True
+
+            # TODO: ATM neuroimaging extractors all provide their own internal
+            #  log_progress but if they are all generators, we could provide generic
+            #  handling of the progress here.  Note also that log message is actually
+            #  seems to be ignored and not used, only the label ;-)
             # log_progress(
             #     lgr.debug,
             #     'metadataextractors_loc',
-            #     'ignoredatm',
-            #     label=loc,
-            #     update=1,
-            #     increment=True)
-            if not _ok_metadata(meta, mtype, ds, loc):
-                errored = True
+            #     'Metadata extraction per location for %s', mtype,
+            #     # contentmeta_t is a generator... so no cound is known
+            #     # total=len(contentmeta_t or []),
+            #     label='Metadata extraction per location',
+            #     unit=' locations',
+            # )
+            for loc, meta in contentmeta_t or {}:
+                lgr.log(5, "Analyzing metadata for %s", loc)
                 # log_progress(
                 #     lgr.debug,
                 #     'metadataextractors_loc',
                 #     'ignoredatm',
-                #     label='Failed for %s' % loc,
-                # )
-                continue
-            # we also want to store info that there was no metadata(e.g. to get a list of
-            # files that have no metadata)
-            # if there is an issue that a extractor needlessly produces empty records, the
-            # extractor should be fixed and not a general switch. For example the datalad_core
-            # issues empty records to document the presence of a file
-            #elif not meta:
-            #    continue
-
-            # apply filters
-            meta = _filter_metadata_fields(
-                meta,
-                maxsize=max_fieldsize,
-                blacklist=blacklist)
-
-            if not meta:
-                continue
+                #     label=loc,
+                #     update=1,
+                #     increment=True)
+                if not _ok_metadata(meta, mtype, ds, loc):
+                    errored = True
+                    # log_progress(
+                    #     lgr.debug,
+                    #     'metadataextractors_loc',
+                    #     'ignoredatm',
+                    #     label='Failed for %s' % loc,
+                    # )
+                    continue
+                # we also want to store info that there was no metadata(e.g. to get a list of
+                # files that have no metadata)
+                # if there is an issue that a extractor needlessly produces empty records, the
+                # extractor should be fixed and not a general switch. For example the datalad_core
+                # issues empty records to document the presence of a file
+                #elif not meta:
+                #    continue
+
+                # apply filters
+                meta = _filter_metadata_fields(
+                    meta,
+                    maxsize=max_fieldsize,
+                    blacklist=blacklist)
+
+                if not meta:
+                    continue
 
-            # assign
-            # only ask each metadata extractor once, hence no conflict possible
-            loc_dict = contentmeta.get(loc, {})
-            loc_dict[mtype_key] = meta
-            contentmeta[loc] = loc_dict
+                # assign
+                # only ask each metadata extractor once, hence no conflict possible
+                loc_dict = contentmeta.get(loc, {})
+                loc_dict[mtype_key] = meta
+                contentmeta[loc] = loc_dict
+
+            # log_progress(
+            #     lgr.debug,
+            #     'metadataextractors_loc',
+            #     'Finished metadata extraction across locations for %s', mtype)
 
             if ds.config.obtain(
                     'datalad.metadata.generate-unique-{}'.format(mtype_key.replace('_', '-')),
                     default=True,
                     valtype=EnsureBool()):
-                # go through content metadata and inject report of unique keys
-                # and values into `dsmeta`
-                for k, v in meta.items():
+                unique_excludes[mtype_key] = getattr(
+                    extractor_cls, "_unique_exclude", set())
+
+        # go through content metadata and inject report of unique keys
+        # and values into `dsmeta`
+        for mtype_key, extractor_unique_exclude in unique_excludes.items():
+            unique_cm = {}
+            for loc_dict in contentmeta.values():
+                for k, v in loc_dict.get(mtype_key, {}).items():
                     if k in dsmeta.get(mtype_key, {}):
                         # if the dataset already has a dedicated idea
                         # about a key, we skip it from the unique list
@@ -639,57 +799,54 @@ def _get_metadata(ds, types, global_meta=None, content_meta=None, paths=None):
                     vset.add(_val2hashable(v))
                     unique_cm[k] = vset
 
-        # log_progress(
-        #     lgr.debug,
-        #     'metadataextractors_loc',
-        #     'Finished metadata extraction across locations for %s', mtype)
-
-        if unique_cm:
-            # per source storage here too
-            ucp = dsmeta.get('datalad_unique_content_properties', {})
-            # important: we want to have a stable order regarding
-            # the unique values (a list). we cannot guarantee the
-            # same order of discovery, hence even when not using a
-            # set above we would still need sorting. the callenge
-            # is that any value can be an arbitrarily complex nested
-            # beast
-            # we also want to have each unique value set always come
-            # in a top-level list, so we known if some unique value
-            # was a list, os opposed to a list of unique values
-
-            def _ensure_serializable(val):
-                if isinstance(val, ReadOnlyDict):
-                    return {k: _ensure_serializable(v) for k, v in val.items()}
-                if isinstance(val, (tuple, list)):
-                    return [_ensure_serializable(v) for v in val]
-                else:
-                    return val
-
-            ucp[mtype_key] = {
-                k: [_ensure_serializable(i)
-                    for i in sorted(
-                        v,
-                        key=_unique_value_key)] if v is not None else None
-                for k, v in unique_cm.items()
-                # v == None (disable unique, but there was a value at some point)
-                # otherwise we only want actual values, and also no single-item-lists
-                # of a non-value
-                # those contribute no information, but bloat the operation
-                # (inflated number of keys, inflated storage, inflated search index, ...)
-                if v is None or (v and not v == {''})}
-            dsmeta['datalad_unique_content_properties'] = ucp
-
-    log_progress(
-        lgr.info,
-        'metadataextractors',
-        'Finished metadata extraction from %s', ds,
-    )
-
-    # always identify the effective vocabulary - JSON-LD style
-    if context:
-        dsmeta['@context'] = context
-
-    return dsmeta, contentmeta, errored
+            if unique_cm:
+                # per source storage here too
+                ucp = dsmeta.get('datalad_unique_content_properties', {})
+                # important: we want to have a stable order regarding
+                # the unique values (a list). we cannot guarantee the
+                # same order of discovery, hence even when not using a
+                # set above we would still need sorting. the callenge
+                # is that any value can be an arbitrarily complex nested
+                # beast
+                # we also want to have each unique value set always come
+                # in a top-level list, so we known if some unique value
+                # was a list, os opposed to a list of unique values
+
+                def _ensure_serializable(val):
+                    if isinstance(val, ReadOnlyDict):
+                        return {k: _ensure_serializable(v) for k, v in val.items()}
+                    if isinstance(val, (tuple, list)):
+                        return [_ensure_serializable(v) for v in val]
+                    else:
+                        return val
+
+                ucp[mtype_key] = {
+                    k: [_ensure_serializable(i)
+                        for i in sorted(
+                            v,
+                            key=_unique_value_key)] if v is not None else None
+                    for k, v in unique_cm.items()
+                    # v == None (disable unique, but there was a value at some point)
+                    # otherwise we only want actual values, and also no single-item-lists
+                    # of a non-value
+                    # those contribute no information, but bloat the operation
+                    # (inflated number of keys, inflated storage, inflated search index, ...)
+                    if v is None or (v and not v == {''})}
+                dsmeta['datalad_unique_content_properties'] = ucp
+
+        log_progress(
+            lgr.info,
+            'metadataextractors',
+            'Finished metadata extraction from %s', ds,
+        )
+
+        # always identify the effective vocabulary - JSON-LD style
+        if context:
+            dsmeta['@context'] = context
+
+        return dsmeta, contentmeta, errored
+
+    return collect
 
 
 def _unique_value_key(x):
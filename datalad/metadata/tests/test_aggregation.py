@@ -15,6 +15,9 @@ from os.path import join as opj
 
 from datalad.api import metadata
 from datalad.distribution.dataset import Dataset
+from datalad.metadata.metadata import load_ds_aggregate_db
+from datalad.metadata.aggregate import _the_same_across_datasets
+from datalad.support.gitrepo import GitRepo
 
 from datalad.tests.utils import (
     assert_dict_equal,
@@ -24,6 +27,7 @@ from datalad.tests.utils import (
     assert_status,
     eq_,
     known_failure_githubci_win,
+    ok_,
     skip_if_on_windows,
     skip_ssh,
     with_tempfile,
@@ -411,3 +415,134 @@ def test_partial_aggregation(path):
     #res = ds.metadata(get_aggregates=True)
     #assert_result_count(res, 3)
     #assert_result_count(res, 1, path=sub2.path)
+
+
+@known_failure_githubci_win
+@with_tree(tree=_dataset_hierarchy_template)
+def test_aggregate_jobs(path):
+    base = Dataset(opj(path, 'origin')).create(force=True)
+    base.create('sub', force=True)
+    base.create(opj('sub', 'subsub'), force=True)
+    base.save(recursive=True)
+    base.aggregate_metadata(recursive=True, update_mode='all')
+    serial_meta = base.metadata(recursive=True, return_type='list')
+    res = base.aggregate_metadata(
+        recursive=True, update_mode='all', force_extraction=True, jobs=2)
+    assert_status('ok', res)
+    assert_repo_status(base.path)
+    # concurrent extraction yields the same aggregate
+    eq_(serial_meta, base.metadata(recursive=True, return_type='list'))
+
+
+@known_failure_githubci_win
+@with_tree({'file1': 'one', 'file2': 'two', 'file3': 'three'})
+def test_incremental_content_aggregation(path):
+    ds = Dataset(path).create(force=True)
+    ds.config.set(
+        'datalad.metadata.aggregate-incremental-content', 'yes',
+        where='local')
+    ds.save()
+    ds.repo.set_metadata('file1', init={'tag': 'one'})
+    ds.aggregate_metadata()
+
+    def _get_content_meta():
+        return {
+            op.relpath(r['path'], ds.path): r['metadata']
+            for r in ds.metadata(reporton='files', return_type='list')}
+
+    # modify, remove, and add files
+    ds.unlock('file2')
+    with open(opj(ds.path, 'file2'), 'w') as f:
+        f.write('modified')
+    ds.remove('file3', check=False)
+    with open(opj(ds.path, 'file4'), 'w') as f:
+        f.write('four')
+    ds.save()
+    ds.repo.set_metadata('file2', init={'tag': 'two'})
+    ds.aggregate_metadata()
+    incremental = _get_content_meta()
+    eq_(sorted(incremental), ['file1', 'file2', 'file4'])
+    eq_(incremental['file2']['annex']['tag'], 'two')
+    # previously extracted metadata of unmodified files is retained
+    eq_(incremental['file1']['annex']['tag'], 'one')
+    # identical to an extraction from scratch
+    ds.aggregate_metadata(force_extraction=True)
+    eq_(incremental, _get_content_meta())
+
+
+@known_failure_githubci_win
+@with_tree({'file1': 'one', 'dir': {'file2': 'two', 'file3': 'three'}})
+def test_sqlite_content_aggregation(path):
+    ds = Dataset(path).create(force=True)
+    ds.config.set(
+        'datalad.metadata.store-aggregate-content-format', 'sqlite',
+        where='dataset')
+    ds.config.set(
+        'datalad.metadata.aggregate-incremental-content', 'yes',
+        where='local')
+    ds.save()
+    ds.repo.set_metadata('file1', init={'tag': 'one'})
+    ds.repo.set_metadata(opj('dir', 'file2'), init={'tag': 'two'})
+    assert_status('ok', ds.aggregate_metadata())
+    assert_repo_status(ds.path)
+
+    def _get_content_info():
+        return load_ds_aggregate_db(ds, abspath=True)[ds.path]['content_info']
+
+    def _get_content_meta(path):
+        return {
+            op.relpath(r['path'], ds.path): r['metadata']
+            for r in ds.metadata(
+                path, reporton='files', return_type='list')}
+
+    content_info = _get_content_info()
+    ok_(content_info.endswith('.sqlite'))
+    # query a file, a directory, and the entire dataset
+    res = _get_content_meta('file1')
+    eq_(sorted(res), ['file1'])
+    eq_(res['file1']['annex']['tag'], 'one')
+    res = _get_content_meta('dir')
+    eq_(sorted(res), [opj('dir', 'file2'), opj('dir', 'file3')])
+    eq_(res[opj('dir', 'file2')]['annex']['tag'], 'two')
+    eq_(sorted(_get_content_meta('.')),
+        ['file1', opj('dir', 'file2'), opj('dir', 'file3')])
+
+    # no change, no new metadata object, nothing to save
+    hexsha = ds.repo.get_hexsha()
+    ds.aggregate_metadata()
+    eq_(content_info, _get_content_info())
+    eq_(hexsha, ds.repo.get_hexsha())
+
+    # incremental update of the SQLite object
+    ds.unlock(opj('dir', 'file3'))
+    with open(opj(ds.path, 'dir', 'file3'), 'w') as f:
+        f.write('modified')
+    ds.remove('file1', check=False)
+    with open(opj(ds.path, 'dir', 'file4'), 'w') as f:
+        f.write('four')
+    ds.save()
+    ds.repo.set_metadata(opj('dir', 'file3'), init={'tag': 'three'})
+    ds.aggregate_metadata()
+    assert_repo_status(ds.path)
+    ok_(_get_content_info().endswith('.sqlite'))
+    incremental = _get_content_meta('.')
+    eq_(sorted(incremental),
+        [opj('dir', 'file2'), opj('dir', 'file3'), opj('dir', 'file4')])
+    eq_(incremental[opj('dir', 'file3')]['annex']['tag'], 'three')
+    # previously extracted metadata of unmodified files is retained
+    eq_(incremental[opj('dir', 'file2')]['annex']['tag'], 'two')
+    eq_(_get_content_meta('dir'), incremental)
+    # identical to an extraction from scratch
+    ds.aggregate_metadata(force_extraction=True)
+    eq_(incremental, _get_content_meta('.'))
+
+
+@with_tree({'ds1': {'same': 'content', 'other': 'one'},
+            'ds2': {'same': 'content', 'other': 'two'}})
+def test_the_same_across_datasets(path):
+    dss = []
+    for name in ('ds1', 'ds2'):
+        GitRepo(op.join(path, name), create=True)
+        dss.append(Dataset(op.join(path, name)))
+    ok_(_the_same_across_datasets('same', *dss))
+    ok_(not _the_same_across_datasets('other', *dss))
@@ -14,10 +14,18 @@ try:
 except ImportError:  # Python <= 3.3
     from collections import Mapping
 
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
+import hashlib
+from itertools import (
+    chain,
+    islice,
+)
 import logging
 import os
 import re
+import sqlite3
 import string
 
 from urllib.parse import urlparse
@@ -28,7 +36,10 @@ from datalad.log import log_progress, with_result_progress
 from datalad.interface.base import Interface
 from datalad.interface.base import build_doc
 from datalad.interface.results import annexjson2result, get_status_dict
-from datalad.interface.common_opts import nosave_opt
+from datalad.interface.common_opts import (
+    jobs_opt,
+    nosave_opt,
+)
 from datalad.support.exceptions import AnnexBatchCommandError
 from datalad.support.network import get_url_filename
 from datalad.support.path import split_ext
@@ -41,6 +52,15 @@ from datalad.utils import (
 
 lgr = logging.getLogger("datalad.plugin.addurls")
 
+# Size in bytes from which on CSV and JSON lines tables are streamed rather
+# than loaded into memory
+STREAM_MIN_SIZE = 256 * 1024 ** 2
+# Number of rows that are formatted and added at a time when streaming
+ROWS_PER_CHUNK = 10000
+# Number of added files after which they are saved when streaming, instead of
+# saving all of them at the end
+FILES_PER_SAVE = 100000
+
 __docformat__ = "restructuredtext"
 
 
@@ -59,16 +79,71 @@ class Formatter(string.Formatter):
     missing : str, optional
         When column lookup results in an empty string, use this value in
         its place.
+
+    Each format string is parsed only once.  Simple placeholders are then
+    looked up directly in the mapping, and only placeholders with attribute
+    or item access, or with nested fields in the format spec, go through
+    `string.Formatter`.
     """
 
     def __init__(self, idx_to_name=None, missing_value=None):
         self.idx_to_name = idx_to_name or {}
         self.missing = missing_value
+        self._compiled = {}
+
+    def _compile(self, format_string):
+        """Parse `format_string` into a list of
+        (literal, name, key, conversion, format spec) tuples.
+
+        None is returned if `format_string` contains a placeholder that
+        requires the generic `string.Formatter` machinery.
+        """
+        pieces = []
+        for literal, key, spec, conversion in self.parse(format_string):
+            if key is None:
+                pieces.append((literal, None, None, None, None))
+                continue
+            if not key or "." in key or "[" in key or "{" in spec:
+                return
+            name = key
+            try:
+                key_int = int(key)
+            except ValueError:
+                pass
+            else:
+                name = self.idx_to_name[key_int]
+            pieces.append((literal, name, key, conversion, spec))
+        return pieces
 
     def format(self, format_string, *args, **kwargs):
         if not isinstance(args[0], Mapping):
             raise ValueError("First positional argument should be mapping")
-        return super(Formatter, self).format(format_string, *args, **kwargs)
+        try:
+            pieces = self._compiled[format_string]
+        except KeyError:
+            pieces = self._compiled[format_string] = \
+                self._compile(format_string)
+        if pieces is None or kwargs:
+            return super(Formatter, self).format(
+                format_string, *args, **kwargs)
+
+        data = args[0]
+        missing = self.missing
+        parts = []
+        for literal, name, key, conversion, spec in pieces:
+            parts.append(literal)
+            if name is None:
+                continue
+            try:
+                value = data[name]
+            except KeyError:
+                raise KeyError(key)
+            if missing is not None and isinstance(value, str):
+                value = value or missing
+            if conversion:
+                value = self.convert_field(value, conversion)
+            parts.append(format(value, spec))
+        return "".join(parts)
 
     def get_value(self, key, args, kwargs):
         """Look for key's value in `args[0]` mapping first.
@@ -103,27 +178,102 @@ class Formatter(string.Formatter):
 
 class RepFormatter(Formatter):
     """Extend Formatter to support a {_repindex} placeholder.
+
+    Parameters
+    ----------
+    repeats : mapping, optional
+        Records how often each formatted value was repeated.  Defaults to a
+        dict.
     """
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, repeats=None, **kwargs):
         super(RepFormatter, self).__init__(*args, **kwargs)
-        self.repeats = {}
+        self.repeats = {} if repeats is None else repeats
         self.repindex = 0
 
-    def format(self, *args, **kwargs):
+    def format(self, format_string, *args, **kwargs):
         self.repindex = 0
-        result = super(RepFormatter, self).format(*args, **kwargs)
+        result = self._format(format_string, args, kwargs)
         if result in self.repeats:
             self.repindex = self.repeats[result] + 1
             self.repeats[result] = self.repindex
-            result = super(RepFormatter, self).format(*args, **kwargs)
+            result = self._format(format_string, args, kwargs)
         else:
             self.repeats[result] = 0
         return result
 
-    def get_value(self, key, args, kwargs):
-        args[0]["_repindex"] = self.repindex
-        return super(RepFormatter, self).get_value(key, args, kwargs)
+    def _format(self, format_string, args, kwargs):
+        if args and isinstance(args[0], Mapping):
+            args[0]["_repindex"] = self.repindex
+        return super(RepFormatter, self).format(
+            format_string, *args, **kwargs)
+
+
+class NameCounts(object):
+    """Mapping of names to counts, kept in a temporary SQLite database
+
+    Names are stored as MD5 digests in a private on-disk database, so that
+    memory use does not grow with the number of names (e.g. the file names
+    of a huge table).
+    """
+
+    def __init__(self):
+        # An empty file name creates a temporary database, which is removed
+        # when closed.
+        self._conn = sqlite3.connect("", isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=OFF")
+        self._conn.execute("PRAGMA synchronous=OFF")
+        self._conn.execute(
+            "CREATE TABLE counts (name BLOB PRIMARY KEY, n INTEGER NOT NULL) "
+            "WITHOUT ROWID")
+
+    @staticmethod
+    def _digest(name):
+        return hashlib.md5(name.encode("utf-8")).digest()
+
+    def __contains__(self, name):
+        try:
+            self[name]
+        except KeyError:
+            return False
+        return True
+
+    def __getitem__(self, name):
+        row = self._conn.execute(
+            "SELECT n FROM counts WHERE name = ?",
+            (self._digest(name),)).fetchone()
+        if row is None:
+            raise KeyError(name)
+        return row[0]
+
+    def __setitem__(self, name, n):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO counts (name, n) VALUES (?, ?)",
+            (self._digest(name), n))
+
+    def add_new(self, names):
+        """Record `names` with a count of 0
+
+        Returns
+        -------
+        False if any of `names` was known already or is given more than once,
+        True otherwise.  In the former case, only some of `names` might have
+        been recorded.
+        """
+        self._conn.execute("BEGIN")
+        try:
+            # sorted keys are inserted much faster
+            self._conn.executemany(
+                "INSERT INTO counts (name, n) VALUES (?, 0)",
+                sorted((self._digest(n),) for n in names))
+        except sqlite3.IntegrityError:
+            self._conn.execute("ROLLBACK")
+            return False
+        self._conn.execute("COMMIT")
+        return True
+
+    def close(self):
+        self._conn.close()
 
 
 def clean_meta_args(args):
@@ -253,7 +403,29 @@ def fmt_to_name(format_string, num_to_name):
         return name
 
 
+def _read_jsonl(stream):
+    import json
+    for lineno, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.decoder.JSONDecodeError as e:
+            raise ValueError(
+                "Failed to read JSON from line {} of stream {}: {}"
+                .format(lineno, stream, exc_str(e)))
+
+
 def _read(stream, input_type):
+    """Read rows from `stream`.
+
+    Returns
+    -------
+    A tuple where the first item is an iterator over the rows and the second
+    item a dict mapping column indices to names.  CSV and JSON lines input is
+    read lazily, while a JSON file has to be loaded as a whole.
+    """
     if input_type == "csv":
         import csv
         csvrows = csv.reader(stream)
@@ -264,20 +436,24 @@ def _read(stream, input_type):
         lgr.debug("Taking %s fields from first line as headers: %s",
                   len(headers), headers)
         idx_map = dict(enumerate(headers))
-        rows = [dict(zip(headers, r)) for r in csvrows]
-    elif input_type == "json":
-        import json
-        try:
-            rows = json.load(stream)
-        except json.decoder.JSONDecodeError as e:
-            raise ValueError(
-                "Failed to read JSON from stream {}: {}"
-                .format(stream, exc_str(e)))
+        rows = (dict(zip(headers, r)) for r in csvrows)
+    elif input_type in ("json", "jsonl"):
+        if input_type == "json":
+            import json
+            try:
+                rows = iter(json.load(stream))
+            except json.decoder.JSONDecodeError as e:
+                raise ValueError(
+                    "Failed to read JSON from stream {}: {}"
+                    .format(stream, exc_str(e)))
+        else:
+            rows = _read_jsonl(stream)
         # For json input, we do not support indexing by position,
         # only names.
         idx_map = {}
     else:
-        raise ValueError("input_type must be 'csv', 'json', or 'ext'")
+        raise ValueError(
+            "input_type must be 'csv', 'json', 'jsonl', or 'ext'")
     return rows, idx_map
 
 
@@ -367,8 +543,12 @@ def get_url_parts(url):
     return names
 
 
-def add_extra_filename_values(filename_format, rows, urls, dry_run):
+def add_extra_filename_values(filename_format, rows, urls, dry_run,
+                              start=0):
     """Extend `rows` with values for special formatting fields.
+
+    `start` is the index of the first row in the whole table, which is used
+    for the placeholder file names of a dry run.
     """
     file_fields = list(get_fmt_names(filename_format))
     if any(i.startswith("_url") for i in file_fields):
@@ -378,7 +558,7 @@ def add_extra_filename_values(filename_format, rows, urls, dry_run):
     if any(i.startswith("_url_filename") for i in file_fields):
         if dry_run:  # Don't waste time making requests.
             dummy = get_file_parts("BASE.EXT", "_url_filename")
-            for idx, row in enumerate(rows):
+            for idx, row in enumerate(rows, start):
                 row.update(
                     {k: v + str(idx) for k, v in dummy.items()})
         else:
@@ -423,31 +603,53 @@ def sort_paths(paths):
         yield path
 
 
-def extract(stream, input_type, url_format="{0}", filename_format="{1}",
-            exclude_autometa=None, meta=None,
-            dry_run=False, missing_value=None):
-    """Extract and format information from `url_file`.
+def _iter_chunks(iterable, size):
+    """Yield lists of up to `size` items from `iterable`
+
+    If `size` is None, all items are yielded as a single list.
+    """
+    it = iter(iterable)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_extract(stream, input_type, url_format="{0}", filename_format="{1}",
+                 exclude_autometa=None, meta=None, dry_run=False,
+                 missing_value=None, chunk_size=None, with_meta=True):
+    """Extract and format information from `url_file`, chunk by chunk.
+
+    Only `chunk_size` rows are held in memory at a time if the rows of
+    `stream` can be read lazily (see `_read`).
 
     Parameters
     ----------
-    stream : file object
-        Items used to construct the file names and URLs.
-    input_type : {'csv', 'json'}
+    chunk_size : int, optional
+        Maximum number of rows in a chunk.  By default, all rows are
+        processed as a single chunk.  Otherwise, the file names for the
+        "_repindex" placeholder are tracked on disk (see `NameCounts`).
+    with_meta : bool, optional
+        Whether to format the metadata arguments.  If false, the extracted
+        information does not have a "meta_args" item.
 
-    All other parameters match those described in `AddUrls`.
+    All other parameters match those of `extract`.
 
     Returns
     -------
-    A tuple where the first item is a list with a dict of extracted information
-    for each row in `stream` and the second item a list subdataset paths,
-    sorted breadth-first.
+    A generator of tuples, one for each chunk, where the first item is a
+    list with a dict of extracted information for each row in the chunk and
+    the second item a set of subdataset paths.
     """
     meta = assure_list(meta)
 
     rows, colidx_to_name = _read(stream, input_type)
-    if not rows:
+    try:
+        first_row = next(rows)
+    except StopIteration:
         lgr.warning("No rows found in %s", stream)
-        return [], []
+        return
 
     fmt = Formatter(colidx_to_name, missing_value)  # For URL and meta
     format_url = partial(fmt.format, url_format)
@@ -457,7 +659,7 @@ def extract(stream, input_type, url_format="{0}", filename_format="{1}",
         urlcol = fmt_to_name(url_format, colidx_to_name)
         # TODO: Try to normalize invalid fields, checking for any
         # collisions.
-        metacols = (c for c in sorted(rows[0].keys()) if c != urlcol)
+        metacols = (c for c in sorted(first_row.keys()) if c != urlcol)
         if exclude_autometa:
             metacols = (c for c in metacols
                         if not re.search(exclude_autometa, c))
@@ -468,60 +670,202 @@ def extract(stream, input_type, url_format="{0}", filename_format="{1}",
     # because meta may be given multiple times on the command line.
     formats_meta = [partial(fmt.format, m) for m in meta + auto_meta_args]
 
-    rows_with_url = []
+    # For the file name, we allow the _repindex special key.  Only pay for
+    # tracking all file names if it is used.
+    repeats = None
+    if "_repindex" in get_fmt_names(filename_format):
+        if chunk_size:
+            repeats = NameCounts()
+        filename_fmt = RepFormatter(colidx_to_name, missing_value,
+                                    repeats=repeats)
+    else:
+        filename_fmt = Formatter(colidx_to_name, missing_value)
+    format_filename = partial(filename_fmt.format, filename_format)
+
+    n_with_url = 0
+    n_dropped = 0
+    try:
+        for chunk in _iter_chunks(chain([first_row], rows), chunk_size):
+            rows_with_url = []
+            infos = []
+            for row in chunk:
+                try:
+                    url = format_url(row)
+                except KeyError as exc:
+                    raise _get_placeholder_exception(
+                        exc, "Unknown placeholder in URL", row)
+                if not url or url == missing_value:
+                    continue  # pragma: no cover, peephole optimization
+                rows_with_url.append(row)
+                info = {"url": url}
+                if with_meta:
+                    info["meta_args"] = clean_meta_args(
+                        fmt(row) for fmt in formats_meta)
+                infos.append(info)
+            n_dropped += len(chunk) - len(rows_with_url)
+
+            # Format the filename in a second pass so that we can provide
+            # information about the formatted URLs.
+            add_extra_filename_values(filename_format, rows_with_url,
+                                      [i["url"] for i in infos],
+                                      dry_run, start=n_with_url)
+            n_with_url += len(rows_with_url)
+            yield infos, _format_filenames(format_filename, rows_with_url,
+                                           infos)
+
+        if n_dropped:
+            lgr.warning("Dropped %d row(s) that had an empty URL", n_dropped)
+    finally:
+        if repeats is not None:
+            repeats.close()
+
+
+def extract(stream, input_type, url_format="{0}", filename_format="{1}",
+            exclude_autometa=None, meta=None,
+            dry_run=False, missing_value=None):
+    """Extract and format information from `url_file`.
+
+    Parameters
+    ----------
+    stream : file object
+        Items used to construct the file names and URLs.
+    input_type : {'csv', 'json', 'jsonl'}
+
+    All other parameters match those described in `AddUrls`.
+
+    Returns
+    -------
+    A tuple where the first item is a list with a dict of extracted information
+    for each row in `stream` and the second item a list subdataset paths,
+    sorted breadth-first.
+    """
     infos = []
-    for row in rows:
-        try:
-            url = format_url(row)
-        except KeyError as exc:
-            raise _get_placeholder_exception(
-                exc, "Unknown placeholder in URL", row)
-        if not url or url == missing_value:
-            continue  # pragma: no cover, peephole optimization
-        rows_with_url.append(row)
-        meta_args = clean_meta_args(fmt(row) for fmt in formats_meta)
-        infos.append({"url": url, "meta_args": meta_args})
-
-    n_dropped = len(rows) - len(rows_with_url)
-    if n_dropped:
-        lgr.warning("Dropped %d row(s) that had an empty URL", n_dropped)
-
-    # Format the filename in a second pass so that we can provide
-    # information about the formatted URLs.
-    add_extra_filename_values(filename_format, rows_with_url,
-                              [i["url"] for i in infos],
-                              dry_run)
-
-    # For the file name, we allow the _repindex special key.
-    format_filename = partial(
-        RepFormatter(colidx_to_name, missing_value).format,
-        filename_format)
-    subpaths = _format_filenames(format_filename, rows_with_url, infos)
+    subpaths = set()
+    for chunk_infos, chunk_subpaths in iter_extract(
+            stream, input_type, url_format, filename_format,
+            exclude_autometa, meta, dry_run, missing_value):
+        infos.extend(chunk_infos)
+        subpaths |= chunk_subpaths
     return infos, list(sort_paths(subpaths))
 
 
+def _handle_existing(row, ifexists):
+    """Deal with an existing file at the target of `row` as per `ifexists`
+
+    Returns
+    -------
+    A result dict if the row is to be skipped, None otherwise.
+    """
+    filename_abs = row["filename_abs"]
+    if os.path.exists(filename_abs) or os.path.islink(filename_abs):
+        if ifexists == "skip":
+            return get_status_dict(action="addurls",
+                                   ds=row["ds"],
+                                   type="file",
+                                   path=filename_abs,
+                                   status="notneeded")
+        elif ifexists == "overwrite":
+            lgr.debug("Removing %s", filename_abs)
+            unlink(filename_abs)
+        else:
+            lgr.debug("File %s already exists", filename_abs)
+
+
+def _group_by_dataset(rows):
+    """Return the rows of each dataset, in order of their first row
+    """
+    by_ds = OrderedDict()
+    for row in rows:
+        by_ds.setdefault(row["ds"].path, []).append(row)
+    return list(by_ds.values())
+
+
+def _map_datasets(fn, rows, jobs):
+    """Apply `fn` to the rows of each dataset, with `jobs` concurrent calls
+
+    `fn` must return a list of results, which are yielded in the order of
+    the datasets.
+    """
+    ds_rows = _group_by_dataset(rows)
+    for rows_ in ds_rows:
+        # instantiate repositories upfront, not in concurrent threads
+        rows_[0]["ds"].repo
+    if not jobs or jobs < 2 or len(ds_rows) < 2:
+        for rows_ in ds_rows:
+            yield from fn(rows_)
+        return
+    with ThreadPoolExecutor(max_workers=min(jobs, len(ds_rows))) as pool:
+        for results in pool.map(fn, ds_rows):
+            yield from results
+
+
+def _add_urls_batched(rows, ifexists=None, options=None):
+    """Add the URLs of `rows`, which must all belong to a single dataset
+
+    Requests are fed to `git annex addurl --batch` without awaiting the
+    response to the previous one.
+
+    Returns
+    -------
+    A list of result dicts.
+    """
+    ds = rows[0]["ds"]
+    results = []
+    to_add = []
+    for row in rows:
+        res = _handle_existing(row, ifexists)
+        if res:
+            results.append(res)
+        else:
+            to_add.append(row)
+
+    lgr.debug("Adding %d URLs to %s", len(to_add), ds.path)
+    ndone = 0
+    try:
+        for row, out_json in zip(
+                to_add,
+                ds.repo.add_urls_to_files_(
+                    ((row["url"], row["ds_filename"]) for row in to_add),
+                    options=options)):
+            ndone += 1
+            # In the case of an error, the json object has file=None.
+            if out_json.get("file") is None:
+                out_json["file"] = row["filename_abs"]
+            results.append(annexjson2result(out_json, ds, action="addurls",
+                                            type="file", logger=lgr))
+    except AnnexBatchCommandError as exc:
+        for row in to_add[ndone:]:
+            results.append(get_status_dict(action="addurls",
+                                           ds=ds,
+                                           type="file",
+                                           path=row["filename_abs"],
+                                           message=exc_str(exc),
+                                           status="error"))
+    return results
+
+
 @with_result_progress("Adding URLs")
-def add_urls(rows, ifexists=None, options=None):
+def add_urls(rows, ifexists=None, options=None, jobs=None):
     """Call `git annex addurl` using information in `rows`.
+
+    If `jobs` is not None, URLs are added with a pipelined batch process
+    per dataset, and up to `jobs` datasets are processed concurrently.
     """
+    if jobs is not None:
+        yield from _map_datasets(
+            partial(_add_urls_batched, ifexists=ifexists, options=options),
+            rows, jobs)
+        return
+
     for row in rows:
         filename_abs = row["filename_abs"]
         ds, filename = row["ds"], row["ds_filename"]
         lgr.debug("Adding metadata to %s in %s", filename, ds.path)
 
-        if os.path.exists(filename_abs) or os.path.islink(filename_abs):
-            if ifexists == "skip":
-                yield get_status_dict(action="addurls",
-                                      ds=ds,
-                                      type="file",
-                                      path=filename_abs,
-                                      status="notneeded")
-                continue
-            elif ifexists == "overwrite":
-                lgr.debug("Removing %s", filename_abs)
-                unlink(filename_abs)
-            else:
-                lgr.debug("File %s already exists", filename_abs)
+        res = _handle_existing(row, ifexists)
+        if res:
+            yield res
+            continue
 
         try:
             out_json = ds.repo.add_url_to_file(filename, row["url"],
@@ -542,12 +886,68 @@ def add_urls(rows, ifexists=None, options=None):
                                type="file", logger=lgr)
 
 
+def _add_meta_batched(rows):
+    """Add the files of `rows`, which must all belong to a single dataset,
+    and set their metadata with a single batch process.
+
+    Returns
+    -------
+    A list of result dicts.
+    """
+    from unittest.mock import patch
+
+    ds = rows[0]["ds"]
+    with patch.object(ds.repo, "always_commit", False):
+        added = {
+            os.path.normpath(r["file"]): r
+            for r in ds.repo.add([row["ds_filename"] for row in rows])
+            if isinstance(r, dict) and r.get("file")}
+        meta_rows = [row for row in rows if row["meta_args"]]
+        lgr.debug("Adding metadata to %d files in %s",
+                  len(meta_rows), ds.path)
+        meta_results = dict(zip(
+            [row["ds_filename"] for row in meta_rows],
+            ds.repo.add_metadata_(
+                (row["ds_filename"], row["meta_args"]) for row in meta_rows)))
+
+    results = []
+    for row in rows:
+        filename = row["ds_filename"]
+        res = added.get(os.path.normpath(filename))
+        results.append(dict(
+            action='add',
+            # decorator dies with Path()
+            path=str(ds.pathobj / filename),
+            type='file',
+            status='notneeded' if not res
+            else 'ok' if res.get('success', False)
+            else 'error',
+            parentds=ds.path,
+        ))
+        if filename in meta_results:
+            res = annexjson2result(meta_results[filename], ds, type="file",
+                                   logger=lgr)
+            # Don't show all added metadata for the file because that
+            # could quickly flood the output.
+            res.pop("message", None)
+            results.append(res)
+    return results
+
+
 @with_result_progress("Adding metadata")
-def add_meta(rows):
+def add_meta(rows, jobs=None):
     """Call `git annex metadata --set` using information in `rows`.
+
+    If `jobs` is not None, the metadata of all files of a dataset is set
+    by a single batch process, and up to `jobs` datasets are processed
+    concurrently.
     """
     from unittest.mock import patch
 
+    if jobs is not None:
+        yield from _map_datasets(_add_meta_batched, rows, jobs)
+        return
+
     for row in rows:
         ds, filename = row["ds"], row["ds_filename"]
         with patch.object(ds.repo, "always_commit", False):
@@ -670,8 +1070,9 @@ class Addurls(Interface):
             metavar="URL-FILE",
             doc="""A file that contains URLs or information that can be used to
             construct URLs.  Depending on the value of --input-type, this
-            should be a CSV file (with a header as the first row) or a JSON
-            file (structured as a list of objects with string values)."""),
+            should be a CSV file (with a header as the first row), a JSON
+            file (structured as a list of objects with string values), or a
+            JSON lines file (with one such object per line)."""),
         urlformat=Parameter(
             args=("urlformat",),
             metavar="URL-FORMAT",
@@ -691,11 +1092,16 @@ class Addurls(Interface):
         input_type=Parameter(
             args=("-t", "--input-type"),
             metavar="TYPE",
-            doc="""Whether `URL-FILE` should be considered a CSV file or a JSON
-            file.  The default value, "ext", means to consider `URL-FILE` as a
-            JSON file if it ends with ".json".  Otherwise, treat it as a CSV
-            file.""",
-            constraints=EnsureChoice("ext", "csv", "json")),
+            doc="""Whether `URL-FILE` should be considered a CSV file, a JSON
+            file, or a JSON lines file (one object per line).  The default
+            value, "ext", means to consider `URL-FILE` as a JSON file if it
+            ends with ".json" and as a JSON lines file if it ends with
+            ".jsonl".  Otherwise, treat it as a CSV file.  CSV and JSON lines
+            files larger than 256 MiB are streamed: they do not have to fit
+            into memory, and are processed in chunks of rows.  In that case,
+            the file is read twice, and URLs used in "_url_filename"
+            placeholders are requested twice.""",
+            constraints=EnsureChoice("ext", "csv", "json", "jsonl")),
         exclude_autometa=Parameter(
             args=("-x", "--exclude_autometa"),
             metavar="REGEXP",
@@ -757,6 +1163,16 @@ class Addurls(Interface):
             action='append',
             doc="""Pass this [PY: cfg_proc PY][CMD: --cfg_proc CMD] value when
             calling `create` to make datasets."""),
+        jobs=Parameter(
+            args=("-J", "--jobs"),
+            metavar="NJOBS",
+            constraints=jobs_opt.constraints,
+            doc="""how many datasets to add URLs and metadata to
+            concurrently. If given, URLs are passed to git-annex without
+            waiting for the previous file to be added, and the metadata of
+            all files of a dataset is set via a single git-annex process.
+            "auto" corresponds to the number defined by the
+            'datalad.runtime.max-annex-jobs' configuration item."""),
     )
 
     @staticmethod
@@ -766,7 +1182,7 @@ class Addurls(Interface):
                  input_type="ext", exclude_autometa=None, meta=None,
                  message=None, dry_run=False, fast=False, ifexists=None,
                  missing_value=None, save=True, version_urls=False,
-                 cfg_proc=None):
+                 cfg_proc=None, jobs=None):
         # Temporarily work around gh-2269.
         url_file = urlfile
         url_format, filename_format = urlformat, filenameformat
@@ -791,47 +1207,92 @@ class Addurls(Interface):
 
         if input_type == "ext":
             extension = os.path.splitext(url_file)[1]
-            input_type = "json" if extension == ".json" else "csv"
-
-        with open(url_file) as fd:
-            try:
-                rows, subpaths = extract(fd, input_type,
-                                         url_format, filename_format,
-                                         exclude_autometa, meta,
-                                         dry_run,
-                                         missing_value)
-            except (ValueError, RequestException) as exc:
-                yield get_status_dict(action="addurls",
-                                      ds=ds,
-                                      status="error",
-                                      message=exc_str(exc))
+            input_type = {".json": "json",
+                          ".jsonl": "jsonl"}.get(extension, "csv")
+
+        # A large table is streamed.  It is read twice: the first pass only
+        # collects the file names and subdatasets so that all of the rows are
+        # checked before anything is created, and the second pass processes a
+        # chunk of rows at a time.  Any other table is read once, as a single
+        # chunk.
+        chunk_size = ROWS_PER_CHUNK \
+            if input_type in ("csv", "jsonl") \
+            and os.path.getsize(url_file) >= STREAM_MIN_SIZE else None
+        loaded = []
+
+        def iter_chunks(with_meta=True):
+            if chunk_size is None:
+                if not loaded:
+                    with open(url_file) as fd:
+                        loaded.extend(iter_extract(fd, input_type,
+                                                   url_format, filename_format,
+                                                   exclude_autometa, meta,
+                                                   dry_run,
+                                                   missing_value))
+                yield from loaded
                 return
+            with open(url_file) as fd:
+                yield from iter_extract(fd, input_type,
+                                        url_format, filename_format,
+                                        exclude_autometa, meta,
+                                        dry_run,
+                                        missing_value,
+                                        chunk_size=chunk_size,
+                                        with_meta=with_meta)
+
+        n_files = 0
+        subpaths = set()
+        collision = False
+        filenames = NameCounts() if chunk_size else None
+        try:
+            for infos, chunk_subpaths in iter_chunks(with_meta=False):
+                subpaths |= chunk_subpaths
+                n_files += len(infos)
+                names = (i["filename"] for i in infos)
+                if filenames is None:
+                    # all rows are in this chunk
+                    collision = len(infos) != len(set(names))
+                else:
+                    collision = not filenames.add_new(names)
+                if collision:
+                    break
+        except (ValueError, RequestException) as exc:
+            yield get_status_dict(action="addurls",
+                                  ds=ds,
+                                  status="error",
+                                  message=exc_str(exc))
+            return
+        finally:
+            if filenames is not None:
+                filenames.close()
 
-        if not rows:
+        if not n_files:
             yield get_status_dict(action="addurls",
                                   ds=ds,
                                   status="notneeded",
                                   message="No rows to process")
             return
 
-        if len(rows) != len(set(row["filename"] for row in rows)):
+        if collision:
             yield get_status_dict(action="addurls",
                                   ds=ds,
                                   status="error",
                                   message=("There are file name collisions; "
                                            "consider using {_repindex}"))
             return
+        subpaths = list(sort_paths(subpaths))
 
         if dry_run:
             for subpath in subpaths:
                 lgr.info("Would create a subdataset at %s", subpath)
-            for row in rows:
-                lgr.info("Would download %s to %s",
-                         row["url"],
-                         os.path.join(ds.path, row["filename"]))
-                lgr.info("Metadata: %s",
-                         sorted(u"{}={}".format(k, v)
-                                for k, v in row["meta_args"].items()))
+            for rows, _ in iter_chunks():
+                for row in rows:
+                    lgr.info("Would download %s to %s",
+                             row["url"],
+                             os.path.join(ds.path, row["filename"]))
+                    lgr.info("Metadata: %s",
+                             sorted(u"{}={}".format(k, v)
+                                    for k, v in row["meta_args"].items()))
             yield get_status_dict(action="addurls",
                                   ds=ds,
                                   status="ok",
@@ -846,6 +1307,8 @@ class Addurls(Interface):
                 yield r
 
         annex_options = ["--fast"] if fast else []
+        if jobs == "auto":
+            jobs = ds.config.obtain("datalad.runtime.max-annex-jobs")
 
         for spath in subpaths:
             if os.path.exists(os.path.join(ds.path, spath)):
@@ -858,63 +1321,94 @@ class Addurls(Interface):
                                    return_type='generator'):
                     yield r
 
-        for row in rows:
-            # Add additional information that we'll need for various
-            # operations.
-            filename_abs = os.path.join(ds.path, row["filename"])
-            if row["subpath"]:
-                ds_current = Dataset(os.path.join(ds.path,
-                                                  row["subpath"]))
-            else:
-                ds_current = ds
-            ds_filename = os.path.relpath(filename_abs, ds_current.path)
-            row.update({"filename_abs": filename_abs,
-                        "ds": ds_current,
-                        "ds_filename": ds_filename})
-
-        if version_urls:
-            num_urls = len(rows)
-            log_progress(lgr.info, "addurls_versionurls",
-                         "Versioning %d URLs", num_urls,
-                         label="Versioning URLs",
-                         total=num_urls, unit=" URLs")
-            for row in rows:
-                url = row["url"]
-                try:
-                    row["url"] = get_versioned_url(url)
-                except (ValueError, NotImplementedError) as exc:
-                    # We don't expect this to happen because get_versioned_url
-                    # should return the original URL if it isn't an S3 bucket.
-                    # It only raises exceptions if it doesn't know how to
-                    # handle the scheme for what looks like an S3 bucket.
-                    lgr.warning("error getting version of %s: %s",
-                                row["url"], exc_str(exc))
-                log_progress(lgr.info, "addurls_versionurls",
-                             "Versioned result for %s: %s", url, row["url"],
-                             update=1, increment=True)
-            log_progress(lgr.info, "addurls_versionurls", "Finished versioning URLs")
-
-        files_to_add = set()
-        for r in add_urls(rows, ifexists=ifexists, options=annex_options):
-            if r["status"] == "ok":
-                files_to_add.add(r["path"])
-            yield r
-
-            msg = message or """\
+        msg = message or """\
 [DATALAD] add files from URLs
 
 url_file='{}'
 url_format='{}'
 filename_format='{}'""".format(url_file, url_format, filename_format)
 
-        if files_to_add:
-            meta_rows = [r for r in rows if r["filename_abs"] in files_to_add]
-            for r in add_meta(meta_rows):
+        files_to_add = set()
+        chunks = iter_chunks()
+        while True:
+            try:
+                rows, _ = next(chunks)
+            except StopIteration:
+                break
+            except RequestException as exc:
+                # A file name request that succeeded in the first pass
+                # failed now.
+                yield get_status_dict(action="addurls",
+                                      ds=ds,
+                                      status="error",
+                                      message=exc_str(exc))
+                break
+
+            for row in rows:
+                # Add additional information that we'll need for various
+                # operations.
+                filename_abs = os.path.join(ds.path, row["filename"])
+                if row["subpath"]:
+                    ds_current = Dataset(os.path.join(ds.path,
+                                                      row["subpath"]))
+                else:
+                    ds_current = ds
+                ds_filename = os.path.relpath(filename_abs, ds_current.path)
+                row.update({"filename_abs": filename_abs,
+                            "ds": ds_current,
+                            "ds_filename": ds_filename})
+
+            if version_urls:
+                num_urls = len(rows)
+                log_progress(lgr.info, "addurls_versionurls",
+                             "Versioning %d URLs", num_urls,
+                             label="Versioning URLs",
+                             total=num_urls, unit=" URLs")
+                for row in rows:
+                    url = row["url"]
+                    try:
+                        row["url"] = get_versioned_url(url)
+                    except (ValueError, NotImplementedError) as exc:
+                        # We don't expect this to happen because
+                        # get_versioned_url should return the original URL if
+                        # it isn't an S3 bucket.  It only raises exceptions if
+                        # it doesn't know how to handle the scheme for what
+                        # looks like an S3 bucket.
+                        lgr.warning("error getting version of %s: %s",
+                                    row["url"], exc_str(exc))
+                    log_progress(lgr.info, "addurls_versionurls",
+                                 "Versioned result for %s: %s",
+                                 url, row["url"],
+                                 update=1, increment=True)
+                log_progress(lgr.info, "addurls_versionurls",
+                             "Finished versioning URLs")
+
+            chunk_added = set()
+            for r in add_urls(rows, ifexists=ifexists, options=annex_options,
+                              jobs=jobs):
+                if r["status"] == "ok":
+                    chunk_added.add(r["path"])
                 yield r
 
-            if save:
-                for r in ds.save(path=files_to_add, message=msg, recursive=True):
+            if chunk_added:
+                meta_rows = [r for r in rows
+                             if r["filename_abs"] in chunk_added]
+                for r in add_meta(meta_rows, jobs=jobs):
+                    yield r
+                if save:
+                    files_to_add |= chunk_added
+
+            # Save large tables in several commits rather than keeping all
+            # file names around.
+            if chunk_size and len(files_to_add) >= FILES_PER_SAVE:
+                for r in ds.save(path=files_to_add, message=msg,
+                                 recursive=True):
                     yield r
+                files_to_add = set()
+
+        if files_to_add:
+            for r in ds.save(path=files_to_add, message=msg, recursive=True):
+                yield r
 
 
 __datalad_plugin__ = Addurls
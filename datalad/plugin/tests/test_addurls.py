@@ -32,6 +32,7 @@ from datalad.tests.utils import (
     assert_not_in,
     assert_raises,
     assert_re_in,
+    assert_result_count,
     assert_repo_status,
     assert_true,
     chpwd,
@@ -39,6 +40,7 @@ from datalad.tests.utils import (
     eq_,
     HTTPPath,
     known_failure_githubci_win,
+    ok_,
     ok_exists,
     slow,
     swallow_logs,
@@ -72,6 +74,15 @@ def test_formatter_lower_case():
     eq_(fmt.format("{other!s}", {}, other=[1, 2]), "[1, 2]")
 
 
+def test_formatter_generic_fields():
+    # Placeholders that the parsed format can't handle directly fall back to
+    # string.Formatter.
+    fmt = au.Formatter({0: "key"})
+    eq_(fmt.format("{key[1]}-{0}", {"key": "ab"}), "b-ab")
+    eq_(fmt.format("{key:>{width}}", {"key": "ab", "width": "4"}), "  ab")
+    eq_(fmt.format("{key:>4}", {"key": "ab"}), "  ab")
+
+
 def test_formatter_no_idx_map():
     fmt = au.Formatter({})
     assert_raises(KeyError, fmt.format, "{0}", {"col0": "value0"})
@@ -120,6 +131,26 @@ def test_repformatter():
     eq_(fmt.format("{c}{_repindex}", {"c": "z"}), "z1")
 
 
+def test_name_counts():
+    counts = au.NameCounts()
+    try:
+        ok_("a" not in counts)
+        assert_raises(KeyError, counts.__getitem__, "a")
+        counts["a"] = 2
+        ok_("a" in counts)
+        eq_(counts["a"], 2)
+        ok_(counts.add_new(["b", "c"]))
+        eq_(counts["b"], 0)
+        ok_(not counts.add_new(["d", "a"]))
+        ok_(not counts.add_new(["e", "e"]))
+
+        fmt = au.RepFormatter({}, repeats=counts)
+        eq_([fmt.format("{c}{_repindex}", {"c": "x"}) for _ in range(3)],
+            ["x0", "x1", "x2"])
+    finally:
+        counts.close()
+
+
 def test_clean_meta_args():
     for args, expect in [(["field="], {}),
                          ([" field=yes "], {"field": "yes"}),
@@ -321,11 +352,105 @@ def test_extract_csv_json_equal():
     eq_(json_output, csv_output)
 
 
+def test_extract_jsonl_json_equal():
+    kwds = dict(filename_format="{age_group}//{now_dead}//{name}.csv",
+                url_format="{name}_{debut_season}.com",
+                meta=["group={age_group}"])
+    jsonl_stream = StringIO(
+        "\n".join(json.dumps(row) for row in ST_DATA["rows"]) + "\n")
+
+    eq_(au.extract(jsonl_stream, "jsonl", **kwds),
+        au.extract(json_stream(ST_DATA["rows"]), "json", **kwds))
+
+
+def test_iter_extract_chunks():
+    kwds = dict(filename_format="{age_group}//{now_dead}//{name}.csv",
+                url_format="{name}_{debut_season}.com")
+    infos, subpaths = au.extract(json_stream(ST_DATA["rows"]), "json", **kwds)
+
+    chunks = list(au.iter_extract(json_stream(ST_DATA["rows"]), "json",
+                                  chunk_size=3, **kwds))
+    eq_([len(i) for i, _ in chunks], [3, 1])
+    eq_([info for i, _ in chunks for info in i], infos)
+    eq_(chunks[1][1], {"kid", "kid/no"})
+    eq_(sorted(set.union(*(s for _, s in chunks))), sorted(subpaths))
+
+
 def test_extract_wrong_input_type():
     assert_raises(ValueError,
                   au.extract, None, "not_csv_or_json")
 
 
+def test_iter_extract_chunks_repindex():
+    rows = [{"name": n} for n in "abacabca"]
+    kwds = dict(url_format="{name}.com",
+                filename_format="{name}-{_repindex}")
+    infos, _ = au.extract(json_stream(rows), "json", **kwds)
+    eq_([i["filename"] for i in infos],
+        ["a-0", "b-0", "a-1", "c-0", "a-2", "b-1", "c-1", "a-3"])
+    # repetitions are counted across chunks
+    eq_([i for chunk, _ in au.iter_extract(json_stream(rows), "json",
+                                           chunk_size=3, **kwds)
+         for i in chunk],
+        infos)
+
+
+@with_tempfile
+def test_addurls_collision_across_chunks(path):
+    ds = Dataset(path)
+    url_file = path + ".csv"
+    with open(url_file, "w") as f:
+        f.write("name,url\n")
+        f.write("".join("{0},http://example.com/{0}\n".format(n)
+                        for n in "abcdefa"))
+    with patch.object(au, "STREAM_MIN_SIZE", 0), \
+            patch.object(au, "ROWS_PER_CHUNK", 3):
+        # the first and the last row collide
+        res = ds.addurls(url_file, "{url}", "{name}", dry_run=True,
+                         on_failure="ignore", result_renderer=None)
+        assert_result_count(res, 1)
+        assert_in_results(res, action="addurls", status="error")
+        assert_in("file name collisions", res[0]["message"])
+
+        with swallow_logs(new_level=logging.INFO) as cml:
+            res = ds.addurls(url_file, "{url}", "{name}{_repindex}",
+                             dry_run=True, result_renderer=None)
+            assert_in_results(res, action="addurls", status="ok")
+            assert_in("to {}".format(op.join(path, "a1")), cml.out)
+            assert_in("to {}".format(op.join(path, "d0")), cml.out)
+
+
+@with_tempfile
+def test_addurls_stream_large_tables(path):
+    ds = Dataset(path)
+    url_file = path + ".csv"
+    with open(url_file, "w") as f:
+        f.write("name,url\n")
+        f.write("".join("{0},http://example.com/{0}\n".format(n)
+                        for n in "abcde"))
+    calls = []
+
+    def iter_extract(*args, **kwargs):
+        calls.append(kwargs.get("chunk_size"))
+        return au_iter_extract(*args, **kwargs)
+
+    au_iter_extract = au.iter_extract
+    with patch.object(au, "iter_extract", iter_extract):
+        # a small table is read once, without chunks
+        res = ds.addurls(url_file, "{url}", "{name}", dry_run=True,
+                         result_renderer=None)
+        assert_in_results(res, action="addurls", status="ok")
+        eq_(calls, [None])
+        del calls[:]
+        # a large one is read in chunks, in two passes
+        with patch.object(au, "STREAM_MIN_SIZE", 10), \
+                patch.object(au, "ROWS_PER_CHUNK", 2):
+            res = ds.addurls(url_file, "{url}", "{name}", dry_run=True,
+                             result_renderer=None)
+        assert_in_results(res, action="addurls", status="ok")
+        eq_(calls, [2, 2])
+
+
 @with_tempfile(mkdir=True)
 def test_addurls_nonannex_repo(path):
     ds = Dataset(path).create(force=True, annex=False)
@@ -551,6 +676,33 @@ class TestAddurls(object):
             ds.addurls(self.json_file, "{url}", "{subdir}-nosave//{name}")
             assert_in("Not creating subdataset at existing path", cml.out)
 
+    @with_tempfile(mkdir=True)
+    def test_addurls_jobs(self, path):
+        ds = Dataset(path).create(force=True)
+
+        def check_metadata():
+            for subdir, fnames in (("foo", ["a", "c"]), ("bar", ["b"])):
+                subds = Dataset(op.join(ds.path, subdir))
+                for fname, meta in subds.repo.get_metadata(fnames):
+                    assert_dict_equal(meta,
+                                      {"subdir": [subdir], "name": [fname]})
+
+        ds.addurls(self.json_file, "{url}", "{subdir}//{name}", jobs=2)
+        for fname in ["foo/a", "foo/c", "bar/b"]:
+            ok_exists(op.join(ds.path, fname))
+        check_metadata()
+        assert_repo_status(path)
+
+        # existing files are handled as without jobs
+        assert_in_results(
+            ds.addurls(self.json_file, "{url}", "{subdir}//{name}",
+                       ifexists="skip", jobs=2),
+            action="addurls",
+            status="notneeded")
+        # re-adding metadata values does not duplicate them
+        ds.addurls(self.json_file, "{url}", "{subdir}//{name}", jobs=2)
+        check_metadata()
+
     @with_tempfile(mkdir=True)
     def test_addurls_repindex(self, path):
         ds = Dataset(path).create(force=True)
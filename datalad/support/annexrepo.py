@@ -18,6 +18,7 @@ import logging
 import math
 import os
 import re
+import tempfile
 
 from itertools import chain
 from os import linesep
@@ -61,6 +62,7 @@ from datalad.log import log_progress
 from datalad.support.json_py import json_loads
 from datalad.cmd import (
     BatchedCommand,
+    get_batched_command_pool,
     GitRunner,
     GitWitlessRunner,
     # KillOutput,
@@ -79,6 +81,7 @@ from .gitrepo import (
     to_options
 )
 from . import ansi_colors
+from .contentinfo import ContentInfoRecord
 from .external_versions import external_versions
 from .exceptions import (
     CommandNotAvailableError,
@@ -1408,7 +1411,7 @@ class AnnexRepo(GitRepo, RepoInterface):
 
     @normalize_paths
     def add(self, files, git=None, backend=None, options=None, jobs=None,
-            git_options=None, annex_options=None, update=False):
+            git_options=None, annex_options=None, update=False, batch=False):
         """Add file(s) to the repository.
 
         Parameters
@@ -1432,6 +1435,10 @@ class AnnexRepo(GitRepo, RepoInterface):
 
            Note: Used only, if a call to git-add instead of git-annex-add is
            performed
+        batch: bool, optional
+          initiate or continue with a batched run of annex add, instead of
+          just calling a single git annex add command. Paths must be relative
+          to the top of the repository. Ignored if `git` is True.
 
         Returns
         -------
@@ -1440,11 +1447,12 @@ class AnnexRepo(GitRepo, RepoInterface):
 
         return list(self.add_(
             files, git=git, backend=backend, options=options, jobs=jobs,
-            git_options=git_options, annex_options=annex_options, update=update
+            git_options=git_options, annex_options=annex_options,
+            update=update, batch=batch
         ))
 
     def add_(self, files, git=None, backend=None, options=None, jobs=None,
-            git_options=None, annex_options=None, update=False):
+            git_options=None, annex_options=None, update=False, batch=False):
         """Like `add`, but returns a generator"""
         if update and not git:
             raise InsufficientArgumentsError("option 'update' requires 'git', too")
@@ -1459,6 +1467,26 @@ class AnnexRepo(GitRepo, RepoInterface):
 
         options = options[:] if options else []
 
+        if batch and not git:
+            if self.fake_dates_enabled:
+                lgr.debug("Not batching add call "
+                          "because fake dates are enabled")
+            else:
+                if git is False:
+                    options.extend(self._check_version_kludges("force-large"))
+                if backend:
+                    options += ['--backend=%s' % backend]
+                bcmd = self._batched.get(
+                    'add_git:%s_backend:%s' % (git, backend),
+                    annex_cmd='add',
+                    annex_options=options,
+                    path=self.path,
+                    json=True
+                )
+                for r in bcmd(list(files)):
+                    yield r
+                return
+
         # TODO: RM DIRECT? not clear if this code didn't become "generic" and
         #       not only "direct mode" specific, so kept for now.
         # Note: As long as we support direct mode, one should not call
@@ -2030,6 +2058,89 @@ class AnnexRepo(GitRepo, RepoInterface):
                     % (url, str(out_json)))
         return out_json
 
+    def add_urls_to_files_(self, urls_files, options=None, backend=None):
+        """Add many files from URLs to the annex via a batched process
+
+        Like `add_url_to_file(..., batch=True)` for each pair, but requests
+        are sent to the batched `git annex addurl` without awaiting the
+        response to the previous one (see `BatchedCommand.pipeline_()`).
+
+        Parameters
+        ----------
+        urls_files: iterable
+          (url, file) tuples.
+        options: list, optional
+          options to the annex command
+        backend: str, optional
+
+        Yields
+        ------
+        dict
+          JSON record reported by annex for each pair, in order. Failures
+          are reported via a false 'success' property rather than an
+          exception.
+        """
+        if self.fake_dates_enabled:
+            lgr.debug("Not batching addurl calls "
+                      "because fake dates are enabled")
+            for url, file_ in urls_files:
+                try:
+                    yield self.add_url_to_file(
+                        file_, url, options=options, backend=backend)
+                except CommandError as exc:
+                    yield {'command': 'addurl', 'file': file_,
+                           'success': False,
+                           'error-messages': [exc_str(exc)]}
+            return
+
+        options = options[:] if options else []
+        options += ['--with-files']
+        if backend:
+            options += ['--backend=%s' % backend]
+        # same process as used by add_url_to_file()
+        bcmd = self._batched.get(
+            'addurl_to_file_backend:%s' % backend,
+            annex_cmd='addurl',
+            git_options=[],
+            annex_options=options,
+            path=self.path,
+            json=True
+        )
+        try:
+            for out_json in bcmd.pipeline_(urls_files):
+                yield out_json
+        except Exception as exc:
+            raise AnnexBatchCommandError(
+                cmd="addurl",
+                msg="Adding urls failed due to %s" % exc_str(exc))
+
+    def register_urls(self, keys_urls, options=None):
+        """Record that the content of keys can be downloaded from URLs
+
+        All URLs are registered with a single `git annex registerurl` call.
+        A special remote claiming a URL will be marked to have the content
+        of its key.
+
+        Parameters
+        ----------
+        keys_urls: list of tuple
+          (key, url) pairs.
+        options: list, optional
+          options to the annex command
+        """
+        if not keys_urls:
+            return
+        options = options[:] if options else []
+        with tempfile.TemporaryFile() as f:
+            for key, url in keys_urls:
+                f.write(('%s %s\n' % (key, url)).encode('utf-8'))
+            f.seek(0)
+            self._run_annex_command(
+                'registerurl',
+                annex_options=options + ['--batch'],
+                runner="gitwitless",
+                stdin=f)
+
     def add_urls(self, urls, options=None, backend=None, cwd=None,
                  jobs=None,
                  git_options=None, annex_options=None):
@@ -2704,7 +2815,9 @@ class AnnexRepo(GitRepo, RepoInterface):
         since they might still need to flush their changes into index
         """
         if self._batched is not None:
-            self._batched.close()
+            # pooled processes might still serve information from before
+            # the commit, close them too
+            self._batched.close(pooled=True)
         super(AnnexRepo, self).precommit()
 
 
@@ -3262,6 +3375,56 @@ class AnnexRepo(GitRepo, RepoInterface):
                 files=files):
             yield jsn
 
+    def add_metadata_(self, files_metadata):
+        """Add values to the git-annex metadata of many files at once
+
+        Unlike `set_metadata_()`, which applies uniform changes to the given
+        files, each file can receive individual metadata. All files are
+        handled by a single `git annex metadata --batch` process. As the
+        batch mode can only set fields, their present values are queried
+        first, and the values to add are appended to them.
+
+        Parameters
+        ----------
+        files_metadata : iterable
+          (file, dict) tuples. The dicts map metadata keys to a value or a
+          list of values to add. Any file must only be given once.
+
+        Yields
+        ------
+        dict
+          JSON record reported by annex for each file, in order.
+        """
+        files_metadata = list(files_metadata)
+        if not files_metadata:
+            return
+
+        # Make sure that batch add/addurl operations are closed so that we can
+        # operate on files that were just added.
+        self.precommit()
+
+        bcmd = self._batched.get('metadata', json=True, path=self.path)
+        present = list(bcmd.pipeline_(
+            json.dumps({'file': f}) for f, _ in files_metadata))
+
+        def _get_requests():
+            for (f, add), cur in zip(files_metadata, present):
+                if not cur.get('success', False):
+                    continue
+                fields = {}
+                for k, vs in add.items():
+                    values = cur.get('fields', {}).get(k, [])
+                    fields[k] = values + [
+                        v for v in assure_list(vs) if v not in values]
+                yield json.dumps({'file': f, 'fields': fields})
+
+        updated = bcmd.pipeline_(_get_requests())
+        for cur in present:
+            yield next(updated) if cur.get('success', False) else cur
+        # no more responses, but let the pipeline finish
+        for _ in updated:
+            pass
+
     # TODO: RM DIRECT?  might remain useful to detect submods left in direct mode
     @staticmethod
     def _is_annex_work_tree_message(out):
@@ -3272,34 +3435,63 @@ class AnnexRepo(GitRepo, RepoInterface):
             re.MULTILINE | re.DOTALL | re.IGNORECASE)
 
 
+    def _get_objectstore_hashdirs(self, objectstore):
+        """Determine the hash directory layouts in use in an annex object store
+
+        Non-bare repositories use 'hashdirmixed' (two levels of two mixed-case
+        characters), bare repositories use 'hashdirlower' (two levels of
+        three lower-case hex characters). Both can co-exist, e.g. in a
+        repository that was converted. The layout is detected from the names
+        of the top-level directories in the object store.
+
+        Returns
+        -------
+        list
+          Names of the layouts found, in order of expected frequency. Empty
+          if there is no (populated) object store.
+        """
+        found = set()
+        try:
+            with os.scandir(str(objectstore)) as it:
+                for e in it:
+                    if len(e.name) == 2:
+                        found.add('hashdirmixed')
+                    elif len(e.name) == 3:
+                        found.add('hashdirlower')
+                    if len(found) == 2:
+                        break
+        except (FileNotFoundError, NotADirectoryError):
+            pass
+        # test hashdirmixed first, as it is used in non-bare repos
+        # which be a more frequent target
+        return [h for h in ('hashdirmixed', 'hashdirlower') if h in found]
+
     def _mark_content_availability(self, info):
         objectstore = self.pathobj.joinpath(
             self.path, GitRepo.get_git_dir(self), 'annex', 'objects')
+        hashdirs = None
+        objectstore_str = str(objectstore)
         for f, r in info.items():
             if 'key' not in r or 'has_content' in r:
                 # not annexed or already processed
                 continue
-            # test hashdirmixed first, as it is used in non-bare repos
-            # which be a more frequent target
-            # TODO optimize order based on some check that reveals
-            # what scheme is used in a given annex
+            if hashdirs is None:
+                # determine only once, and only if there is anything to test
+                hashdirs = self._get_objectstore_hashdirs(objectstore)
             r['has_content'] = False
             key = r['key']
-            for testpath in (
-                    # ATM git-annex reports hashdir in native path
-                    # conventions and the actual file path `f` in
-                    # POSIX, weired...
-                    # we need to test for the actual key file, not
-                    # just the containing dir, as on windows the latter
-                    # may not always get cleaned up on `drop`
-                    objectstore.joinpath(
-                        ut.Path(r['hashdirmixed']), key, key),
-                    objectstore.joinpath(
-                        ut.Path(r['hashdirlower']), key, key)):
-                if testpath.exists():
+            for hashdir in hashdirs:
+                # ATM git-annex reports hashdir in native path
+                # conventions and the actual file path `f` in
+                # POSIX, weired...
+                # we need to test for the actual key file, not
+                # just the containing dir, as on windows the latter
+                # may not always get cleaned up on `drop`
+                testpath = opj(objectstore_str, r[hashdir], key, key)
+                if exists(testpath):
                     r.pop('hashdirlower', None)
                     r.pop('hashdirmixed', None)
-                    r['objloc'] = str(testpath)
+                    r['objloc'] = testpath
                     r['has_content'] = True
                     break
 
@@ -3373,6 +3565,7 @@ class AnnexRepo(GitRepo, RepoInterface):
             else:
                 opts.extend(['--include', '*'])
 
+        got_records = False
         for j in self._run_annex_command_json(cmd, opts=opts, files=files):
             path = self.pathobj.joinpath(ut.PurePosixPath(j['file']))
             rec = info.get(path, None)
@@ -3380,7 +3573,7 @@ class AnnexRepo(GitRepo, RepoInterface):
                 if init is not None:
                     # init constraint knows nothing about this path -> skip
                     continue
-                rec = {}
+                rec = ContentInfoRecord()
             rec.update({'{}{}'.format(key_prefix, k): j[k]
                        for k in j if k != 'file'})
             if 'bytesize' in rec:
@@ -3401,10 +3594,9 @@ class AnnexRepo(GitRepo, RepoInterface):
                     # of None/NaN etc.
                     del rec['bytesize']
             info[path] = rec
-            # TODO make annex availability checks optional and move in here
-            if not eval_availability:
-                # not desired, or not annexed
-                continue
+            got_records = True
+        if eval_availability and got_records:
+            # a single pass over all records, rather than one per record
             self._mark_content_availability(info)
         return info
 
@@ -3721,10 +3913,27 @@ class AnnexInitOutput(WitlessProtocol):
 class BatchedAnnexes(SafeDelCloseMixin, dict):
     """Class to contain the registry of active batch'ed instances of annex for
     a repository
+
+    Processes of read-only annex commands are obtained from the session-wide
+    pool of batched processes (see `get_batched_command_pool()`), and are
+    shared with other instances for the same repository path. Only the
+    remaining ones are kept in this registry.
     """
+    # annex commands which only query information, and whose processes can
+    # be shared
+    _POOLED_ANNEX_COMMANDS = {
+        'checkpresentkey',
+        'contentlocation',
+        'find',
+        'info',
+        'lookupkey',
+    }
+
     def __init__(self, batch_size=0, git_options=None):
         self.batch_size = batch_size
         self.git_options = git_options or []
+        # repository paths of the pooled processes that were requested
+        self._pooled_paths = set()
         super(BatchedAnnexes, self).__init__()
 
     def get(self, codename, annex_cmd=None, **kwargs):
@@ -3747,6 +3956,17 @@ class BatchedAnnexes(SafeDelCloseMixin, dict):
             codename += ':{0}:{1}'.format(key, options[key])
         # END RF/BF
 
+        path = kwargs.get('path')
+        pool = get_batched_command_pool() \
+            if path and self._is_pooled(annex_cmd) else None
+        if pool is not None:
+            self._pooled_paths.add(path)
+            return pool.get(
+                ('annex', path, codename),
+                lambda: BatchedAnnex(annex_cmd,
+                                     git_options=git_options,
+                                     **kwargs))
+
         if codename not in self:
             # Create a new git-annex process we will keep around
             self[codename] = BatchedAnnex(annex_cmd,
@@ -3754,19 +3974,35 @@ class BatchedAnnexes(SafeDelCloseMixin, dict):
                                           **kwargs)
         return self[codename]
 
+    def _is_pooled(self, annex_cmd):
+        name = annex_cmd[0] if isinstance(annex_cmd, list) else annex_cmd
+        return name in self._POOLED_ANNEX_COMMANDS
+
     def clear(self):
         """Override just to make sure we don't rely on __del__ to close all
         the pipes"""
         self.close()
         super(BatchedAnnexes, self).clear()
 
-    def close(self):
+    def close(self, pooled=False):
         """Close communication to all the batched annexes
 
         It does not remove them from the dictionary though
+
+        Parameters
+        ----------
+        pooled : bool, optional
+          If True, also close the pooled processes for the repositories of
+          this registry. Otherwise they are left for reuse.
         """
         for p in self.values():
             p.close()
+        if pooled and self._pooled_paths:
+            pool = get_batched_command_pool()
+            if pool is not None:
+                paths = self._pooled_paths
+                pool.close(
+                    match=lambda key: key[0] == 'annex' and key[1] in paths)
 
 
 def readlines_until_ok_or_failed(stdout, maxlines=100):
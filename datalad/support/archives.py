@@ -11,8 +11,14 @@
 """
 
 import hashlib
+import json
 import os
+import posixpath
+import shutil
+import tarfile
 import tempfile
+import time
+import zipfile
 from urllib.parse import unquote as urlunquote
 import string
 import random
@@ -114,6 +120,33 @@ def _get_cached_filename(archive):
     return archive_cached
 
 
+def _normalize_member_name(name):
+    """Normalize the name of an archive member to its path when extracted"""
+    return posixpath.normpath(name.replace('\\', '/')).lstrip('/')
+
+
+def _copy_range(src, dst, size, blocksize=1 << 20):
+    """Copy `size` bytes from the current position of file object `src`"""
+    while size:
+        block = src.read(min(blocksize, size))
+        if not block:
+            raise IOError("Unexpected end of file, %i bytes missing" % size)
+        dst.write(block)
+        size -= len(block)
+
+
+def _get_tree_size(path):
+    """Return the total size of all files underneath a directory"""
+    size = 0
+    for root, dirs, files in os.walk(path):
+        for f in files:
+            try:
+                size += os.lstat(opj(root, f)).st_size
+            except OSError:
+                pass
+    return size
+
+
 def _get_random_id(size=6, chars=string.ascii_uppercase + string.digits):
     """Return a random ID composed from digits and uppercase letters
 
@@ -125,6 +158,13 @@ def _get_random_id(size=6, chars=string.ascii_uppercase + string.digits):
 class ArchivesCache(object):
     """Cache to maintain extracted archives
 
+    A persistent cache is kept across sessions. The total size of the
+    extracted archives can be limited via 'datalad.runtime.archives-cache-size'.
+    Whenever an archive was extracted and the limit is exceeded, the least
+    recently used extracted archives are removed, unless they were accessed
+    within the last `eviction_grace` seconds, since their files might still
+    be about to be read.
+
     Parameters
     ----------
     toppath : str
@@ -132,11 +172,15 @@ class ArchivesCache(object):
       If not provided -- random tempdir is used
     persistent : bool, optional
       Passed over into generated ExtractedArchives
+    max_size : int, optional
+      Maximum total size (in bytes) of the extracted archives. If None,
+      the configured limit is used. 0 means no limit.
     """
-    # TODO: make caching persistent across sessions/runs, with cleanup
     # IDEA: extract under .git/annex/tmp so later on annex unused could clean it
     #       all up
-    def __init__(self, toppath=None, persistent=False):
+    eviction_grace = 300
+
+    def __init__(self, toppath=None, persistent=False, max_size=None):
 
         self._toppath = toppath
         if toppath:
@@ -152,6 +196,12 @@ class ArchivesCache(object):
             path = tempfile.mktemp(**get_tempfile_kwargs())
         self._path = path
         self.persistent = persistent
+        if max_size is None:
+            max_size = cfg.obtain('datalad.runtime.archives-cache-size') \
+                * 1024 * 1024
+        self.max_size = max_size
+        # usage statistics of this session
+        self.stats = dict(hits=0, misses=0, evictions=0, evicted_bytes=0)
         # TODO?  ensure that it is absent or we should allow for it to persist a bit?
         #if exists(path):
         #    self._clean_cache()
@@ -212,10 +262,137 @@ class ArchivesCache(object):
             self._archives[archive] = \
                 ExtractedArchive(archive,
                                  opj(self.path, _get_cached_filename(archive)),
-                                 persistent=self.persistent)
+                                 persistent=self.persistent,
+                                 cache=self)
 
         return self._archives[archive]
 
+    def _get_entries(self):
+        """Return all extracted archives in the cache
+
+        Returns
+        -------
+        list
+          Tuples of path, size, and time of last access of each extracted
+          archive, least recently used first.
+        """
+        suffix = ExtractedArchive.STAMP_SUFFIX
+        entries = []
+        try:
+            stamps = [e for e in os.scandir(self.path)
+                      if e.name.endswith(suffix)]
+        except OSError:
+            return entries
+        for stamp in stamps:
+            epath = stamp.path[:-len(suffix)]
+            try:
+                atime = stamp.stat().st_mtime
+            except OSError:
+                continue
+            size = ExtractedArchive.read_stamp(stamp.path)[1]
+            if size is None:
+                # stamp from before sizes were recorded
+                size = _get_tree_size(epath)
+            entries.append((epath, size, atime))
+        return sorted(entries, key=lambda e: e[2])
+
+    def get_stats(self):
+        """Return statistics of the cache
+
+        Returns
+        -------
+        dict
+          'entries' and 'size' (in bytes) of the extracted archives in the
+          cache, the configured 'max_size', and the number of cache 'hits',
+          'misses', and 'evictions' (and the 'evicted_bytes') in this session.
+        """
+        entries = self._get_entries()
+        return dict(
+            self.stats,
+            entries=len(entries),
+            size=sum(e[1] for e in entries),
+            max_size=self.max_size,
+        )
+
+    def prune(self, keep=None):
+        """Remove least recently used extracted archives exceeding the size limit
+
+        Extracted archives that are locked for extraction by another process,
+        or that were accessed within the last `eviction_grace` seconds are
+        left alone.
+
+        Parameters
+        ----------
+        keep : str, optional
+          Path of an extracted archive that must not be removed (e.g. the
+          one just extracted).
+        """
+        if not self.max_size:
+            return
+        entries = self._get_entries()
+        total = sum(e[1] for e in entries)
+        now = time.time()
+        for epath, size, atime in entries:
+            if total <= self.max_size:
+                break
+            if epath == keep or now - atime < self.eviction_grace:
+                continue
+            with lock_if_check_fails(
+                check=False,
+                lock_path=epath,
+                operation="extract",
+                blocking=False,
+            ) as (check, lock):
+                if not lock.acquired:
+                    lgr.debug("Not removing %s from cache, it is in use",
+                              epath)
+                    continue
+                if not self._evict(epath):
+                    lgr.debug("Not removing %s from cache, it was just used",
+                              epath)
+                    continue
+                lgr.debug("Removed least recently used %s (%i bytes) from "
+                          "archives cache", epath, size)
+            total -= size
+            self.stats['evictions'] += 1
+            self.stats['evicted_bytes'] += size
+
+    def _evict(self, epath):
+        """Remove an extracted archive, unless it was accessed recently
+
+        Readers do not lock an extracted archive, but refresh its stamp upon
+        access. The stamp is moved away first, so a reader either refreshed it
+        before, which is detected here, or fails to refresh it and extracts
+        the archive again (see `ExtractedArchive.assure_extracted`).
+
+        Returns
+        -------
+        bool
+          Whether the extracted archive was removed.
+        """
+        stamp = epath + ExtractedArchive.STAMP_SUFFIX
+        evicted_stamp = stamp + '.evicted'
+        try:
+            os.rename(stamp, evicted_stamp)
+        except OSError:
+            return False
+        if time.time() - os.stat(evicted_stamp).st_mtime \
+                < self.eviction_grace:
+            os.rename(evicted_stamp, stamp)
+            return False
+        if os.path.lexists(epath):
+            # files that are still open remain readable
+            evicted = epath + '.evicted-' + _get_random_id()
+            os.rename(epath, evicted)
+            try:
+                rmtree(evicted)
+            except OSError as e:
+                lgr.warning("Failed to remove %s: %s", evicted, e)
+        for p in (evicted_stamp, epath + ExtractedArchive.INDEX_SUFFIX):
+            if os.path.lexists(p):
+                unlink(p)
+        return True
+
     def __getitem__(self, archive):
         return self.get_archive(archive)
 
@@ -239,9 +416,13 @@ class ExtractedArchive(object):
 
     # suffix to use for a stamp so we could guarantee that extracted archive is
     STAMP_SUFFIX = '.stamp'
+    # suffix to use for the index of member offsets in an uncompressed tarball
+    INDEX_SUFFIX = '.index'
 
-    def __init__(self, archive, path=None, persistent=False):
+    def __init__(self, archive, path=None, persistent=False, cache=None):
         self._archive = archive
+        # ArchivesCache this archive is extracted into, if any
+        self._cache = cache
         # TODO: bad location for extracted archive -- use tempfile
         if not path:
             path = tempfile.mktemp(**get_tempfile_kwargs(prefix=_get_cached_filename(archive)))
@@ -264,7 +445,8 @@ class ExtractedArchive(object):
 
         for path, name in [
             (self._path, 'cache'),
-            (self.stamp_path, 'stamp file')
+            (self.stamp_path, 'stamp file'),
+            (self.index_path, 'member index'),
         ]:
             if exists(path):
                 if (not self._persistent) or force:
@@ -283,6 +465,10 @@ class ExtractedArchive(object):
     def stamp_path(self):
         return self._path + self.STAMP_SUFFIX
 
+    @property
+    def index_path(self):
+        return self._path + self.INDEX_SUFFIX
+
     @property
     def is_extracted(self):
         return exists(self.path) and exists(self.stamp_path) \
@@ -301,8 +487,42 @@ class ExtractedArchive(object):
             if lock:
                 assert not check
                 self._extract_archive(path)
+        if not lock:
+            # record the access, the stamp is never older than the
+            # extracted archive
+            try:
+                os.utime(self.stamp_path)
+            except OSError:
+                # the stamp was moved away to remove the extracted archive
+                # from the cache, see ArchivesCache._evict
+                lgr.debug("%s is being removed from the cache, extracting "
+                          "it again", path)
+                return self.assure_extracted()
+        if self._cache is not None:
+            self._cache.stats['misses' if lock else 'hits'] += 1
+            if lock:
+                self._cache.prune(keep=path)
         return path
 
+    @staticmethod
+    def read_stamp(stamp_path):
+        """Return the archive path and the extracted size recorded in a stamp
+
+        Returns
+        -------
+        str or None, int or None
+        """
+        try:
+            with open(stamp_path, 'rb') as f:
+                lines = ensure_unicode(f.read()).split('\n')
+        except OSError:
+            return None, None
+        try:
+            size = int(lines[1])
+        except (IndexError, ValueError):
+            size = None
+        return lines[0], size
+
     def _extract_archive(self, path):
         # we need to extract the archive
         # TODO: extract to _tmp and then move in a single command so we
@@ -325,12 +545,141 @@ class ExtractedArchive(object):
         # lgr.debug("Adjusting permissions to R/O for the extracted content")
         # rotree(path)
         assert (exists(path))
-        # create a stamp
+        # create a stamp, recording the size of the extracted archive
         with open(self.stamp_path, 'wb') as f:
-            f.write(ensure_bytes(self._archive))
+            f.write(ensure_bytes(
+                '%s\n%i' % (self._archive, _get_tree_size(path))))
         # assert that stamp mtime is not older than archive's directory
         assert (self.is_extracted)
 
+    def extract_member(self, afile, target):
+        """Extract a single file from the archive, without extracting the rest
+
+        This is supported for ZIP archives and uncompressed tarballs, whose
+        members can be accessed directly. For compressed tarballs, the
+        archive is decompressed as a stream until the member is found, if
+        configured via 'datalad.runtime.archive-member-extraction'.
+        Nothing is done, if the archive was fully extracted already.
+
+        Parameters
+        ----------
+        afile : str
+          Path of the file within the archive (as in the extracted archive).
+        target : str
+          Path to write the file content to.
+
+        Returns
+        -------
+        bool
+          True if the file was extracted, False if the archive must be
+          fully extracted to get to it.
+        """
+        mode = cfg.obtain('datalad.runtime.archive-member-extraction')
+        if mode == 'never' or self.is_extracted:
+            return False
+        name = _normalize_member_name(urlunquote(afile))
+        try:
+            if zipfile.is_zipfile(self._archive):
+                done = self._extract_zip_member(name, target)
+            else:
+                done = self._extract_tar_member(
+                    name, target, stream=mode == 'always')
+        except Exception as e:
+            lgr.debug("Failed to extract %s from %s directly: %s",
+                      afile, self._archive, e)
+            if exists(target):
+                # do not leave anything incomplete behind
+                unlink(target)
+            done = False
+        if done:
+            lgr.debug("Extracted %s from %s directly", afile, self._archive)
+        return done
+
+    def _extract_zip_member(self, name, target):
+        with zipfile.ZipFile(self._archive) as zf:
+            info = None
+            for i in zf.infolist():
+                if not i.is_dir() and _normalize_member_name(i.filename) == name:
+                    info = i
+            if info is None:
+                return False
+            with zf.open(info) as src, open(target, 'wb') as dst:
+                shutil.copyfileobj(src, dst, 1 << 20)
+        return True
+
+    def _extract_tar_member(self, name, target, stream=False):
+        try:
+            # only succeeds for uncompressed tarballs
+            members = self._get_tar_index()
+        except tarfile.ReadError:
+            members = None
+        if members is not None:
+            if name not in members:
+                return False
+            offset, size = members[name]
+            with open(self._archive, 'rb') as src, open(target, 'wb') as dst:
+                src.seek(offset)
+                _copy_range(src, dst, size)
+            return True
+        if not stream:
+            # compressed archive, extracting all is cheaper when more
+            # than a single member is needed
+            return False
+        with tarfile.open(self._archive, 'r|*') as tf:
+            for ti in tf:
+                if ti.isreg() and _normalize_member_name(ti.name) == name:
+                    with open(target, 'wb') as dst:
+                        shutil.copyfileobj(tf.extractfile(ti), dst, 1 << 20)
+                    return True
+        return False
+
+    def _get_tar_index(self):
+        """Return offsets and sizes of all regular files in an uncompressed tarball
+
+        The index is cached in a file next to the location of the extracted
+        archive.
+
+        Returns
+        -------
+        dict
+          Mapping of normalized member names to lists of offset and size.
+
+        Raises
+        ------
+        tarfile.ReadError
+          If the archive is not an uncompressed tarball.
+        """
+        st = os.stat(self._archive)
+        stamp = [st.st_size, st.st_mtime_ns]
+        try:
+            with open(self.index_path) as f:
+                index = json.load(f)
+            if index.get('stamp') == stamp:
+                return index['members']
+        except (OSError, ValueError, KeyError):
+            pass
+        members = {}
+        # reading the headers skips over member content
+        with tarfile.open(self._archive, 'r:') as tf:
+            for ti in tf:
+                # sparse files are not stored contiguously
+                if ti.isreg() and not ti.issparse():
+                    members[_normalize_member_name(ti.name)] = \
+                        [ti.offset_data, ti.size]
+        lgr.debug("Indexed %i members of %s", len(members), self._archive)
+        try:
+            index_dir = os.path.dirname(self.index_path)
+            if not exists(index_dir):
+                os.makedirs(index_dir)
+            fd, tmp = tempfile.mkstemp(dir=index_dir, prefix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(dict(stamp=stamp, members=members), f)
+            os.replace(tmp, self.index_path)
+        except OSError as e:
+            lgr.debug("Failed to store member index of %s: %s",
+                      self._archive, e)
+        return members
+
     # TODO: remove?
     #def has_file_ready(self, afile):
     #    lgr.debug(u"Checking file {afile} from archive {archive}".format(**locals()))
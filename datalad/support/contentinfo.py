@@ -0,0 +1,94 @@
+# emacs: -*- mode: python; py-indent-offset: 4; tab-width: 4; indent-tabs-mode: nil -*-
+# ex: set sts=4 ts=4 sw=4 noet:
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+#
+#   See COPYING file distributed along with the datalad package for the
+#   copyright and license terms.
+#
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+"""Compact record type for content information of repositories"""
+
+try:
+    from collections.abc import MutableMapping
+except ImportError:  # Python <= 3.3
+    from collections import MutableMapping
+
+
+class ContentInfoRecord(MutableMapping):
+    """Dict-like record of properties of a single content item
+
+    Produced by `GitRepo.get_content_info()`, `GitRepo.diffstatus()`,
+    and `AnnexRepo.get_content_annexinfo()` for each reported path.
+    Properties that are commonly reported are stored in slots, which takes a
+    fraction of the memory of a dict. Any other property is stored in an
+    additional dict that is only created on demand.
+
+    A record behaves like a dict: unset properties are absent (not None),
+    and `dict(record)` yields a plain dict with all properties.
+    """
+
+    # properties reported by Git queries, diffstatus(), and
+    # `git annex find --json` (plus availability info)
+    _FIELDS = (
+        'type', 'gitshasum', 'prev_gitshasum', 'state', 'bytesize',
+        'key', 'backend', 'keyname', 'humansize', 'mtime',
+        'hashdirlower', 'hashdirmixed', 'has_content', 'objloc',
+    )
+    _FIELDSET = frozenset(_FIELDS)
+
+    __slots__ = _FIELDS + ('_extra',)
+
+    def __init__(self, *args, **kwargs):
+        self._extra = None
+        if args or kwargs:
+            self.update(*args, **kwargs)
+
+    def __getitem__(self, key):
+        if key in self._FIELDSET:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key)
+        if self._extra is None:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def __setitem__(self, key, value):
+        if key in self._FIELDSET:
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        if key in self._FIELDSET:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key)
+        elif self._extra is None:
+            raise KeyError(key)
+        else:
+            del self._extra[key]
+
+    def __contains__(self, key):
+        if key in self._FIELDSET:
+            return hasattr(self, key)
+        return self._extra is not None and key in self._extra
+
+    def __iter__(self):
+        for f in self._FIELDS:
+            if hasattr(self, f):
+                yield f
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return '{}({!r})'.format(self.__class__.__name__, dict(self))
+
+    def copy(self):
+        return self.__class__(self)
@@ -0,0 +1,185 @@
+# emacs: -*- mode: python; py-indent-offset: 4; tab-width: 4; indent-tabs-mode: nil -*-
+# ex: set sts=4 ts=4 sw=4 noet:
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+#
+#   See COPYING file distributed along with the datalad package for the
+#   copyright and license terms.
+#
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+"""Persistent on-disk cache for parsed Git content listings
+
+Listings of `git ls-tree` are cached by the tree they describe, which is
+immutable. Listings of `git ls-files --stage` are cached together with a
+stamp of the Git index file, and are invalidated whenever the index changes.
+Listings are stored as compact JSON records, not as raw Git output, to spare
+parsing on retrieval.
+Cache files are placed under `.git/datalad/cache/content-info` of a
+repository.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import os.path as op
+import tempfile
+import zlib
+
+from datalad.support.exceptions import CommandError
+
+lgr = logging.getLogger('datalad.support.contentinfo_cache')
+
+# bump when the format of cache files changes
+_CACHE_VERSION = 2
+
+
+class ContentInfoCache(object):
+    """Cache of parsed Git content listings of a single repository
+
+    Cache entries are identified by a key (any JSON-serializable value), and
+    carry a stamp that must match on retrieval for the entry to be valid.
+    Values must be JSON-serializable, tuples are retrieved as lists.
+    """
+
+    # maximum number of cache files kept per repository, least recently
+    # used ones are removed first
+    max_entries = 20
+
+    def __init__(self, repo):
+        """
+        Parameters
+        ----------
+        repo : GitRepo
+        """
+        self.repo = repo
+        self.path = op.join(str(repo.dot_git), 'datalad', 'cache',
+                            'content-info')
+
+    def _get_fname(self, key):
+        return op.join(
+            self.path,
+            hashlib.sha1(
+                json.dumps(key, sort_keys=True).encode()).hexdigest())
+
+    def get_index_stamp(self):
+        """Return a stamp identifying the current state of the Git index
+
+        Git replaces the index file whenever it changes, so a modification
+        is reflected in its inode, size, or modification time.
+
+        Returns
+        -------
+        list or None
+          None, if there is no index.
+        """
+        try:
+            st = os.stat(str(self.repo.dot_git / 'index'))
+        except FileNotFoundError:
+            return None
+        return [st.st_ino, st.st_size, st.st_mtime_ns]
+
+    def get_tree_sha(self, ref):
+        """Resolve a Git reference to the sha of the tree it points to
+
+        Returns
+        -------
+        str or None
+          None, if the reference cannot be resolved.
+        """
+        try:
+            return self.repo.call_git(
+                ['rev-parse', '--verify', '--quiet', '{}^{{tree}}'.format(ref)],
+                expect_fail=True).strip() or None
+        except CommandError:
+            return None
+
+    def get(self, key, stamp=None):
+        """Return the cached value for a key, or None
+
+        Parameters
+        ----------
+        key
+          Cache key.
+        stamp
+          Must be identical to the stamp the value was stored with.
+
+        Returns
+        -------
+        object or None
+        """
+        fname = self._get_fname(key)
+        try:
+            with open(fname, 'rb') as f:
+                content = zlib.decompress(f.read())
+        except FileNotFoundError:
+            return None
+        except (OSError, zlib.error) as e:
+            lgr.debug('Ignoring unreadable content info cache %s: %s',
+                      fname, e)
+            return None
+        header, _, value = content.partition(b'\n')
+        try:
+            header = json.loads(header.decode())
+        except ValueError:
+            return None
+        if header.get('version') != _CACHE_VERSION \
+                or header.get('key') != key \
+                or header.get('stamp') != stamp:
+            return None
+        try:
+            value = json.loads(value.decode('utf-8'))
+        except ValueError:
+            return None
+        # mark as recently used
+        try:
+            os.utime(fname)
+        except OSError:
+            pass
+        lgr.debug('Using cached content info from %s', fname)
+        return value
+
+    def set(self, key, value, stamp=None):
+        """Store a value in the cache
+
+        Parameters
+        ----------
+        key
+          Cache key.
+        value
+          JSON-serializable value to cache.
+        stamp
+          JSON-serializable stamp, needed to retrieve the value again.
+        """
+        header = json.dumps(
+            dict(version=_CACHE_VERSION, key=key, stamp=stamp)).encode()
+        fname = self._get_fname(key)
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            # write to a temporary file and move into place, to never expose
+            # an incomplete file to concurrent readers
+            fd, tmpname = tempfile.mkstemp(dir=self.path, prefix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(zlib.compress(
+                    header + b'\n' + json.dumps(
+                        value, separators=(',', ':')).encode('utf-8'),
+                    1))
+            os.replace(tmpname, fname)
+        except OSError as e:
+            lgr.debug('Failed to write content info cache %s: %s', fname, e)
+            return
+        self._prune()
+
+    def _prune(self):
+        try:
+            entries = [e for e in os.scandir(self.path)
+                       if not e.name.startswith('.tmp')]
+        except OSError:
+            return
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+        for e in entries[self.max_entries:]:
+            try:
+                os.unlink(e.path)
+            except OSError:
+                pass
@@ -9,8 +9,11 @@
 """Management of cookies for HTTP sessions"""
 
 import atexit
+import dbm
 import shelve
 import pickle
+import sqlite3
+import threading
 import appdirs
 import os.path
 
@@ -20,24 +23,140 @@ from datalad.dochelpers import exc_str
 import logging
 lgr = logging.getLogger('datalad.cookies')
 
+# file systems on which SQLite must not use WAL mode, its shared memory
+# index does not work across hosts
+NETWORK_FSTYPES = {
+    'nfs', 'nfs4', 'cifs', 'smb3', 'smbfs', 'afs', 'ceph', 'glusterfs',
+    'lustre', 'gpfs', 'beegfs', '9p', 'fuse.sshfs', 'fuse.glusterfs',
+    'fuse.ceph-fuse',
+}
+
+
+def _get_fstype(path):
+    """Return the type of the file system `path` is on, or None if unknown
+
+    Only implemented for Linux.
+    """
+    path = os.path.realpath(path)
+    fstype = None
+    mountpoint = ''
+    try:
+        with open('/proc/self/mounts') as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) < 3:
+                    continue
+                # white space in mount points is octal-escaped
+                mnt = fields[1].replace('\\040', ' ')
+                if len(mnt) >= len(mountpoint) and (
+                        path == mnt or
+                        path.startswith(mnt.rstrip(os.sep) + os.sep)):
+                    mountpoint, fstype = mnt, fields[2]
+    except (IOError, OSError):
+        return None
+    return fstype
+
+
+class SQLiteStore(object):
+    """Persistent mapping from str keys to picklable values in an SQLite DB
+
+    The database can be shared among threads and processes.  Values are
+    cached in memory until another connection modifies the database.
+    Values are not written back when modified in place, so they have to be
+    assigned again.
+
+    Parameters
+    ----------
+    filename : str
+    timeout : float
+      Seconds to wait for a lock held by another connection.
+    journal_mode : str or None
+      SQLite journal mode.  By default, WAL is used, unless the database is
+      on a network file system (as far as this can be determined), which
+      could be shared among hosts.
+    """
+    def __init__(self, filename, timeout=60, journal_mode=None):
+        if not os.path.exists(filename):
+            # keep values, such as authentication cookies, private
+            os.close(os.open(filename, os.O_CREAT | os.O_WRONLY, 0o600))
+        self._lock = threading.Lock()
+        self._cache = {}
+        self._data_version = None
+        self._conn = sqlite3.connect(
+            filename, timeout=timeout, isolation_level=None,
+            check_same_thread=False)
+        if journal_mode is None:
+            # SQLite happily switches to WAL on e.g. NFS, but its locking
+            # is only safe among processes on the same host there
+            journal_mode = 'DELETE' \
+                if _get_fstype(filename) in NETWORK_FSTYPES else 'WAL'
+        self._conn.execute("PRAGMA journal_mode=%s" % journal_mode)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS store "
+            "(key TEXT PRIMARY KEY, value BLOB NOT NULL)")
+
+    def _sync(self):
+        # data_version changes only if another connection committed a change
+        version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        if version != self._data_version:
+            self._cache.clear()
+            self._data_version = version
+
+    def __getitem__(self, key):
+        with self._lock:
+            self._sync()
+            if key in self._cache:
+                return self._cache[key]
+            row = self._conn.execute(
+                "SELECT value FROM store WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                raise KeyError(key)
+            value = self._cache[key] = pickle.loads(row[0])
+            return value
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO store (key, value) VALUES (?, ?)",
+                (key, pickle.dumps(value, protocol=2)))
+            self._cache[key] = value
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self):
+        with self._lock:
+            keys = [r[0] for r in self._conn.execute("SELECT key FROM store")]
+        return iter(keys)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
 
 # FIXME should make into a decorator so that it closes the cookie_db upon exiting whatever func uses it
 class CookiesDB(object):
     """Some little helper to deal with cookies
 
-    Lazy loading from the shelved dictionary
-
-    TODO: this is not multiprocess or multi-thread safe implementation due to shelve auto saving etc
+    Lazy loading from an `SQLiteStore`, so that multiple threads and
+    processes (e.g. parallel downloads or special remotes) can share the
+    cookies of authenticated sessions.
     """
     def __init__(self, filename=None):
         self._filename = filename
         self._cookies_db = None
+        self._lock = threading.Lock()
         atexit.register(self.close)
 
     @property
     def cookies_db(self):
         if self._cookies_db is None:
-            self._load()
+            with self._lock:
+                self._load()
         return self._cookies_db
 
     def _load(self):
@@ -50,35 +169,39 @@ class CookiesDB(object):
             cookies_dir = os.path.join(appdirs.user_config_dir(), 'datalad')  # FIXME prolly shouldn't hardcode 'datalad'
             filename = os.path.join(cookies_dir, 'cookies')
 
-        # TODO: guarantee restricted permissions
-
         if not os.path.exists(cookies_dir):
             os.makedirs(cookies_dir)
 
-        lgr.debug("Opening cookies DB %s", filename)
+        db_filename = filename + '.sqlite'
+        lgr.debug("Opening cookies DB %s", db_filename)
+        try:
+            is_new = not os.path.exists(db_filename)
+            cookies_db = SQLiteStore(db_filename)
+            if is_new:
+                self._import_shelve(cookies_db, filename)
+            self._cookies_db = cookies_db
+        except Exception as exc:
+            lgr.warning("Failed to open cookies DB %s: %s", db_filename, exc_str(exc))
+
+    @staticmethod
+    def _import_shelve(cookies_db, filename):
+        """Copy cookies from the shelve used by previous versions"""
+        if not dbm.whichdb(filename):
+            return
         try:
-            self._cookies_db = shelve.open(filename, writeback=True, protocol=2)
+            with shelve.open(filename, flag='r', protocol=2) as old_db:
+                for provider in old_db:
+                    cookies_db[provider] = old_db[provider]
         except Exception as exc:
-            lgr.warning("Failed to open cookies DB %s: %s", filename, exc_str(exc))
+            lgr.debug("Failed to import cookies from %s: %s", filename, exc_str(exc))
 
     def close(self):
         if self._cookies_db is not None:
-            try:
-                # It might print out traceback right on the terminal instead of
-                # just throwing an exception
-                known_cookies = list(self._cookies_db)
-            except:
-                # May be already not accessible
-                known_cookies = None
             try:
                 self._cookies_db.close()
             except Exception as exc:
-                if known_cookies:
-                    lgr.warning(
-                        "Failed to save possibly updated %d cookies (%s): %s",
-                        len(known_cookies), ', '.join(known_cookies),
-                        exc_str(exc))
-            # no cookies - no worries!
+                # cookies were saved when set, nothing is lost
+                lgr.debug("Failed to close cookies DB: %s", exc_str(exc))
             self._cookies_db = None
 
     def _get_provider(self, url):
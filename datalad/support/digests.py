@@ -10,8 +10,13 @@
 """
 
 import hashlib
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 from ..utils import auto_repr
+from ..log import log_progress
 
 import logging
 lgr = logging.getLogger('datalad.support.digests')
@@ -25,11 +30,15 @@ class Digester(object):
     # Loosely based on snippet by PM 2Ring 2014.10.23
     # http://unix.stackexchange.com/a/163769/55543
 
-    # Ideally we should find an efficient way to parallelize this but
-    # atm this one is sufficiently speedy
-
     DEFAULT_DIGESTS = ['md5', 'sha1', 'sha256', 'sha512']
 
+    # files of at least this size get their digests computed in parallel
+    # threads (hashlib releases the GIL while hashing large buffers), for
+    # smaller ones the overhead is not worth it
+    PARALLEL_MIN_SIZE = 1 << 22
+    # block size for parallel digest computation
+    PARALLEL_BLOCKSIZE = 1 << 20
+
     def __init__(self, digests=None, blocksize=1 << 16):
         """
         Parameters
@@ -44,6 +53,8 @@ class Digester(object):
         self._digests = digests or self.DEFAULT_DIGESTS
         self._digest_funcs = [getattr(hashlib, digest) for digest in self._digests]
         self.blocksize = blocksize
+        # read buffers, reused across files by each thread
+        self._buffers = threading.local()
 
     @property
     def digests(self):
@@ -60,12 +71,129 @@ class Digester(object):
           Keys are algorithm labels, and values are checksum strings
         """
         lgr.debug("Estimating digests for %s" % fpath)
+        if len(self._digest_funcs) > 1 and (os.cpu_count() or 1) > 1 and \
+                os.stat(fpath).st_size >= self.PARALLEL_MIN_SIZE:
+            return self._digest_parallel(fpath)
+        return self._digest(fpath)
+
+    def _get_buffer(self):
+        buf = getattr(self._buffers, 'buf', None)
+        if buf is None or len(buf) != self.blocksize:
+            buf = self._buffers.buf = bytearray(self.blocksize)
+        return buf
+
+    def _digest(self, fpath):
+        """Compute all digests in the calling thread"""
         digests = [x() for x in self._digest_funcs]
-        with open(fpath, 'rb') as f:
+        buf = self._get_buffer()
+        with open(fpath, 'rb', buffering=0) as f, memoryview(buf) as view:
             while True:
-                block = f.read(self.blocksize)
-                if not block:
+                n = f.readinto(buf)
+                if not n:
                     break
-                [d.update(block) for d in digests]
+                block = view[:n]
+                for d in digests:
+                    d.update(block)
+        return {n: d.hexdigest() for n, d in zip(self.digests, digests)}
 
+    def _digest_parallel(self, fpath):
+        """Compute each digest in a separate thread
+
+        The next block is read while the previous one is being hashed.
+        """
+        digests = [x() for x in self._digest_funcs]
+        blocksize = max(self.blocksize, self.PARALLEL_BLOCKSIZE)
+        # the block in one buffer is hashed, while the next block is read
+        # into the other one
+        bufs = [bytearray(blocksize), bytearray(blocksize)]
+        pending = []
+        with ThreadPoolExecutor(max_workers=len(digests)) as pool, \
+                open(fpath, 'rb', buffering=0) as f:
+            i = 0
+            while True:
+                buf = bufs[i % 2]
+                n = f.readinto(buf)
+                # the other buffer is reused next, wait for its hashing
+                for p in pending:
+                    p.result()
+                if not n:
+                    break
+                block = memoryview(buf)[:n]
+                pending = [pool.submit(d.update, block) for d in digests]
+                i += 1
         return {n: d.hexdigest() for n, d in zip(self.digests, digests)}
+
+    def digest_files(self, fpaths, jobs=None, progress=True):
+        """Compute digests for many files concurrently
+
+        Files are processed by a pool of threads. Progress is reported across
+        all files in terms of the number of bytes processed, unless disabled.
+
+        Parameters
+        ----------
+        fpaths : iterable
+          File paths for which checksums shall be computed.
+        jobs : int, optional
+          Number of files to process concurrently. By default, the number
+          of CPUs.
+        progress : bool, optional
+          Whether to report progress. Disable for internal checks of a few
+          files that are not worth reporting.
+
+        Yields
+        ------
+        tuple
+          File path, and a dict as returned by `__call__()`, in the order of
+          `fpaths`.
+        """
+        fpaths = list(fpaths)
+        if not fpaths:
+            return
+        if jobs is None:
+            jobs = os.cpu_count() or 1
+        # with a single file at a time, use parallel digest computation
+        # instead
+        digest = self if jobs < 2 else self._digest
+        sizes = {}
+        for fpath in fpaths:
+            try:
+                sizes[fpath] = os.stat(fpath).st_size
+            except OSError:
+                # let the digest computation report the problem
+                sizes[fpath] = 0
+        pid = 'digests%s' % id(self)
+        report = log_progress if progress else lambda *args, **kwargs: None
+        report(
+            lgr.info, pid,
+            'Start computing digests of %i files', len(fpaths),
+            total=sum(sizes.values()),
+            label='Computing digests',
+            unit=' Bytes',
+        )
+        try:
+            with ThreadPoolExecutor(max_workers=jobs) as pool:
+                # keep a bounded number of files in flight, do not submit
+                # all at once
+                fpaths = iter(fpaths)
+                inflight = deque()
+                for fpath in fpaths:
+                    inflight.append((fpath, pool.submit(digest, fpath)))
+                    if len(inflight) >= 2 * jobs:
+                        break
+                while inflight:
+                    fpath, future = inflight.popleft()
+                    for nextpath in fpaths:
+                        inflight.append(
+                            (nextpath, pool.submit(digest, nextpath)))
+                        break
+                    res = future.result()
+                    report(
+                        lgr.info, pid,
+                        'Computed digests of %s', fpath,
+                        update=sizes[fpath],
+                        increment=True,
+                        noninteractive_level=5,
+                    )
+                    yield fpath, res
+        finally:
+            report(lgr.info, pid, 'Finished computing digests')
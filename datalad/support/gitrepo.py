@@ -11,6 +11,9 @@
 """
 
 import re
+import subprocess
+import tempfile
+import threading
 import time
 import os
 import os.path as op
@@ -51,6 +54,7 @@ from datalad.cmd import (
     WitlessProtocol,
     GitRunner,
     BatchedCommand,
+    get_batched_command_pool,
     run_gitcommand_on_file_list_chunks,
     StdOutErrCapture,
 )
@@ -94,6 +98,8 @@ from .network import (
     PathRI,
     is_ssh
 )
+from .contentinfo import ContentInfoRecord
+from .contentinfo_cache import ContentInfoCache
 from .path import get_parent_paths
 from .repo import (
     PathBasedFlyweight,
@@ -108,6 +114,12 @@ _pardirsep = pardir + sep
 
 lgr = logging.getLogger('datalad.gitrepo')
 
+# parsed .gitmodules files by path, together with a stamp of the file state
+# they were parsed from, least recently used first
+_gitmodules_cache = OrderedDict()
+_gitmodules_cache_lock = threading.Lock()
+_GITMODULES_CACHE_SIZE = 10000
+
 
 def to_options(split_single_char_options=True, **kwargs):
     """Transform keyword arguments into a list of cmdline options
@@ -159,6 +171,17 @@ def to_options(split_single_char_options=True, **kwargs):
     return args
 
 
+def _read_symlink_target_from_catfile(lines):
+    """Output processor for `git cat-file --batch` queries of symlinks"""
+    # it is always the second line, all checks done upfront
+    header = lines.readline()
+    if header.rstrip().endswith('missing'):
+        # something we do not know about, should not happen
+        # in real use, but guard against to avoid stalling
+        return ''
+    return lines.readline().rstrip()
+
+
 def _normalize_path(base_dir, path):
     """Helper to check paths passed to methods of this class.
 
@@ -1690,7 +1713,7 @@ class GitRepo(RepoInterface, metaclass=PathBasedFlyweight):
 
         return [
             str(r.relative_to(self.pathobj))
-            for r in self.get_content_info(
+            for r, _ in self.iter_content_info(
                 paths=None, ref=None, untracked='no', eval_file_type=False)
         ]
 
@@ -1995,7 +2018,7 @@ class GitRepo(RepoInterface, metaclass=PathBasedFlyweight):
         """
         return [
             str(p.relative_to(self.pathobj))
-            for p in self.get_content_info(
+            for p, _ in self.iter_content_info(
                 paths=None, ref=branch, untracked='no', eval_file_type=False)
             ]
 
@@ -2071,6 +2094,78 @@ class GitRepo(RepoInterface, metaclass=PathBasedFlyweight):
 
         return out, err
 
+    def _iter_git_output(self, files, cmd, sep='\n'):
+        """Run a Git command and yield records of its output as they arrive
+
+        Unlike _git_custom_command(), the output is not collected, but read
+        from the pipe in blocks and split into records incrementally.
+
+        Parameters
+        ----------
+        files : list of str or None
+          Passed to the command, split into multiple calls if necessary.
+        cmd : list
+          Git command, starting with 'git'.
+        sep : str
+          Record separator.
+
+        Yields
+        ------
+        str
+          Output record, without the separator.
+
+        Raises
+        ------
+        CommandError
+          If the command exits with a non-zero status (after all its output
+          was yielded).
+        """
+        assert(cmd[0] == 'git')
+        cmd = cmd[:1] + self._GIT_COMMON_OPTIONS + cmd[1:]
+        env = GitRunner.get_git_environ_adjusted()
+        bsep = sep.encode()
+        for file_chunk in (generate_file_chunks(files, cmd) if files
+                           else [None]):
+            chunk_cmd = cmd + ['--'] + file_chunk if file_chunk else cmd
+            lgr.log(8, 'Streaming output of %s', chunk_cmd)
+            # stderr goes to a file to avoid a lock-down on a full pipe
+            with tempfile.TemporaryFile() as stderr:
+                proc = subprocess.Popen(
+                    chunk_cmd,
+                    stdout=subprocess.PIPE,
+                    stderr=stderr,
+                    cwd=self.path,
+                    env=env,
+                )
+                finished = False
+                try:
+                    remainder = b''
+                    for block in iter(
+                            lambda: proc.stdout.read1(65536), b''):
+                        records = (remainder + block).split(bsep)
+                        remainder = records.pop()
+                        for r in records:
+                            yield ensure_unicode(r)
+                    if remainder:
+                        yield ensure_unicode(remainder)
+                    finished = True
+                finally:
+                    if not finished:
+                        # consumer is no longer interested, or crashed
+                        proc.kill()
+                    proc.stdout.close()
+                    code = proc.wait()
+                if finished and code:
+                    stderr.seek(0)
+                    err = ensure_unicode(stderr.read())
+                    raise CommandError(
+                        cmd=chunk_cmd,
+                        msg=err,
+                        code=code,
+                        stderr=err,
+                        cwd=self.path,
+                    )
+
     # Convenience wrappers for one-off git calls that don't require further
     # processing or error handling.
 
@@ -2670,10 +2765,43 @@ class GitRepo(RepoInterface, metaclass=PathBasedFlyweight):
         self._git_custom_command('', cmd_options)
 
     def _parse_gitmodules(self):
-        # TODO read .gitconfig from Git blob?
+        """Return the properties of all submodules declared in .gitmodules
+
+        Parse results are cached per file for the session, and are reused
+        as long as the inode, size, and modification time of the file are
+        unchanged (Git replaces the file whenever it modifies it).
+
+        Returns
+        -------
+        dict
+          Mapping of submodule paths to their properties.
+        """
         gitmodules = self.pathobj / '.gitmodules'
-        if not gitmodules.exists():
+        try:
+            st = gitmodules.stat()
+        except FileNotFoundError:
             return {}
+        stamp = (st.st_ino, st.st_size, st.st_mtime_ns)
+        cache_key = str(gitmodules)
+        with _gitmodules_cache_lock:
+            cached = _gitmodules_cache.get(cache_key)
+            if cached is not None and cached[0] == stamp:
+                _gitmodules_cache.move_to_end(cache_key)
+                out = cached[1]
+            else:
+                out = None
+        if out is None:
+            out = self._parse_gitmodules_file()
+            with _gitmodules_cache_lock:
+                _gitmodules_cache[cache_key] = (stamp, out)
+                _gitmodules_cache.move_to_end(cache_key)
+                while len(_gitmodules_cache) > _GITMODULES_CACHE_SIZE:
+                    _gitmodules_cache.popitem(last=False)
+        # callers are free to modify the result
+        return {path: dict(props) for path, props in out.items()}
+
+    def _parse_gitmodules_file(self):
+        # TODO read .gitconfig from Git blob?
         # pull out file content
         out, err = self._git_custom_command(
             '',
@@ -2726,11 +2854,11 @@ class GitRepo(RepoInterface, metaclass=PathBasedFlyweight):
             return
 
         modinfo = self._parse_gitmodules()
-        for path, props in self.get_content_info(
+        for path, props in self.iter_content_info(
                 paths=paths,
                 ref=None,
                 untracked='no',
-                eval_file_type=False).items():
+                eval_file_type=False):
             if props.get('type', None) != 'dataset':
                 continue
             props["path"] = path
@@ -3288,8 +3416,31 @@ class GitRepo(RepoInterface, metaclass=PathBasedFlyweight):
         """
         lgr.debug('%s.get_content_info(...)', self)
         # TODO limit by file type to replace code in subdatasets command
-        info = OrderedDict()
+        info = OrderedDict(self.iter_content_info(
+            paths=paths,
+            ref=ref,
+            untracked=untracked,
+            eval_file_type=eval_file_type))
+        lgr.debug('Done %s.get_content_info(...)', self)
+        return info
+
+    def iter_content_info(self, paths=None, ref=None, untracked='all',
+                          eval_file_type=True):
+        """Like get_content_info(), but yields records as Git reports them
+
+        Git's output is parsed incrementally while the command is still
+        running, hence the first records are available immediately, and the
+        complete listing is never held in memory (unless the persistent
+        content info cache is enabled, see 'datalad.runtime.content-info-cache').
+
+        Parameters are identical to get_content_info().
 
+        Yields
+        ------
+        (Path, dict)
+          Absolute path and properties of a content item, as described for
+          the return value of get_content_info().
+        """
         if paths:
             # path matching will happen against what Git reports
             # and Git always reports POSIX paths
@@ -3308,9 +3459,11 @@ class GitRepo(RepoInterface, metaclass=PathBasedFlyweight):
 
             # --exclude-standard will make sure to honor and standard way
             # git can be instructed to ignore content, and will prevent
-            # crap from contaminating untracked file reports
+            # crap from contaminating untracked file reports.
+            # No -d/-m, these would only report records of the index again,
+            # not necessarily next to the original ones
             cmd = ['git', 'ls-files',
-                   '--stage', '-z', '-d', '-m', '--exclude-standard']
+                   '--stage', '-z', '--exclude-standard']
             # untracked report mode, using labels from `git diff` option style
             if untracked == 'all':
                 cmd.append('-o')
@@ -3336,42 +3489,31 @@ class GitRepo(RepoInterface, metaclass=PathBasedFlyweight):
             props_re = re.compile(
                 r'(?P<type>[0-9]+) ([a-z]*) (?P<sha>[^ ]*) [\s]*(?P<size>[0-9-]+)\t(?P<fname>.*)$')
 
-        lgr.debug('Query repo: %s', cmd)
-        try:
-            stdout, stderr = self._git_custom_command(
-                path_strs,
-                cmd,
-                log_stderr=True,
-                log_stdout=True,
-                # not sure why exactly, but log_online has to be false!
-                log_online=False,
-                expect_stderr=False,
-                shell=False,
-                # we don't want it to scream on stdout
-                expect_fail=True)
-        except CommandError as exc:
-            if "fatal: Not a valid object name" in exc.stderr:
-                raise InvalidGitReferenceError(ref)
-            raise
-        lgr.debug('Done query repo: %s', cmd)
+        records = self._get_content_info_cached(
+            cmd, path_strs, ref, untracked, props_re) \
+            if self.config.obtain('datalad.runtime.content-info-cache') \
+            else None
+        if records is None:
+            records = self._parse_content_info_lines(
+                self._iter_content_info_stdout(cmd, path_strs, ref),
+                props_re,
+                ref)
 
+        pool = None
         if not eval_file_type:
             _get_link_target = None
         elif ref:
-            def _read_symlink_target_from_catfile(lines):
-                # it is always the second line, all checks done upfront
-                header = lines.readline()
-                if header.rstrip().endswith('missing'):
-                    # something we do not know about, should not happen
-                    # in real use, but guard against to avoid stalling
-                    return ''
-                return lines.readline().rstrip()
-
-            _get_link_target = BatchedCommand(
-                ['git', 'cat-file', '--batch'],
-                path=self.path,
-                output_proc=_read_symlink_target_from_catfile,
-            )
+            def _get_catfile():
+                return BatchedCommand(
+                    ['git', 'cat-file', '--batch'],
+                    path=self.path,
+                    output_proc=_read_symlink_target_from_catfile,
+                )
+
+            # reuse a long-lived process across calls, if possible
+            pool = get_batched_command_pool()
+            _get_link_target = _get_catfile() if pool is None \
+                else pool.get(('git', self.path, 'cat-file'), _get_catfile)
         else:
             def try_readlink(path):
                 try:
@@ -3385,48 +3527,124 @@ class GitRepo(RepoInterface, metaclass=PathBasedFlyweight):
             _get_link_target = try_readlink
 
         try:
-            self._get_content_info_line_helper(
+            yield from self._get_content_info_line_helper(
                 ref,
-                info,
-                stdout.split('\0'),
-                props_re,
+                records,
                 _get_link_target)
         finally:
-            if ref and _get_link_target:
+            if ref and _get_link_target and pool is None:
                 # cancel batch process
                 _get_link_target.close()
 
-        lgr.debug('Done %s.get_content_info(...)', self)
-        return info
+    def _iter_content_info_stdout(self, cmd, path_strs, ref):
+        """Internal helper of iter_content_info() to run a Git query
+
+        Yields NULL-separated records while Git reports them.
+        """
+        lgr.debug('Query repo: %s', cmd)
+        try:
+            yield from self._iter_git_output(path_strs, cmd, sep='\0')
+        except CommandError as exc:
+            if "fatal: Not a valid object name" in exc.stderr:
+                raise InvalidGitReferenceError(ref)
+            raise
+        lgr.debug('Done query repo: %s', cmd)
+
+    def _get_content_info_cached(self, cmd, path_strs, ref, untracked,
+                                 props_re):
+        """Like _parse_content_info_lines(), but uses a persistent cache
+
+        Parsed listings of a reference are cached by the tree they point to.
+        Listings of the worktree are only cached if they exclude untracked
+        content, i.e. match the content of the index, until the index
+        changes.
+
+        Returns
+        -------
+        list or None
+          None, if the query cannot be cached.
+        """
+        cache = ContentInfoCache(self)
+        if ref:
+            tree = cache.get_tree_sha(ref)
+            if tree is None:
+                # let the actual query fail with the proper exception
+                return None
+            key = ['ls-tree', tree, path_strs]
+            stamp = None
+        elif untracked == 'no':
+            stamp = cache.get_index_stamp()
+            if stamp is None:
+                return None
+            key = ['ls-files', path_strs]
+        else:
+            # there is nothing to tell whether untracked content changed
+            return None
+        records = cache.get(key, stamp=stamp)
+        if records is None:
+            records = list(self._parse_content_info_lines(
+                self._iter_content_info_stdout(cmd, path_strs, ref),
+                props_re,
+                ref))
+            # only cache if the index did not change while we read it
+            if ref or stamp == cache.get_index_stamp():
+                cache.set(key, records, stamp=stamp)
+        return records
 
-    def _get_content_info_line_helper(self, ref, info, lines,
-                                      props_re, get_link_target):
-        """Internal helper of get_content_info() to parse Git output"""
+    @staticmethod
+    def _parse_content_info_lines(lines, props_re, ref):
+        """Internal helper of iter_content_info() to parse Git output
+
+        Yields compact (path, type, gitshasum, bytesize) records, with the
+        POSIX path relative to the repository root, and the type as
+        recorded by Git. Type, gitshasum, and bytesize are None for
+        content that is not known to Git. Git reports the same path
+        multiple times in direct succession for merge conflicts, only the
+        last of those records is yielded.
+        """
         mode_type_map = {
             '100644': 'file',
             '100755': 'file',
             '120000': 'symlink',
             '160000': 'dataset',
         }
+        prev = None
         for line in lines:
             if not line:
                 continue
-            inf = {}
             props = props_re.match(line)
             if not props:
                 # not known to Git, but Git always reports POSIX
-                path = ut.PurePosixPath(line)
-                inf['gitshasum'] = None
+                rec = (str(ut.PurePosixPath(line)), None, None, None)
             else:
-                # again Git reports always in POSIX
-                path = ut.PurePosixPath(props.group('fname'))
-
-            # revisit the file props after this path has not been rejected
-            if props:
-                inf['gitshasum'] = props.group('sha')
-                inf['type'] = mode_type_map.get(
-                    props.group('type'), props.group('type'))
-                if get_link_target and inf['type'] == 'symlink' and \
+                size = props.group('size') if ref else '-'
+                rec = (
+                    # again Git reports always in POSIX
+                    str(ut.PurePosixPath(props.group('fname'))),
+                    mode_type_map.get(
+                        props.group('type'), props.group('type')),
+                    props.group('sha'),
+                    None if size == '-' else int(size),
+                )
+            if prev is not None and rec[0] != prev[0]:
+                yield prev
+            prev = rec
+        if prev is not None:
+            yield prev
+
+    def _get_content_info_line_helper(self, ref, records, get_link_target):
+        """Internal helper of iter_content_info() to evaluate Git records
+
+        Turns records of _parse_content_info_lines() into (path, props)
+        tuples, as described for get_content_info().
+        """
+        for fname, type_, gitshasum, bytesize in records:
+            inf = ContentInfoRecord()
+            inf.gitshasum = gitshasum
+            path = ut.PurePosixPath(fname)
+            if type_ is not None:
+                inf.type = type_
+                if get_link_target and inf.type == 'symlink' and \
                         ((ref is None and '.git/annex/objects' in \
                           ut.Path(
                             get_link_target(str(self.pathobj / path))
@@ -3439,20 +3657,20 @@ class GitRepo(RepoInterface, metaclass=PathBasedFlyweight):
                     # report annex symlink pointers as file, their
                     # symlink-nature is a technicality that is dependent
                     # on the particular mode annex is in
-                    inf['type'] = 'file'
+                    inf.type = 'file'
 
-                if ref and inf['type'] == 'file':
-                    inf['bytesize'] = int(props.group('size'))
+                if ref and inf.type == 'file':
+                    inf.bytesize = bytesize
 
             # join item path with repo path to get a universally useful
             # path representation with auto-conversion and tons of other
             # stuff
             path = self.pathobj.joinpath(path)
-            if 'type' not in inf:
+            if type_ is None:
                 # be nice and assign types for untracked content
-                inf['type'] = 'symlink' if path.is_symlink() \
+                inf.type = 'symlink' if path.is_symlink() \
                     else 'directory' if path.is_dir() else 'file'
-            info[path] = inf
+            yield path, inf
 
     def status(self, paths=None, untracked='all', eval_submodule_state='full'):
         """Simplified `git status` equivalent.
@@ -3555,13 +3773,74 @@ class GitRepo(RepoInterface, metaclass=PathBasedFlyweight):
         If given, it will return a single 'modified'
         (vs. 'clean') state label for the entire repository, as soon as
         it can."""
+        if _cache is None:
+            _cache = {}
+        if eval_submodule_state != 'global':
+            return OrderedDict(self.iter_diffstatus(
+                fr, to, paths=paths, untracked=untracked,
+                eval_submodule_state=eval_submodule_state,
+                eval_file_type=eval_file_type,
+                _cache=_cache))
+
+        subdatasets = []
+        for f, props in self._iter_diffstatus_records(
+                fr, to, paths, untracked, eval_file_type, _cache,
+                stream=False):
+            state = props.get('state', None)
+            if state not in ('clean', None):
+                # any modification means globally 'modified'
+                return 'modified'
+            if to is None and state is None and props['type'] == 'dataset':
+                subdatasets.append((f, props))
+        # only look into subdatasets, if nothing else was modified
+        for f, props in subdatasets:
+            self._eval_submodule_state(
+                f, props, untracked, eval_submodule_state, _cache)
+            if props['state'] == 'modified':
+                return 'modified'
+        return 'clean'
 
-        def _get_cache_key(label, paths, ref, untracked=None):
-            return self.path, label, tuple(paths) if paths else None, \
-                ref, untracked
+    def iter_diffstatus(self, fr, to, paths=None, untracked='all',
+                        eval_submodule_state='full', eval_file_type=True,
+                        _cache=None):
+        """Like diffstatus(), but yields (path, props) records one at a time
+
+        Unless it is found in `_cache`, the target state is not held in
+        memory, but compared record by record while Git reports it. The
+        state of any subdataset is evaluated right before its record is
+        yielded.
 
+        Parameters are identical to diffstatus(), except that
+        `eval_submodule_state` does not support 'global'.
+        """
+        if eval_submodule_state == 'global':
+            raise ValueError(
+                "eval_submodule_state='global' requires diffstatus()")
         if _cache is None:
             _cache = {}
+        for f, props in self._iter_diffstatus_records(
+                fr, to, paths, untracked, eval_file_type, _cache,
+                stream=True):
+            if to is None and eval_submodule_state != 'no' \
+                    and 'state' not in props and props['type'] == 'dataset':
+                self._eval_submodule_state(
+                    f, props, untracked, eval_submodule_state, _cache)
+            yield f, props
+
+    def _iter_diffstatus_records(self, fr, to, paths, untracked,
+                                 eval_file_type, _cache, stream):
+        """Internal helper of diffstatus() to compare two states
+
+        Subdataset records of a comparison with the worktree come without a
+        'state', and with the recorded 'gitshasum' and 'prev_gitshasum'.
+
+        With `stream`, the target state is compared while Git reports it,
+        and neither state is put into `_cache`.
+        """
+
+        def _get_cache_key(label, paths, ref, untracked=None):
+            return self.path, label, tuple(paths) if paths else None, \
+                ref, untracked
 
         if paths:
             # at this point we must normalize paths to the form that
@@ -3572,20 +3851,29 @@ class GitRepo(RepoInterface, metaclass=PathBasedFlyweight):
                 for p in paths
             ]
 
+        def _get_to_state(key, ref, untracked):
+            if key in _cache:
+                return _cache[key].items()
+            if stream:
+                return self.iter_content_info(
+                    paths=paths, ref=ref, untracked=untracked,
+                    eval_file_type=eval_file_type)
+            info = _cache[key] = self.get_content_info(
+                paths=paths, ref=ref, untracked=untracked,
+                eval_file_type=eval_file_type)
+            return info.items()
+
         # TODO report more info from get_content_info() calls in return
         # value, those are cheap and possibly useful to a consumer
         # we need (at most) three calls to git
         if to is None:
+            # a streamed listing only starts when it is consumed, make sure
+            # no operations are pending before anything is queried
+            self.precommit()
             # everything we know about the worktree, including os.stat
             # for each file
-            key = _get_cache_key('ci', paths, None, untracked)
-            if key in _cache:
-                to_state = _cache[key]
-            else:
-                to_state = self.get_content_info(
-                    paths=paths, ref=None, untracked=untracked,
-                    eval_file_type=eval_file_type)
-                _cache[key] = to_state
+            to_state = _get_to_state(
+                _get_cache_key('ci', paths, None, untracked), None, untracked)
             # we want Git to tell us what it considers modified and avoid
             # reimplementing logic ourselves
             key = _get_cache_key('mod', paths, None)
@@ -3601,43 +3889,43 @@ class GitRepo(RepoInterface, metaclass=PathBasedFlyweight):
                     if p)
                 _cache[key] = modified
         else:
-            key = _get_cache_key('ci', paths, to)
-            if key in _cache:
-                to_state = _cache[key]
-            else:
-                to_state = self.get_content_info(
-                    paths=paths, ref=to, eval_file_type=eval_file_type)
-                _cache[key] = to_state
+            to_state = _get_to_state(
+                _get_cache_key('ci', paths, to), to, 'all')
             # we do not need worktree modification detection in this case
             modified = None
         # origin state
         key = _get_cache_key('ci', paths, fr)
         if key in _cache:
-            from_state = _cache[key]
+            # records are removed from the origin state below, do not
+            # modify the cached one
+            from_state = _cache[key].copy()
         else:
             if fr:
                 from_state = self.get_content_info(
                     paths=paths, ref=fr, eval_file_type=eval_file_type)
             else:
                 # no ref means from nothing
-                from_state = {}
-            _cache[key] = from_state
+                from_state = OrderedDict()
+            if not stream:
+                _cache[key] = from_state.copy()
 
-        status = OrderedDict()
-        for f, to_state_r in to_state.items():
+        for f, to_state_r in to_state:
             props = None
-            if f not in from_state:
+            # once matched, an origin record is no longer needed, what
+            # remains in the end was deleted
+            from_state_r = from_state.pop(f, None)
+            if from_state_r is None:
                 # this is new, or rather not known to the previous state
-                props = dict(
+                props = ContentInfoRecord(
                     state='added' if to_state_r['gitshasum'] else 'untracked',
                 )
                 if 'type' in to_state_r:
                     props['type'] = to_state_r['type']
-            elif to_state_r['gitshasum'] == from_state[f]['gitshasum'] and \
+            elif to_state_r['gitshasum'] == from_state_r['gitshasum'] and \
                     (modified is None or f not in modified):
                 if to_state_r['type'] != 'dataset':
                     # no change in git record, and no change on disk
-                    props = dict(
+                    props = ContentInfoRecord(
                         # at this point we know that the reported object ids
                         # for this file are identical in the to and from
                         # records.  If to is None, we're comparing to the
@@ -3651,7 +3939,7 @@ class GitRepo(RepoInterface, metaclass=PathBasedFlyweight):
                     )
                 else:
                     # a dataset
-                    props = dict(type=to_state_r['type'])
+                    props = ContentInfoRecord(type=to_state_r['type'])
                     if to is not None:
                         # we can only be confident without looking
                         # at the worktree, if we compare to a recorded
@@ -3661,10 +3949,10 @@ class GitRepo(RepoInterface, metaclass=PathBasedFlyweight):
                         # report the shasum that we know, for further
                         # wrangling of subdatasets below
                         props['gitshasum'] = to_state_r['gitshasum']
-                        props['prev_gitshasum'] = from_state[f]['gitshasum']
+                        props['prev_gitshasum'] = from_state_r['gitshasum']
             else:
                 # change in git record, or on disk
-                props = dict(
+                props = ContentInfoRecord(
                     # TODO we could have a new file that is already staged
                     # but had subsequent modifications done to it that are
                     # unstaged. Such file would presently show up as 'added'
@@ -3676,94 +3964,68 @@ class GitRepo(RepoInterface, metaclass=PathBasedFlyweight):
                     type=to_state_r['type'],
                 )
             state = props.get('state', None)
-            if eval_submodule_state == 'global' and \
-                    state not in ('clean', None):
-                # any modification means globally 'modified'
-                return 'modified'
             if state in ('clean', 'added', 'modified'):
                 props['gitshasum'] = to_state_r['gitshasum']
                 if 'bytesize' in to_state_r:
                     # if we got this cheap, report it
                     props['bytesize'] = to_state_r['bytesize']
-                elif props['state'] == 'clean' and 'bytesize' in from_state[f]:
+                elif props['state'] == 'clean' and \
+                        'bytesize' in from_state_r:
                     # no change, we can take this old size info
-                    props['bytesize'] = from_state[f]['bytesize']
+                    props['bytesize'] = from_state_r['bytesize']
             if state in ('clean', 'modified', 'deleted'):
-                props['prev_gitshasum'] = from_state[f]['gitshasum']
-            status[f] = props
+                props['prev_gitshasum'] = from_state_r['gitshasum']
+            yield f, props
 
         for f, from_state_r in from_state.items():
-            if f not in to_state:
-                # we new this, but now it is gone and Git is not complaining
-                # about it being missing -> properly deleted and deletion
-                # stages
-                status[f] = dict(
-                    state='deleted',
-                    type=from_state_r['type'],
-                    # report the shasum to distinguish from a plainly vanished
-                    # file
-                    gitshasum=from_state_r['gitshasum'],
-                )
-                if eval_submodule_state == 'global':
-                    return 'modified'
-
-        if to is not None or eval_submodule_state == 'no':
-            # if we have `to` we are specifically comparing against
-            # a recorded state, and this function only attempts
-            # to label the state of a subdataset, not investigate
-            # specifically what the changes in subdatasets are
-            # this is done by a high-level command like rev-diff
-            # so the comparison within this repo and the present
-            # `state` label are all we need, and they are done already
-            if eval_submodule_state == 'global':
-                return 'clean'
-            else:
-                return status
+            # we new this, but now it is gone and Git is not complaining
+            # about it being missing -> properly deleted and deletion
+            # stages
+            yield f, ContentInfoRecord(
+                state='deleted',
+                type=from_state_r['type'],
+                # report the shasum to distinguish from a plainly vanished
+                # file
+                gitshasum=from_state_r['gitshasum'],
+            )
 
-        # loop over all subdatasets and look for additional modifications
-        for f, st in status.items():
-            f = str(f)
-            if 'state' in st or not st['type'] == 'dataset':
-                # no business here
-                continue
-            if not GitRepo.is_valid_repo(f):
-                # submodule is not present, no chance for a conflict
-                st['state'] = 'clean'
-                continue
-            # we have to recurse into the dataset and get its status
-            subrepo = GitRepo(f)
-            subrepo_commit = subrepo.get_hexsha()
-            st['gitshasum'] = subrepo_commit
-            # subdataset records must be labeled clean up to this point
-            # test if current commit in subdataset deviates from what is
-            # recorded in the dataset
-            st['state'] = 'modified' \
-                if st['prev_gitshasum'] != subrepo_commit \
-                else 'clean'
-            if eval_submodule_state == 'global' and st['state'] == 'modified':
-                return 'modified'
-            if eval_submodule_state == 'commit':
-                continue
-            # the recorded commit did not change, so we need to make
-            # a more expensive traversal
-            st['state'] = subrepo.diffstatus(
-                # we can use 'HEAD' because we know that the commit
-                # did not change. using 'HEAD' will facilitate
-                # caching the result
-                fr='HEAD',
-                to=None,
-                paths=None,
-                untracked=untracked,
-                eval_submodule_state='global',
-                eval_file_type=False,
-                _cache=_cache) if st['state'] == 'clean' else 'modified'
-            if eval_submodule_state == 'global' and st['state'] == 'modified':
-                return 'modified'
+    def _eval_submodule_state(self, path, props, untracked,
+                              eval_submodule_state, _cache):
+        """Internal helper of diffstatus() to label a subdataset's state
 
-        if eval_submodule_state == 'global':
-            return 'clean'
-        else:
-            return status
+        `props` is a subdataset record of a comparison with the worktree, and
+        is amended with the 'state' and the present 'gitshasum'.
+        """
+        path = str(path)
+        if not GitRepo.is_valid_repo(path):
+            # submodule is not present, no chance for a conflict
+            props['state'] = 'clean'
+            return
+        # we have to recurse into the dataset and get its status
+        subrepo = GitRepo(path)
+        subrepo_commit = subrepo.get_hexsha()
+        props['gitshasum'] = subrepo_commit
+        # subdataset records must be labeled clean up to this point
+        # test if current commit in subdataset deviates from what is
+        # recorded in the dataset
+        props['state'] = 'modified' \
+            if props['prev_gitshasum'] != subrepo_commit \
+            else 'clean'
+        if props['state'] == 'modified' or eval_submodule_state == 'commit':
+            return
+        # the recorded commit did not change, so we need to make
+        # a more expensive traversal
+        props['state'] = subrepo.diffstatus(
+            # we can use 'HEAD' because we know that the commit
+            # did not change. using 'HEAD' will facilitate
+            # caching the result
+            fr='HEAD',
+            to=None,
+            paths=None,
+            untracked=untracked,
+            eval_submodule_state='global',
+            eval_file_type=False,
+            _cache=_cache)
 
     def _save_pre(self, paths, _status, **kwargs):
         # helper to get an actionable status report
@@ -3933,12 +4195,12 @@ class GitRepo(RepoInterface, metaclass=PathBasedFlyweight):
         to_add_submodules = []
         if untracked_dirs:
             to_add_submodules = [sm for sm, sm_props in
-                self.get_content_info(
+                self.iter_content_info(
                     untracked_dirs,
                     ref=None,
                     # request exhaustive list, so that everything that is
                     # still reported as a directory must be its own repository
-                    untracked='all').items()
+                    untracked='all')
                 if sm_props.get('type', None) == 'directory']
             to_add_submodules = _prune_deeper_repos(to_add_submodules)
             for cand_sm in to_add_submodules:
@@ -26,6 +26,7 @@ from simplejson import load as jsonload
 from simplejson import dump as jsondump
 # simply mirrored for now
 from simplejson import loads as json_loads
+from simplejson import dumps as json_dumps
 from simplejson import JSONDecodeError
 
 
@@ -129,6 +130,86 @@ def dump2xzstream(obj, fname):
     dump2stream(obj, fname, compressed=True)
 
 
+def dump2sqlite(obj, fname, key='path'):
+    """Dump a sequence of JSON-serializable records into an SQLite database
+
+    Each record is stored in its own row, indexed by the value of its `key`
+    property. This enables `load_sqlite()` to read records for particular
+    keys only, without having to decode the entire file.
+
+    Parameters
+    ----------
+    obj : iterable
+      Records (dicts) to serialize.
+    fname : str
+      Name of the database file to dump into.
+    key : str
+      Name of the record property to index records by. Its values must
+      be unique strings.
+    """
+    import sqlite3
+
+    indir = dirname(fname)
+
+    if op.lexists(fname):
+        os.remove(fname)
+    elif indir and not exists(indir):
+        makedirs(indir)
+    conn = sqlite3.connect(fname)
+    try:
+        with conn:
+            conn.execute(
+                'CREATE TABLE records '
+                '(key TEXT PRIMARY KEY, record TEXT) WITHOUT ROWID')
+            conn.executemany(
+                'INSERT INTO records VALUES (?, ?)',
+                ((o[key], json_dumps(o, **compressed_json_dump_kwargs))
+                 for o in obj))
+    finally:
+        conn.close()
+
+
+def load_sqlite(fname, prefix=None):
+    """Load records from an SQLite database written by `dump2sqlite()`
+
+    Parameters
+    ----------
+    fname : str
+      Name of the database file to read from. It is opened read-only.
+    prefix : str or None
+      If given, only records whose key is identical to `prefix`, or is
+      a path underneath it (i.e. starts with `prefix` followed by '/')
+      are loaded. The query is answered from the key index.
+
+    Yields
+    ------
+    dict
+      Records in the order of their keys.
+    """
+    import sqlite3
+    from pathlib import Path
+
+    conn = sqlite3.connect(
+        '{}?mode=ro'.format(Path(op.abspath(fname)).as_uri()),
+        uri=True)
+    try:
+        if prefix is None:
+            cursor = conn.execute(
+                'SELECT record FROM records ORDER BY key')
+        else:
+            prefix = prefix.rstrip('/')
+            # '0' is the character following '/', hence this range matches
+            # all keys starting with prefix + '/'
+            cursor = conn.execute(
+                'SELECT record FROM records '
+                'WHERE key = ? OR (key >= ? AND key < ?) ORDER BY key',
+                (prefix, prefix + '/', prefix + '0'))
+        for row in cursor:
+            yield loads(row[0])
+    finally:
+        conn.close()
+
+
 def load_stream(fname, compressed=None):
     _open = LZMAFile \
         if compressed or compressed is None and fname.endswith('.xz') \
@@ -15,10 +15,13 @@ import os
 class Keyring(object):
     """Adapter to keyring module
 
-    It also delays import of keyring which takes 300ms I guess due to all plugins etc
+    It also delays import of keyring which takes 300ms I guess due to all plugins etc.
+    Values obtained from the keyring are cached in memory, so repeated
+    authentication (e.g. by parallel downloads) does not query it again.
     """
     def __init__(self):
         self.__keyring = None
+        self._cache = {}
 
     @property
     def _keyring(self):
@@ -48,14 +51,24 @@ class Keyring(object):
         env_var = ('DATALAD_%s_%s' % (name, field)).replace('-', '_')
         if env_var in os.environ:
             return os.environ[env_var]
-        return self._keyring.get_password(self._get_service_name(name), field)
+        try:
+            return self._cache[(name, field)]
+        except KeyError:
+            pass
+        value = self._keyring.get_password(self._get_service_name(name), field)
+        # do not cache unknown values, they might get set by another process
+        if value is not None:
+            self._cache[(name, field)] = value
+        return value
 
     def set(self, name, field, value):
+        self._cache.pop((name, field), None)
         return self._keyring.set_password(self._get_service_name(name), field, value)
 
     def delete(self, name, field=None):
         if field is None:
             raise NotImplementedError("Deletion of all fields associated with a name")
+        self._cache.pop((name, field), None)
         return self._keyring.delete_password(self._get_service_name(name), field)
 
 
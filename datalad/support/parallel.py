@@ -0,0 +1,80 @@
+# emacs: -*- mode: python; py-indent-offset: 4; tab-width: 4; indent-tabs-mode: nil -*-
+# ex: set sts=4 ts=4 sw=4 noet:
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+#
+#   See COPYING file distributed along with the datalad package for the
+#   copyright and license terms.
+#
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+"""Helpers for concurrent processing of results consumed in order
+
+"""
+
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class LookaheadPool(object):
+    """Thread pool that limits how far work may run ahead of its consumer
+
+    Calls are only submitted as long as fewer than `limit` of their results
+    are pending, i.e. were submitted, but not yet retrieved via `result()`.
+    Otherwise `submit()` declines, and the caller has to perform the call
+    itself once its result is needed. This bounds the memory taken by
+    results computed ahead, and the work done in vain if the consumer stops
+    early.
+    """
+
+    def __init__(self, jobs, limit=None):
+        """
+        Parameters
+        ----------
+        jobs : int
+          Number of worker threads.
+        limit : int, optional
+          Maximum number of pending results, defaults to twice the number
+          of workers.
+        """
+        self._executor = ThreadPoolExecutor(max_workers=jobs)
+        self._slots = threading.Semaphore(
+            2 * jobs if limit is None else limit)
+
+    def submit(self, fn, *args, **kwargs):
+        """Submit a call, unless too many results are pending already
+
+        Returns
+        -------
+        Future or None
+          None, if the call was not submitted.
+        """
+        if not self._slots.acquire(blocking=False):
+            return None
+        try:
+            return self._executor.submit(fn, *args, **kwargs)
+        except RuntimeError:
+            # the pool was shut down already
+            self._slots.release()
+            return None
+
+    def result(self, future):
+        """Return the result of a submitted call, once it is available"""
+        try:
+            return future.result()
+        finally:
+            self._slots.release()
+
+    def shutdown(self, cancel=False):
+        """Shut down the pool, waiting for running calls to complete
+
+        Parameters
+        ----------
+        cancel : bool
+          If True, calls that have not started yet are cancelled. This
+          requires Python 3.9+, with older versions they are still
+          performed.
+        """
+        if cancel and sys.version_info >= (3, 9):
+            self._executor.shutdown(wait=True, cancel_futures=True)
+        else:
+            self._executor.shutdown(wait=True)
@@ -15,9 +15,10 @@ One of the reasons is also to robustify operation with unicode filenames
 import os
 import os.path as op
 
-# to not pollute API importing as _
-from collections import defaultdict as _defaultdict
-
+from bisect import (
+    bisect_left,
+    bisect_right,
+)
 from functools import wraps
 from itertools import dropwhile
 
@@ -125,7 +126,8 @@ def get_parent_paths(paths, parents, only_with_parents=False):
     with ../)
 
     Accent is made on performance to avoid O(len(paths) * len(parents))
-    runtime.  ATM should be typically less than O(len(paths) * len(log(parents)))
+    runtime.  Lookups are done via a `PathPrefixIndex`, hence runtime is
+    O((len(paths) + len(parents)) * log(len(parents)))
 
     Initial intended use - for a list of paths in the repository
     to provide their paths as files/submodules known to that repository, to
@@ -154,24 +156,10 @@ def get_parent_paths(paths, parents, only_with_parents=False):
     if not parents:
         return [] if only_with_parents else paths
 
-    # We will create a lookup for known parent lengths
-    parents = set(parents)  # O(log(len(parents))) lookup
-
-    # rely on path[:n] be quick, and len(parent_lengths) << len(parents)
-    # when len(parents) is large.  We will also bail checking any parent of
-    # the length if at that length path has no directory boundary ('/').
-    #
-    # Create mapping for each length of
-    # parent path to list of parents with that length
-    parent_lengths = _defaultdict(set)
+    parents = set(parents)
     for parent in parents:
         _get_parent_paths_check(parent)
-        parent_lengths[len(parent)].add(parent)
-
-    # Make it ordered in the descending order so we select the deepest/longest parent
-    # and store them as sets for faster lookup.
-    # Could be an ordered dict but no need
-    parent_lengths = [(l, parent_lengths[l]) for l in sorted(parent_lengths, reverse=True)]
+    index = PathPrefixIndex(parents, sep='/')
 
     res = []
     seen = set()
@@ -179,20 +167,14 @@ def get_parent_paths(paths, parents, only_with_parents=False):
     for path in paths:  # O(len(paths)) - unavoidable but could be parallelized!
         # Sanity check -- should not be too expensive
         _get_parent_paths_check(path)
-        for parent_length, parents_ in parent_lengths:  # O(len(parent_lengths))
-            if (len(path) < parent_length) or (len(path) > parent_length and path[parent_length] != '/'):
-                continue  # no directory deep enough
-            candidate_parent = path[:parent_length]
-            if candidate_parent in parents_:  # O(log(len(parents))) but expected one less due to per length handling
-                if candidate_parent not in seen:
-                    res.append(candidate_parent)
-                    seen.add(candidate_parent)
-                break  # it is!
-        else:  # no hits
-            if not only_with_parents:
-                if path not in seen:
-                    res.append(path)
-                    seen.add(path)
+        parent = index.get_parent(path)  # O(log(len(parents)))
+        if parent is None:
+            if only_with_parents:
+                continue
+            parent = path
+        if parent not in seen:
+            res.append(parent)
+            seen.add(parent)
 
     return res
 
@@ -202,3 +184,85 @@ def _get_parent_paths_check(path):
     if isabs(path) or path.startswith(pardir + sep) or path.startswith(curdir + sep):
         raise ValueError("Expected relative within directory paths, got %r" % path)
 
+
+
+class PathPrefixIndex(object):
+    """Index of paths to look up parents and children of other paths
+
+    Paths are kept in a sorted list, with a trailing separator appended.
+    This way all paths underneath any path form a contiguous range in the
+    list, which is located by bisection. Assigning N paths to M indexed
+    candidates hence takes O((N + M) * log(M)), instead of O(N * M) for
+    testing every combination.
+
+    Lookups are purely lexical. Indexed paths and query paths must be
+    normalized, and all absolute, or all relative to the same directory.
+
+    Parameters
+    ----------
+    paths : iterable
+      Paths to index, str or PurePath instances.
+    sep : str, optional
+      Directory separator used in the paths.
+    """
+    def __init__(self, paths, sep=sep):
+        self._sep = sep
+        entries = sorted(
+            (self._get_key(p), i, p) for i, p in enumerate(paths))
+        self._keys = [e[0] for e in entries]
+        self._order = [e[1] for e in entries]
+        self._paths = [e[2] for e in entries]
+        # position of the deepest indexed parent of each entry (-1 if none).
+        # parents precede their children in the sorted list, so all parents
+        # of an entry are on the stack when it is reached
+        self._parents = []
+        stack = []
+        for i, key in enumerate(self._keys):
+            while stack and not key.startswith(self._keys[stack[-1]]):
+                stack.pop()
+            self._parents.append(stack[-1] if stack else -1)
+            stack.append(i)
+
+    def _get_key(self, path):
+        path = str(path)
+        return path if path.endswith(self._sep) else path + self._sep
+
+    def __len__(self):
+        return len(self._keys)
+
+    def get_parent(self, path):
+        """Return the deepest indexed path that is `path` or a parent of it
+
+        Returns
+        -------
+        str or PurePath or None
+          As given to the constructor, None if there is no such path.
+        """
+        key = self._get_key(path)
+        # any indexed path sorting between a parent of `path` and `path`
+        # itself is underneath this parent, so the parent is among the
+        # parents of the closest preceding entry
+        i = bisect_right(self._keys, key) - 1
+        while i >= 0:
+            if key.startswith(self._keys[i]):
+                return self._paths[i]
+            i = self._parents[i]
+        return None
+
+    def get_children(self, path):
+        """Return all indexed paths that are `path` or underneath it
+
+        Returns
+        -------
+        list
+          Paths as given to the constructor, in the same order.
+        """
+        key = self._get_key(path)
+        start = bisect_left(self._keys, key)
+        # smallest string that sorts after any path underneath `path`
+        end = bisect_left(
+            self._keys, key[:-1] + chr(ord(self._sep) + 1), lo=start)
+        return [
+            p for _, p in sorted(zip(self._order[start:end],
+                                     self._paths[start:end]))
+        ]
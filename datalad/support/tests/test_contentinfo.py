@@ -0,0 +1,57 @@
+# ex: set sts=4 ts=4 sw=4 noet:
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+#
+#   See COPYING file distributed along with the datalad package for the
+#   copyright and license terms.
+#
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+"""Test content info records"""
+
+import pickle
+
+from datalad.support.contentinfo import ContentInfoRecord
+from datalad.tests.utils import (
+    assert_equal,
+    assert_false,
+    assert_in,
+    assert_not_in,
+    assert_raises,
+    ok_,
+)
+
+
+def test_contentinfo_record():
+    rec = ContentInfoRecord(type='file', gitshasum=None)
+    # None is a value, unset is absent
+    assert_in('gitshasum', rec)
+    assert_not_in('key', rec)
+    assert_raises(KeyError, rec.__getitem__, 'key')
+    assert_equal(rec.get('key', 'default'), 'default')
+    assert_equal(rec, {'type': 'file', 'gitshasum': None})
+    assert_equal({'type': 'file', 'gitshasum': None}, rec)
+    # arbitrary properties are supported too
+    rec['annex_custom'] = 5
+    rec.update(key='MD5E-s1--abc', bytesize=1)
+    assert_equal(
+        dict(rec),
+        {'type': 'file', 'gitshasum': None, 'key': 'MD5E-s1--abc',
+         'bytesize': 1, 'annex_custom': 5})
+    assert_equal(len(rec), 5)
+    # conversion for result records
+    res = dict(rec, path='some')
+    assert_equal(res['key'], 'MD5E-s1--abc')
+    # removal
+    assert_equal(rec.pop('annex_custom'), 5)
+    del rec['key']
+    assert_not_in('key', rec)
+    assert_raises(KeyError, rec.__delitem__, 'key')
+    assert_raises(KeyError, rec.__delitem__, 'annex_custom')
+    # copies are independent
+    cp = rec.copy()
+    cp['type'] = 'symlink'
+    assert_equal(rec['type'], 'file')
+    # survives pickling (e.g. for passing between processes)
+    assert_equal(pickle.loads(pickle.dumps(rec)), rec)
+    # compact: no per-record dict
+    assert_false(hasattr(rec, '__dict__'))
+    ok_(isinstance(rec, ContentInfoRecord))
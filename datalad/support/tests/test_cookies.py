@@ -7,11 +7,18 @@
 #
 # ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
 
+import shelve
+from unittest.mock import patch
+
 from datalad.support import path as op
-from ..cookies import CookiesDB
+from ..cookies import (
+    CookiesDB,
+    SQLiteStore,
+)
 from datalad.utils import rmtree
 from datalad.tests.utils import (
     assert_equal,
+    assert_false,
     known_failure_githubci_win,
     with_tempfile,
 )
@@ -43,3 +50,52 @@ def test_no_blows(cookiesdir):
         # removal, but it shouldn't matter and .close should succeed
         pass
     cookies.close()
+
+
+@with_tempfile(mkdir=True)
+def test_shared(cookiesdir):
+    filename = op.join(cookiesdir, 'mycookies')
+    # two instances stand in for two processes sharing the cookies
+    cookies1 = CookiesDB(filename)
+    cookies2 = CookiesDB(filename)
+    try:
+        cookies1['http://example.com/a'] = {'session': '1'}
+        assert_equal(cookies2['http://example.com/b'], {'session': '1'})
+        # a change is seen even though the value was cached already
+        cookies1['http://example.com'] = {'session': '2'}
+        assert_equal(cookies2['http://example.com'], {'session': '2'})
+        assert_false('http://other.com' in cookies2)
+    finally:
+        cookies1.close()
+        cookies2.close()
+
+
+@with_tempfile(mkdir=True)
+def test_import_shelve(cookiesdir):
+    filename = op.join(cookiesdir, 'mycookies')
+    with shelve.open(filename, protocol=2) as old_db:
+        old_db['example.com'] = {'session': 'old'}
+    cookies = CookiesDB(filename)
+    try:
+        assert_equal(cookies['http://example.com'], {'session': 'old'})
+    finally:
+        cookies.close()
+
+
+@with_tempfile(mkdir=True)
+def test_journal_mode(dbdir):
+    def get_journal_mode(store):
+        return store._conn.execute("PRAGMA journal_mode").fetchone()[0]
+
+    filename = op.join(dbdir, 'store.sqlite')
+    store = SQLiteStore(filename)
+    assert_equal(get_journal_mode(store), 'wal')
+    store.close()
+    # WAL is unsafe with connections from multiple hosts
+    with patch('datalad.support.cookies._get_fstype', return_value='nfs4'):
+        store = SQLiteStore(filename)
+    assert_equal(get_journal_mode(store), 'delete')
+    store.close()
+    store = SQLiteStore(filename, journal_mode='TRUNCATE')
+    assert_equal(get_journal_mode(store), 'truncate')
+    store.close()
@@ -46,3 +46,22 @@ def test_digester(path):
             'sha256': '80028815b3557e30d7cbef1d8dbc30af0ec0858eff34b960d2839fd88ad08871',
             'sha512': '684d23393eee455f44c13ab00d062980937a5d040259d69c6b291c983bf635e1d405ff1dc2763e433d69b8f299b3f4da500663b813ce176a43e29ffcc31b0159'
         })
+
+
+@with_tree(tree={'a': '123',
+                 'b': '',
+                 'c': '123abz\n' * 1000000})
+def test_digest_files(path):
+    digester = Digester()
+    fpaths = [opj(path, f) for f in ('c', 'a', 'b', 'a')]
+    # order is preserved, results are identical to one-by-one processing
+    for jobs in (1, 3):
+        res = list(digester.digest_files(fpaths, jobs=jobs))
+        assert_equal([r[0] for r in res], fpaths)
+        for fpath, digests in res:
+            assert_equal(digests, digester._digest(fpath))
+    assert_equal(list(digester.digest_files(fpaths, progress=False)), res)
+    # parallel digest computation within a file gives identical results
+    assert_equal(digester._digest_parallel(fpaths[0]),
+                 digester._digest(fpaths[0]))
+    assert_equal(list(digester.digest_files([])), [])
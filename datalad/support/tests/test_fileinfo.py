@@ -18,6 +18,7 @@ from datalad.tests.utils import (
     assert_not_in,
     assert_raises,
     known_failure_githubci_win,
+    ok_,
     with_tempfile,
 )
 
@@ -257,3 +258,98 @@ def test_annexinfo_init(path):
     assert_in(foo, cinfo_init_none)
     assert_in(bar, cinfo_init_none)
     assert_not_in("gitshasum", cinfo_init_none[foo])
+
+
+@with_tempfile
+def test_annexinfo_availability_many(path):
+    ds = Dataset(path).create()
+    files = [ds.pathobj / 'file{}'.format(i) for i in range(5)]
+    for i, f in enumerate(files):
+        f.write_text(u'content{}'.format(i))
+    ds.save()
+    ds.drop([str(f) for f in files[::2]], check=False)
+    ai = ds.repo.get_content_annexinfo(eval_availability=True)
+    for i, f in enumerate(files):
+        has_content = bool(i % 2)
+        assert_equal(ai[f]['has_content'], has_content)
+        if has_content:
+            # object location is reported and exists
+            assert_equal(
+                ut.Path(ai[f]['objloc']).read_text(),
+                u'content{}'.format(i))
+        else:
+            assert_not_in('objloc', ai[f])
+
+
+@with_tempfile
+def test_get_content_info_cached(path):
+    ds = get_convoluted_situation(path)
+    repo = ds.repo
+
+    def _query():
+        return [
+            list(repo.get_content_info(untracked=u).items())
+            for u in ('no', 'normal', 'all')
+        ] + [
+            list(repo.get_content_info(ref='HEAD').items()),
+            list(repo.diffstatus('HEAD', None).items()),
+        ]
+
+    uncached = _query()
+    repo.config.set('datalad.runtime.content-info-cache', 'yes',
+                    where='local')
+    # first run populates the cache, second one uses it, but the results
+    # (including their order) must be identical to the uncached ones
+    for i in range(2):
+        assert_equal(uncached, _query())
+    cache_dir = repo.dot_git / 'datalad' / 'cache' / 'content-info'
+    ok_(cache_dir.is_dir())
+    # a change of the index invalidates the worktree cache
+    (ds.pathobj / 'newfile').write_text(u'new')
+    repo.add('newfile', git=True)
+    assert_in(ds.pathobj / 'newfile', repo.get_content_info(untracked='no'))
+    # listings including untracked content are never cached
+    ut.rmtree(str(cache_dir))
+    repo.get_content_info(untracked='all')
+    ok_(not cache_dir.exists())
+
+
+@with_tempfile
+def test_iter_content_info(path):
+    ds = get_convoluted_situation(path)
+    repo = ds.repo
+    for kwargs in (dict(), dict(untracked='no'), dict(ref='HEAD')):
+        assert_equal(
+            list(repo.iter_content_info(**kwargs)),
+            list(repo.get_content_info(**kwargs).items()))
+    # records are available before the listing is complete, and
+    # abandoning the generator early is fine
+    it = repo.iter_content_info()
+    p, props = next(it)
+    assert_in('type', props)
+    it.close()
+    # invalid references are still reported as such
+    assert_raises(ValueError, list, repo.iter_content_info(ref='nothere'))
+
+
+@with_tempfile
+def test_iter_diffstatus(path):
+    ds = get_convoluted_situation(path)
+    repo = ds.repo
+    for kwargs in (
+            dict(fr='HEAD', to=None),
+            dict(fr='HEAD', to=None, untracked='no'),
+            dict(fr='HEAD', to=None, eval_submodule_state='commit'),
+            dict(fr='HEAD~1', to='HEAD'),
+            dict(fr=None, to='HEAD')):
+        assert_equal(
+            list(repo.iter_diffstatus(**kwargs)),
+            list(repo.diffstatus(**kwargs).items()))
+    # records are available before the listing is complete
+    it = repo.iter_diffstatus('HEAD', None)
+    p, props = next(it)
+    assert_in('state', props)
+    it.close()
+    assert_raises(ValueError, list,
+                  repo.iter_diffstatus('HEAD', None,
+                                       eval_submodule_state='global'))
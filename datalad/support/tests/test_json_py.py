@@ -12,8 +12,10 @@ import os.path as op
 
 from datalad.support.json_py import (
     dump,
+    dump2sqlite,
     dump2stream,
     dump2xzstream,
+    load_sqlite,
     load_stream,
     load_xzstream,
     load,
@@ -90,3 +92,28 @@ def test_dump2stream(path):
     # the same for compression
     dump2xzstream([dict(a=5), dict(b=4)], path)
     eq_(list(load_xzstream(path)), stream)
+
+
+@with_tempfile
+def test_dump2sqlite(path):
+    records = [
+        dict(path='a', v=1),
+        dict(path='a/b', v=2),
+        dict(path='a/b/c', v=u'ü'),
+        dict(path='a0', v=4),
+        dict(path='a-b', v=5),
+        dict(path='ab', v=6),
+    ]
+    fname = op.join(path, 'sub', 'test.sqlite')
+    # target directory is created
+    dump2sqlite(records, fname)
+    eq_(list(load_sqlite(fname)),
+        sorted(records, key=lambda r: r['path']))
+    # selective queries only match the path itself and paths underneath
+    eq_(list(load_sqlite(fname, prefix='a')), records[:3])
+    eq_(list(load_sqlite(fname, prefix='a/')), records[:3])
+    eq_(list(load_sqlite(fname, prefix='a/b')), records[1:3])
+    eq_(list(load_sqlite(fname, prefix='b')), [])
+    # an existing file is replaced
+    dump2sqlite(records[:1], fname)
+    eq_(list(load_sqlite(fname)), records[:1])
@@ -0,0 +1,56 @@
+# emacs: -*- mode: python; py-indent-offset: 4; tab-width: 4; indent-tabs-mode: nil -*-
+# ex: set sts=4 ts=4 sw=4 noet:
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+#
+#   See COPYING file distributed along with the datalad package for the
+#   copyright and license terms.
+#
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+"""Test helpers for concurrent processing"""
+
+import sys
+import threading
+
+from ..parallel import LookaheadPool
+
+from ...tests.utils import (
+    assert_equal,
+    assert_is_none,
+    ok_,
+)
+
+
+def test_lookahead_pool_limit():
+    pool = LookaheadPool(2, limit=3)
+    try:
+        futures = [pool.submit(pow, 2, i) for i in range(4)]
+        # no more than `limit` results may be pending
+        assert_is_none(futures[-1])
+        assert_equal([pool.result(f) for f in futures[:-1]], [1, 2, 4])
+        # retrieved results free their slot
+        assert_equal(pool.result(pool.submit(pow, 2, 3)), 8)
+    finally:
+        pool.shutdown()
+    # a shut down pool declines any work
+    assert_is_none(pool.submit(pow, 2, 4))
+
+
+def test_lookahead_pool_cancel():
+    pool = LookaheadPool(1)
+    started = threading.Event()
+    release = threading.Event()
+
+    def _block():
+        started.set()
+        release.wait()
+
+    running = pool.submit(_block)
+    started.wait()
+    pending = pool.submit(pow, 2, 1)
+    threading.Timer(0.1, release.set).start()
+    pool.shutdown(cancel=True)
+    ok_(running.done())
+    if sys.version_info >= (3, 9):
+        ok_(pending.cancelled())
+    else:
+        assert_equal(pending.result(), 2)
@@ -12,6 +12,7 @@ from ..path import (
     abspath,
     curdir,
     get_parent_paths,
+    PathPrefixIndex,
     robust_abspath,
     split_ext,
 )
@@ -86,3 +87,33 @@ def test_get_parent_paths():
 
     # and we get the deepest parent
     eq_(gpp(['a/b/file', 'a/b/file2'], ['a', 'a/b']), ['a/b'])
+
+
+def test_PathPrefixIndex():
+    paths = ['a/b', 'a', 'ab', 'a/b/c/d', 'c', 'a/bc']
+    idx = PathPrefixIndex(paths, sep='/')
+    eq_(len(idx), len(paths))
+
+    # deepest parent, or the path itself
+    eq_(idx.get_parent('a'), 'a')
+    eq_(idx.get_parent('a/'), 'a')
+    eq_(idx.get_parent('a/b/file'), 'a/b')
+    eq_(idx.get_parent('a/b/c'), 'a/b')
+    eq_(idx.get_parent('a/b/c/d/e/f'), 'a/b/c/d')
+    # no confusion with paths that merely share a prefix
+    eq_(idx.get_parent('a/bcd'), 'a')
+    eq_(idx.get_parent('abc'), None)
+    eq_(idx.get_parent('ab/c'), 'ab')
+    eq_(idx.get_parent('b'), None)
+    eq_(idx.get_parent(''), None)
+
+    # children are reported in the order they were given
+    eq_(idx.get_children('a'), ['a/b', 'a', 'a/b/c/d', 'a/bc'])
+    eq_(idx.get_children('a/b'), ['a/b', 'a/b/c/d'])
+    eq_(idx.get_children('a/b/c'), ['a/b/c/d'])
+    eq_(idx.get_children('ab'), ['ab'])
+    eq_(idx.get_children('b'), [])
+
+    eq_(len(PathPrefixIndex([])), 0)
+    eq_(PathPrefixIndex([]).get_parent('a'), None)
+    eq_(PathPrefixIndex([]).get_children('a'), [])
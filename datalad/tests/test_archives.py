@@ -8,6 +8,7 @@
 # ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
 
 import os
+import time
 from unittest.mock import patch
 from datalad.tests.utils import (
     assert_true,
@@ -251,3 +252,122 @@ def test_get_leading_directory():
     yield _test_get_leading_directory, ea, [op.join('d', 'f'), op.join('._d')], 'd', {'exclude': ['\._.*']}
     yield _test_get_leading_directory, ea, [op.join('d', 'd1', 'f'), op.join('d', '._d'), '._x'], op.join('d', 'd1'), {'exclude': ['\._.*']}
 
+
+
+@with_tree(tree=(('sub', (('a.txt', 'a load'),
+                          ('b.dat', 'b load' * 1000))),))
+@with_tempfile(mkdir=True)
+def test_ExtractedArchive_member(path, outdir):
+    import tarfile
+    import zipfile
+    from datalad.tests.utils import patch_config
+    archives = []
+    for ext, mode in (('.tar', 'w'), ('.tar.gz', 'w:gz')):
+        archive = op.join(outdir, 'arch' + ext)
+        with tarfile.open(archive, mode) as tf:
+            tf.add(op.join(path, 'sub'), arcname='./sub')
+        archives.append(archive)
+    archive = op.join(outdir, 'arch.zip')
+    with zipfile.ZipFile(archive, 'w') as zf:
+        for f in ('a.txt', 'b.dat'):
+            zf.write(op.join(path, 'sub', f), arcname='sub/' + f)
+    archives.append(archive)
+
+    target = op.join(outdir, 'target')
+    for archive in archives:
+        earchive = ExtractedArchive(archive)
+        compressed = archive.endswith('.gz')
+        # compressed tarballs are only streamed on request
+        eq_(earchive.extract_member('sub/b.dat', target), not compressed)
+        with patch_config({'datalad.runtime.archive-member-extraction':
+                           'always'}):
+            assert_true(earchive.extract_member('sub/b.dat', target))
+            ok_file_has_content(target, 'b load' * 1000)
+            assert_true(earchive.extract_member('sub/a.txt', target))
+            ok_file_has_content(target, 'a load')
+            # unknown member
+            assert_false(earchive.extract_member('sub/c', target))
+        with patch_config({'datalad.runtime.archive-member-extraction':
+                           'never'}):
+            assert_false(earchive.extract_member('sub/a.txt', target))
+        # nothing was extracted into the cache
+        assert_false(op.exists(earchive.path))
+        eq_(op.exists(earchive.index_path), archive.endswith('.tar'))
+        earchive.clean()
+        assert_false(op.exists(earchive.index_path))
+
+
+@with_tempfile(mkdir=True)
+def test_ArchivesCache_prune(path):
+    def _decompress(archive, dir_, leading_directories=None):
+        # 1000 bytes of content per archive
+        with open(op.join(dir_, 'content'), 'w') as f:
+            f.write('x' * 1000)
+
+    cache = ArchivesCache(path, persistent=True, max_size=2500)
+    cache.eviction_grace = 5
+    archives = [op.join(path, 'a%i.tar' % i) for i in range(4)]
+    with patch('datalad.support.archives.decompress_file', _decompress):
+        extracted = [cache[a].assure_extracted() for a in archives[:2]]
+        # pretend the first one was used after the second one, but then
+        # access the second one again
+        now = time.time()
+        for a, t in ((archives[0], now - 10), (archives[1], now - 20)):
+            os.utime(cache[a].path, (now - 30, now - 30))
+            os.utime(cache[a].stamp_path, (t, t))
+        eq_(cache[archives[1]].assure_extracted(), extracted[1])
+        stats = cache.get_stats()
+        eq_((stats['entries'], stats['size'], stats['hits'],
+             stats['misses']),
+            (2, 2000, 1, 2))
+        # exceeding the size limit evicts the least recently used
+        cache[archives[2]].assure_extracted()
+        stats = cache.get_stats()
+        eq_((stats['entries'], stats['size'], stats['evictions']),
+            (2, 2000, 1))
+        assert_false(cache[archives[0]].is_extracted)
+        assert_false(op.exists(extracted[0]))
+        assert_true(cache[archives[1]].is_extracted)
+    # persistent across instances
+    cache2 = ArchivesCache(path, persistent=True, max_size=0)
+    eq_(cache2.get_stats()['entries'], 2)
+    # no limit, no pruning
+    cache2.prune()
+    eq_(cache2.get_stats()['entries'], 2)
+    cache2.max_size = 1000
+    # recently used archives might still be read
+    cache2.prune()
+    eq_(cache2.get_stats()['size'], 2000)
+    cache2.eviction_grace = 0
+    cache2.prune()
+    eq_(cache2.get_stats()['size'], 1000)
+    cache2.clean(force=True)
+
+
+@with_tempfile(mkdir=True)
+def test_ArchivesCache_evict_while_read(path):
+    def _decompress(archive, dir_, leading_directories=None):
+        with open(op.join(dir_, 'content'), 'w') as f:
+            f.write('x' * 1000)
+
+    cache = ArchivesCache(path, persistent=True, max_size=1000)
+    cache.eviction_grace = 0
+    archive = op.join(path, 'a.tar')
+    with patch('datalad.support.archives.decompress_file', _decompress):
+        earchive = cache[archive]
+        extracted = earchive.assure_extracted()
+        # the stamp is moved away while the archive is looked up
+        orig_utime = os.utime
+
+        def _utime(p, *args, **kwargs):
+            if p == earchive.stamp_path:
+                assert_true(cache._evict(extracted))
+            return orig_utime(p, *args, **kwargs)
+
+        with patch('os.utime', _utime):
+            eq_(earchive.assure_extracted(), extracted)
+        # extracted again
+        assert_true(earchive.is_extracted)
+        eq_(cache.get_stats()['misses'], 2)
+        eq_([f for f in os.listdir(path) if 'evicted' in f], [])
+    cache.clean(force=True)
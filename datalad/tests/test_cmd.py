@@ -13,6 +13,7 @@ import os
 import os.path as op
 import sys
 import logging
+import time
 
 from datalad.tests.utils import (
     assert_cwd_unchanged,
@@ -39,6 +40,8 @@ from datalad.tests.utils import (
 )
 
 from ..cmd import (
+    BatchedCommand,
+    BatchedCommandPool,
     Runner,
     GitRunner,
 )
@@ -379,3 +382,125 @@ def test_runner_remaining_output_two_pipes(path):
             eq_(expected,
                 runner(cmd, log_online=True, stdin=fh,
                        log_stdout=True, log_stderr=log_stderr)[0])
+
+
+def test_batched_command_pipeline():
+    # a trivial batch process, answering each request line with a line
+    echo = [sys.executable, '-u', '-c',
+            'import sys\n'
+            'for l in sys.stdin:\n'
+            '    sys.stdout.write("got " + l)']
+    bc = BatchedCommand(echo)
+    try:
+        inputs = ['a{}'.format(i) for i in range(500)]
+        expected = ['got ' + i for i in inputs]
+        # bulk API
+        eq_(bc(inputs), expected)
+        # more requests than may be in flight at once, from a generator
+        eq_(list(bc.pipeline_((i for i in inputs), max_inflight=10)),
+            expected)
+        # tuples are joined
+        eq_(bc([('a', 'b'), ('c',)]), ['got a b', 'got c'])
+        # abandoning the generator keeps the process in sync
+        gen = bc.pipeline_(inputs, max_inflight=50)
+        eq_(next(gen), 'got a0')
+        gen.close()
+        eq_(bc('single'), 'got single')
+        eq_(bc([]), [])
+    finally:
+        bc.close()
+
+
+def test_batched_command_pool():
+    echo = [sys.executable, '-u', '-c',
+            'import sys\n'
+            'for l in sys.stdin:\n'
+            '    sys.stdout.write("got " + l)']
+    created = []
+
+    def factory():
+        created.append(BatchedCommand(echo))
+        return created[-1]
+
+    pool = BatchedCommandPool(max_size=2, idle_timeout=60)
+    try:
+        bc1 = pool.get('one', factory)
+        eq_(bc1('a'), 'got a')
+        # same process is reused for the same key
+        assert_is(pool.get('one', factory), bc1)
+        eq_(len(created), 1)
+        bc2 = pool.get('two', factory)
+        eq_(bc2('b'), 'got b')
+        # 'one' is most recently used, 'two' gets evicted
+        pool.get('one', factory)
+        bc3 = pool.get('three', factory)
+        eq_(len(pool), 2)
+        ok_('two' not in pool)
+        ok_(bc2._process is None)
+        ok_(bc1._process is not None)
+        # an evicted process restarts on demand
+        eq_(bc2('c'), 'got c')
+        bc2.close()
+        # idle processes are closed on access
+        pool.idle_timeout = 0
+        time.sleep(0.01)
+        pool.get('four', factory)
+        eq_(len(pool), 1)
+        ok_(bc1._process is None)
+        ok_(bc3._process is None)
+        pool.close(match=lambda k: k == 'four')
+        eq_(len(pool), 0)
+    finally:
+        pool.close()
+        for bc in created:
+            bc.close()
+
+
+def test_batched_command_pool_in_use():
+    echo = [sys.executable, '-u', '-c',
+            'import sys\n'
+            'for l in sys.stdin:\n'
+            '    sys.stdout.write("got " + l)']
+    created = []
+
+    def factory():
+        created.append(BatchedCommand(echo))
+        return created[-1]
+
+    pool = BatchedCommandPool(max_size=1, idle_timeout=60)
+    try:
+        bc1 = pool.get('one', factory)
+        gen = bc1.pipeline_(['a', 'b'])
+        eq_(next(gen), 'got a')
+        # a process that is streaming is neither evicted nor expired
+        pool.get('two', factory)
+        pool.idle_timeout = 0
+        time.sleep(0.01)
+        pool.get('two', factory)
+        ok_(bc1._process is not None)
+        ok_('one' in pool)
+        eq_(list(gen), ['got b'])
+        # but once it is done
+        time.sleep(0.01)
+        pool.get('two', factory)
+        ok_(bc1._process is None)
+        ok_('one' not in pool)
+
+        # a forked child does not use the processes of its parent
+        pool.idle_timeout = 60
+        bc2 = pool.get('two', factory)
+        eq_(bc2('c'), 'got c')
+        process = bc2._process
+        stderr_fname = bc2._stderr_out_fname
+        pool._pid = bc2._pid = -1
+        bc3 = pool.get('two', factory)
+        ok_(bc3 is not bc2)
+        ok_(bc2._process is None)
+        # the process and its stderr file were left to their owner
+        ok_(op.exists(stderr_fname))
+        process.wait()
+        os.unlink(stderr_fname)
+    finally:
+        pool.close()
+        for bc in created:
+            bc.close()
@@ -535,3 +535,45 @@ def test_bare(path):
     assert_equal(gr.config.get(obscure_key), 'myvalue')
     # now make sure the config is where we think it is
     assert_in(obscure_key.split('.')[1], (gr.pathobj / 'config').read_text())
+
+
+@with_tempfile()
+def test_layered_read(path):
+    from datalad.config import _parse_gitconfig_dump
+    gr = GitRepo(path, create=True)
+    gr.config.set('sec.multi', '1', where='local')
+    gr.config.add('sec.multi', '2', where='local')
+    # repository configuration is read separately from the shared
+    # system/global one, make sure nothing changes in the combination
+    with patch.dict('os.environ',
+                    {'GIT_CONFIG_PARAMETERS': "'user.name=cmdline'"}):
+        cfg = ConfigManager(dataset=gr)
+        stdout, _ = gr.config._runner.run(
+            ['git', 'config', '-z', '-l', '--show-origin'])
+        full, _ = _parse_gitconfig_dump(
+            stdout, {}, set(), True, cwd=gr.path)
+        for k, v in full.items():
+            assert_equal(cfg.get(k), v)
+        # command line values take precedence, as with Git
+        assert_equal(cfg.get('user.name')[-1], 'cmdline')
+    assert_equal(cfg.get('sec.multi'), ('1', '2'))
+    # modifications are picked up
+    gr.config.set('sec.new', 'value', where='local')
+    assert_equal(ConfigManager(dataset=gr).get('sec.new'), 'value')
+
+
+@with_tempfile()
+@with_tempfile(mkdir=True)
+def test_layered_read_conditional_include(path, home):
+    with open(opj(home, '.gitconfig'), 'w') as f:
+        f.write('[user]\n\temail = global@example.com\n'
+                '[includeIf "onbranch:special"]\n\tpath = inc\n')
+    with open(opj(home, 'inc'), 'w') as f:
+        f.write('[user]\n\temail = repo@example.com\n')
+    gr = GitRepo(path, create=True)
+    gr.call_git(['checkout', '-b', 'special'])
+    with patch.dict('os.environ', {'HOME': home}):
+        assert_equal(ConfigManager(dataset=gr).get('user.email'),
+                     ('global@example.com', 'repo@example.com'))
+        # not applied outside of the repository
+        assert_equal(ConfigManager().get('user.email'), 'global@example.com')
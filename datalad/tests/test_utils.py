@@ -43,6 +43,7 @@ from datalad.utils import (
     better_wraps,
     CMD_MAX_ARG,
     create_tree,
+    DatasetRootResolver,
     disable_logger,
     dlabspath,
     expandpath,
@@ -856,6 +857,31 @@ def test_get_dataset_root(path):
         eq_(get_dataset_root(fname), os.curdir)
 
 
+@with_tempfile(mkdir=True)
+def test_DatasetRootResolver(path):
+    from datalad.support.gitrepo import GitRepo
+    get_root = DatasetRootResolver()
+    eq_(get_root('/nonexistent'), None)
+    subds = opj(path, 'sub')
+    os.makedirs(opj(path, 'some', 'deep'))
+    os.makedirs(opj(subds, 'deep'))
+    GitRepo(path, create=True)
+    GitRepo(subds, create=True)
+    fname = opj(path, 'some', 'deep', 'dummy')
+    with open(fname, 'w') as f:
+        f.write('some')
+    for p in (path, path + os.sep, opj(path, 'some', 'deep'), fname,
+              opj(path, 'some', 'nonexistent'),
+              subds, opj(subds, 'deep'), opj(subds, 'deep', 'nonexistent')):
+        # same result as without memoization, also when asked again
+        eq_(get_root(p), get_dataset_root(p))
+        eq_(get_root(p), get_dataset_root(p))
+    eq_(get_root(opj(subds, 'deep')), subds)
+    # relative paths are supported too
+    with chpwd(opj(path, 'some')):
+        eq_(get_root('deep'), os.pardir)
+
+
 @known_failure_windows
 def test_path_startswith():
     ok_(path_startswith('/a/b', '/a'))
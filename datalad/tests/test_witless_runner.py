@@ -23,6 +23,7 @@ from datalad.tests.utils import (
     with_tempfile,
 )
 from datalad.cmd import (
+    get_persistent_event_loop,
     StdOutErrCapture,
     WitlessRunner as Runner,
     StdOutCapture,
@@ -147,3 +148,35 @@ def test_runner_parametrized_protocol():
         value=b'5',
     )
     eq_(res['stdout'], '5')
+
+
+def test_runner_persistent():
+    runner = Runner(persistent=True)
+    for i in range(3):
+        res = runner.run(py2cmd('print(%i)' % i), protocol=StdOutCapture)
+        eq_(res['stdout'].strip(), str(i))
+    # all persistent runners of a thread share the same loop
+    eq_(get_persistent_event_loop(), get_persistent_event_loop())
+    ok_(not get_persistent_event_loop().is_closed())
+    # failure reporting is unchanged
+    with assert_raises(CommandError) as cme:
+        runner.run(py2cmd('import sys; sys.exit(53)'))
+    eq_(53, cme.exception.code)
+
+
+def test_runner_multiple():
+    for persistent in (False, True):
+        runner = Runner(persistent=persistent)
+        res = runner.run_multiple(
+            [py2cmd('print(%i)' % i) for i in range(5)],
+            protocol=StdOutCapture,
+            jobs=2,
+        )
+        # results come in order of the commands
+        eq_([r['stdout'].strip() for r in res], [str(i) for i in range(5)])
+        with assert_raises(CommandError) as cme:
+            runner.run_multiple([
+                py2cmd('print(1)'),
+                py2cmd('import sys; sys.exit(53)'),
+            ])
+        eq_(53, cme.exception.code)
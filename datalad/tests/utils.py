@@ -1515,7 +1515,9 @@ def get_mtimes_and_digests(target_path):
     # let's leave only relative paths for easier analysis
     target_files_ = [relpath(f, target_path) for f in target_files]
 
-    digests = {frel: digester(f) for f, frel in zip(target_files, target_files_)}
+    digests = {
+        frel: d for (f, d), frel in zip(
+            digester.digest_files(target_files), target_files_)}
     mtimes = {frel: os.stat(f).st_mtime for f, frel in zip(target_files, target_files_)}
     return digests, mtimes
 
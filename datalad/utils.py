@@ -1945,6 +1945,72 @@ def get_dataset_root(path):
     return None
 
 
+class DatasetRootResolver(object):
+    """Memoizing variant of `get_dataset_root()`
+
+    Whether a directory is the root of a dataset is determined only once per
+    directory, and remembered for all directories underneath it, that were
+    passed on the way up. Resolving many paths within a common tree hence
+    costs a file system query per distinct directory, rather than one per
+    directory level of each path.
+
+    Changes to the dataset hierarchy are not detected. An instance should
+    only be used for a single operation, e.g. the paths given to a command.
+    Relative paths are not memoized, but passed on to `get_dataset_root()`.
+    """
+    def __init__(self):
+        # normalized absolute directory -> dataset root or None
+        self._roots = {}
+
+    def __call__(self, path):
+        """Return the root of an existent dataset containing a given path
+
+        Same as `get_dataset_root()`.
+
+        Parameters
+        ----------
+        path : Path-like
+
+        Returns
+        -------
+        str or None
+        """
+        path = str(path)
+        if not op.isabs(path):
+            return get_dataset_root(path)
+        altered = None
+        if op.islink(path) or not op.isdir(path):
+            altered = path
+            path = op.dirname(path)
+        npath = op.normpath(path)
+        root = self._get_root(npath)
+        if root is None:
+            if altered and op.exists(op.join(altered, '.git')):
+                return altered
+        elif root == npath:
+            # report in the form the path was given
+            return path
+        return root
+
+    def _get_root(self, path):
+        roots = self._roots
+        visited = []
+        root = None
+        # while we can still go up
+        while op.split(path)[1]:
+            if path in roots:
+                root = roots[path]
+                break
+            visited.append(path)
+            if op.exists(op.join(path, '.git')):
+                root = path
+                break
+            path = op.dirname(path)
+        for p in visited:
+            roots[p] = root
+        return root
+
+
 # ATM used in datalad_crawler extension, so do not remove yet
 def try_multiple(ntrials, exception, base, f, *args, **kwargs):
     """Call f multiple times making exponentially growing delay between the calls"""